@@ -0,0 +1,19 @@
+"""ObjDict attribute access, flat and nested"""
+
+from src.lib import ObjDict
+
+READS = 10_000
+
+
+def test_flat_attribute(benchmark):
+    row = ObjDict({"name": "Alice", "age": 25})
+    benchmark.group = "obj_dict"
+    benchmark.extra_info["rows"] = READS
+    benchmark(lambda: [row.age for _ in range(READS)])
+
+
+def test_nested_attribute(benchmark):
+    config = ObjDict({"database": {"primary": {"host": "localhost", "port": 5432}}})
+    benchmark.group = "obj_dict"
+    benchmark.extra_info["rows"] = READS
+    benchmark(lambda: [config.database.primary.port for _ in range(READS)])
@@ -0,0 +1,74 @@
+"""OrmCollection queries, from 10**3 rows up to BENCH_MAX_ROWS"""
+
+import pytest
+from conftest import SIZES, employees, throughput
+from src.lib import Avg, Count, OrmCollection, Sum
+
+pytestmark = pytest.mark.parametrize("size", SIZES)
+
+
+def test_where(benchmark, size):
+    rows = employees(size)
+    throughput(benchmark, size)
+    benchmark.group = "where"
+    benchmark(lambda: len(rows.where(dept="it", age__gte=40)))
+
+
+def test_find_by_scan(benchmark, size):
+    rows = employees(size)
+    throughput(benchmark, size)
+    benchmark.group = "find_by"
+    benchmark(rows.find_by, name=f"employee{size // 2}")
+
+
+def test_find_by_unique_index(benchmark, size):
+    rows = OrmCollection(employees(size))
+    rows.add_unique("id")
+    throughput(benchmark, size)
+    benchmark.group = "find_by"
+    benchmark(rows.find_by, id=size // 2)
+
+
+def test_order_by(benchmark, size):
+    rows = employees(size)
+    throughput(benchmark, size)
+    benchmark.group = "order_by"
+    benchmark(lambda: len(rows.order_by("-salary", "name")))
+
+
+def test_order_by_top_10(benchmark, size):
+    rows = employees(size)
+    throughput(benchmark, size)
+    benchmark.group = "order_by"
+    benchmark(lambda: len(rows.order_by("-salary", limit=10)))
+
+
+def test_group_by_aggregate(benchmark, size):
+    rows = employees(size)
+    throughput(benchmark, size)
+    benchmark.group = "group_by"
+    aggregates = {"count": Count(), "total": Sum("salary"), "avg": Avg("age")}
+    benchmark(lambda: rows.group_by("dept").aggregate(**aggregates))
+
+
+def test_distinct(benchmark, size):
+    rows = employees(size)
+    throughput(benchmark, size)
+    benchmark.group = "distinct"
+    benchmark(rows.distinct, "dept", "age")
+
+
+def test_join(benchmark, size):
+    rows = employees(size)
+    others = employees(max(size // 10, 1))
+    throughput(benchmark, size)
+    benchmark.group = "join"
+    benchmark(rows.join, others, on="id")
+
+
+def test_difference(benchmark, size):
+    rows = employees(size)
+    others = employees(max(size // 10, 1))
+    throughput(benchmark, size)
+    benchmark.group = "join"
+    benchmark(rows.difference, others, on="id")
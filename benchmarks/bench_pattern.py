@@ -0,0 +1,54 @@
+"""ObjectFactory object graphs and Subject.notify fan-out"""
+
+import pytest
+from employees import Subject
+from pattern.factory import ObjectFactory
+from pattern.observer import AbsObserver
+
+
+class Node:
+    def __init__(self, name="node"):
+        self.name = name
+
+
+class Counter(AbsObserver):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def update(self, subject):
+        self.calls += 1
+
+
+def graph_conf(depth, breadth):
+    """A tree of Node objects: every node has breadth children, down to depth"""
+    conf = {"class": "Node", "params": {"name": f"level{depth}"}}
+    if depth:
+        conf["children"] = [graph_conf(depth - 1, breadth) for _ in range(breadth)]
+    return conf
+
+
+@pytest.mark.parametrize("depth, breadth", [(3, 3), (5, 4)])
+def test_create_object_graph(benchmark, depth, breadth):
+    factory = ObjectFactory(graph_conf(depth, breadth), {"Node": Node})
+    benchmark.group = "object_factory"
+    benchmark.extra_info["rows"] = sum(breadth**level for level in range(depth + 1))
+
+    benchmark(factory.get_object)
+
+
+@pytest.mark.parametrize("observers", [10, 100, 1000])
+def test_notify_fan_out(benchmark, observers):
+    subject = Subject()
+    subject._observers = [Counter() for _ in range(observers)]
+    benchmark.group = "notify"
+    benchmark.extra_info["rows"] = observers
+    benchmark(subject.notify)
+
+
+def test_create_many(benchmark):
+    factory = ObjectFactory(graph_conf(2, 3), {"Node": Node})
+    confs = [graph_conf(2, 3) for _ in range(1000)]
+    benchmark.group = "object_factory"
+    benchmark.extra_info["rows"] = len(confs)
+    benchmark(lambda: sum(1 for _ in factory.create_many(confs)))
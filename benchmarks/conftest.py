@@ -0,0 +1,38 @@
+"""Shared data of the benchmarks, run with `make bench` (see the Makefile)"""
+
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+# The pattern and employees packages import each other as top level packages
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from src.lib import ObjDict, OrmCollection  # noqa: E402
+
+# Largest collection measured: 10**5 by default, up to 10**7 with `make bench-full`
+MAX_ROWS = int(os.environ.get("BENCH_MAX_ROWS", 10**5))
+SIZES = [10**power for power in range(3, 8) if 10**power <= MAX_ROWS]
+DEPTS = ["it", "hr", "sales", "finance", "ops"]
+
+
+@lru_cache(maxsize=None)
+def employees(size):
+    """Return a collection of size ObjDict rows, built once per size"""
+    return OrmCollection(
+        ObjDict(
+            {
+                "id": number,
+                "name": f"employee{number}",
+                "age": 20 + number % 45,
+                "dept": DEPTS[number % len(DEPTS)],
+                "salary": 1000 + (number * 7919) % 9000,
+            }
+        )
+        for number in range(size)
+    )
+
+
+def throughput(benchmark, rows):
+    """Record the number of rows of a benchmark, to plot rows per second by size"""
+    benchmark.extra_info["rows"] = rows
@@ -0,0 +1,93 @@
+"""
+Check the import time of some statements against a budget, with python -X importtime.
+
+Usage:
+    python benchmarks/import_budget.py --budget-ms 40 "import app" "from lib import OrmCollection"
+
+Each statement runs in a new interpreter from the src directory, several times to keep the
+fastest run. Only the imports it triggers are counted, not those of the interpreter
+startup. The slowest imports are listed, and the exit status is 1 over budget.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def import_times(statement):
+    """
+    Run a statement with -X importtime.
+
+    Returns:
+        dict: The cumulative import time in microseconds of each top level module.
+    """
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT / "src",
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented under the module importing them
+        if not name[1:].startswith(" "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure(statement, runs):
+    """
+    Return the import time of a statement, the fastest of runs.
+
+    Returns:
+        tuple: (total in microseconds, {module: microseconds}) for the modules imported
+        by the statement, beyond the interpreter startup.
+    """
+    startup = set(import_times("pass"))
+    best = None
+    for _ in range(runs):
+        times = {
+            name: micros
+            for name, micros in import_times(statement).items()
+            if name not in startup
+        }
+        total = sum(times.values())
+        if best is None or total < best[0]:
+            best = (total, times)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("statements", nargs="+", help="import statements to measure")
+    parser.add_argument(
+        "--budget-ms", type=float, required=True, help="budget of each statement"
+    )
+    parser.add_argument("--runs", type=int, default=5, help="runs per statement")
+    parser.add_argument("--top", type=int, default=5, help="slowest imports shown")
+    args = parser.parse_args(argv)
+
+    over_budget = False
+    for statement in args.statements:
+        total, times = measure(statement, args.runs)
+        status = "ok" if total <= args.budget_ms * 1000 else "OVER BUDGET"
+        over_budget = over_budget or status != "ok"
+        print(f"{statement!r}: {total / 1000:.1f} ms / {args.budget_ms} ms {status}")
+        slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)
+        for name, micros in slowest[: args.top]:
+            print(f"    {micros / 1000:8.1f} ms  {name}")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
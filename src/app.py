@@ -1,16 +1,12 @@
 """ App module"""
 
+import hashlib
+import marshal
 import os
-import yaml
-import json
 
-from pattern.visitor import PayrollVisitor, TaxAuthorityVisitor
-from pattern.strategy import ProgressiveTaxStrategy, FlatTaxStrategy
-from pattern.observer import Payroll, TaxAuthority
-from pattern.factory import ObjectFactory
-from employees import FullTimeEmployee
-from mvc import UserService, Service, AnotherService, DependencyContainer
-from lib import OrmCollection, ObjDict, ImprovedList
+# yaml, the patterns, the services and lib are imported by the functions using them,
+# so that importing this module, or running a command needing only some of them,
+# doesn't pay for all of them
 
 
 def absolute_path(file):
@@ -19,22 +15,136 @@ def absolute_path(file):
     return os.path.join(script_dir, file)
 
 
+def user_cache_dir():
+    """Return the cache directory of the current user, following the XDG convention"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "auta-app-generator")
+
+
+# Parsed configs are kept as marshal snapshots in this directory, an empty
+# CONFIG_CACHE_DIR environment variable disables them
+CONFIG_CACHE_DIR = os.environ.get("CONFIG_CACHE_DIR", user_cache_dir()) or None
+CONFIG_CACHE_VERSION = 2
+
+# Path -> (mtime and size, content digest, marshalled config)
+_config_cache = {}
+
+# Marks a snapshot whose config can't be loaded, as None is a valid config
+_INVALID = object()
+
+
+def _snapshot_version():
+    # The marshal format may change between Python versions
+    return (CONFIG_CACHE_VERSION, marshal.version)
+
+
+def _read_snapshot(snapshot_path):
+    """
+    Return the (stamp, digest, data) of a snapshot, or None if it is missing or invalid.
+
+    Snapshots are written with marshal, which only holds plain data: loading one runs
+    no code. A snapshot that can't be read for any reason is a cache miss.
+    """
+    try:
+        with open(snapshot_path, "rb") as snapshot:
+            version, stamp, digest, data = marshal.load(snapshot)
+    except Exception:
+        return None
+    if version != _snapshot_version():
+        return None
+    return stamp, digest, data
+
+
+def _write_snapshot(snapshot_path, entry):
+    """Write a snapshot atomically, a cache that can't be written is only skipped"""
+    temp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        with open(temp_path, "wb") as snapshot:
+            marshal.dump((_snapshot_version(), *entry), snapshot)
+        os.replace(temp_path, snapshot_path)
+    except OSError:
+        pass
+
+
+def _load_config(data):
+    """Return the config of marshalled data, or _INVALID if the data is corrupt"""
+    try:
+        return marshal.loads(data)
+    except Exception:
+        return _INVALID
+
+
 def config_to_json(file) -> dict:
-    """Convert Configfile to Json"""
-    with open(absolute_path(file), "r", encoding="utf-8") as tmpf:
-        config_loaded = yaml.load(tmpf, Loader=yaml.FullLoader)
-    return config_loaded
+    """
+    Convert Configfile to Json
+
+    Parsed configs are cached in process and on disk (CONFIG_CACHE_DIR, by default in
+    the cache directory of the user) as marshal snapshots, keyed by path. A file whose
+    mtime and size are unchanged is not read, and a file whose content digest is
+    unchanged is not parsed again, so a cold start only parses the files that changed.
+    Each call returns a new copy of the config. Configs holding values marshal can't
+    store, such as dates, are parsed on every call.
+    """
+    path = absolute_path(file)
+    status = os.stat(path)
+    stamp = (status.st_mtime_ns, status.st_size)
+    entry = _config_cache.get(path)
+    snapshot_path = None
+    if CONFIG_CACHE_DIR is not None:
+        name = hashlib.blake2b(path.encode("utf-8"), digest_size=16).hexdigest()
+        snapshot_path = os.path.join(CONFIG_CACHE_DIR, f"{name}.marshal")
+        if entry is None or entry[0] != stamp:
+            entry = _read_snapshot(snapshot_path) or entry
+    config = _INVALID
+    if entry is not None and entry[0] == stamp:
+        config = _load_config(entry[2])
+        if config is not _INVALID:
+            _config_cache[path] = entry
+            return config
+    with open(path, "rb") as tmpf:
+        content = tmpf.read()
+    digest = hashlib.blake2b(content).hexdigest()
+    # Same content under a new stamp, unless its data just failed to load
+    if entry is not None and entry[1] == digest and entry[0] != stamp:
+        config = _load_config(entry[2])
+    if config is _INVALID:
+        import yaml
+
+        # The libyaml C loader is much faster than the pure Python one, when available
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        config = yaml.load(content.decode("utf-8"), Loader=loader)
+        try:
+            data = marshal.dumps(config)
+        except ValueError:
+            _config_cache.pop(path, None)
+            return config
+    else:
+        data = entry[2]
+    entry = (stamp, digest, data)
+    if snapshot_path is not None:
+        _write_snapshot(snapshot_path, entry)
+    _config_cache[path] = entry
+    return config
 
 
 def main():
-    class_map_employee = {
-        "FullTimeEmployee": FullTimeEmployee,
-        "Payroll": Payroll,
-        "TaxAuthority": TaxAuthority,
-        "PayrollVisitor": PayrollVisitor,
-        "TaxAuthorityVisitor": TaxAuthorityVisitor,
-        "FlatTaxStrategy": FlatTaxStrategy,
-    }
+    from pattern.factory import ClassRegistry, ObjectFactory
+
+    # Classes are imported when a configuration uses them
+    class_map_employee = ClassRegistry(
+        {
+            "FullTimeEmployee": "employees.full_time_employee:FullTimeEmployee",
+            "Payroll": "pattern.observer.observers:Payroll",
+            "TaxAuthority": "pattern.observer.observers:TaxAuthority",
+            "PayrollVisitor": "pattern.visitor.visitors:PayrollVisitor",
+            "TaxAuthorityVisitor": "pattern.visitor.visitors:TaxAuthorityVisitor",
+            "FlatTaxStrategy": "pattern.strategy.strategies:FlatTaxStrategy",
+            "ProgressiveTaxStrategy": "pattern.strategy.strategies:ProgressiveTaxStrategy",
+        }
+    )
 
     print("____Start Objet Creation _____")
     config = config_to_json("config_employee.yml")
@@ -49,12 +159,16 @@ def main():
 
 
 def main2():
-    class_map_services = {
-        "DependencyContainer": DependencyContainer,
-        "UserService": UserService,
-        "Service": Service,
-        "AnotherService": AnotherService,
-    }
+    from pattern.factory import ClassRegistry, ObjectFactory
+
+    class_map_services = ClassRegistry(
+        {
+            "DependencyContainer": "mvc.context:DependencyContainer",
+            "UserService": "mvc.service:UserService",
+            "Service": "mvc.service:Service",
+            "AnotherService": "mvc.service:AnotherService",
+        }
+    )
     print("____Start Objet Creation _____")
     config = config_to_json("config_services.yml")
     dependency_container = ObjectFactory(
@@ -65,6 +179,8 @@ def main2():
 
 
 def main3():
+    from lib import OrmCollection
+
     lst = OrmCollection(["apple", "banana", "orange", "f", "pear", "orange"])
     from collections import OrderedDict
 
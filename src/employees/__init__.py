@@ -1,4 +1,13 @@
-from .employee import Employee
-from .employee import Subject
-from .full_time_employee import FullTimeEmployee
-from .part_time_employee import PartTimeEmployee
+from pattern.lazy import lazy_attributes
+
+# Attributes of the package and the submodule defining them, see lazy_attributes()
+_LAZY_ATTRIBUTES = {
+    "Employee": ".employee",
+    "Subject": ".employee",
+    "FullTimeEmployee": ".full_time_employee",
+    "PartTimeEmployee": ".part_time_employee",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
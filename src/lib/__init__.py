@@ -1,4 +1,32 @@
-from .orm_collection import OrmCollection
-from .exception import BaseError, BaseNotFound, BaseMultipleFound
-from .improved_list import ImprovedList
-from .obj_dict import ObjDict
+from .lazy import lazy_attributes
+
+# Attributes of the package and the submodule defining them, see lazy_attributes()
+_LAZY_ATTRIBUTES = {
+    "OrmCollection": ".orm_collection",
+    "BaseError": ".exception",
+    "BaseNotFound": ".exception",
+    "BaseMultipleFound": ".exception",
+    "BaseDuplicateFound": ".exception",
+    "ImprovedList": ".improved_list",
+    "QuerySet": ".query_set",
+    "CollectionView": ".view",
+    "ColumnarCollection": ".columnar",
+    "ObjDict": ".obj_dict",
+    "Record": ".record",
+    "record_class": ".record",
+    "StreamingCollection": ".stream",
+    "GroupBy": ".aggregates",
+    "Count": ".aggregates",
+    "Sum": ".aggregates",
+    "Avg": ".aggregates",
+    "Min": ".aggregates",
+    "Max": ".aggregates",
+    "HyperLogLog": ".distinct",
+    "QueryStats": ".instrumentation",
+    "StatsRegistry": ".instrumentation",
+    "instrument": ".instrumentation",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
@@ -0,0 +1,270 @@
+"""Module aggregates: single-pass aggregation for group_by()"""
+
+import abc
+from collections.abc import Mapping
+
+from src.lib.obj_dict import ObjDict
+from src.lib.orm_collection import OrmCollection
+from src.lib.query import field_getter
+
+
+def as_getter(key):
+    """
+    Turn a group_by() or aggregate key into a function of the row.
+
+    Args:
+        key (str or function): An attribute name or a function.
+
+    Returns:
+        function: The key function.
+
+    Raises:
+        TypeError: If key is neither a string nor a function.
+    """
+    if isinstance(key, str):
+        return field_getter(key)
+    if callable(key):
+        return key
+    raise TypeError("key must be a string attribute name or a function")
+
+
+class Aggregate(abc.ABC):
+    """
+    A running accumulator over the rows of a group.
+
+    Subclasses define update(state, value) and merge(state, other), and may override
+    initial() and result(state). Values are read from each row with the field
+    (attribute name or function). None values are ignored, as in SQL.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self.getter = as_getter(field)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.field!r})"
+
+    def __reduce__(self):
+        # The getter is rebuilt from the field, so that aggregates reach worker processes
+        return (self.__class__, (self.field,))
+
+    def initial(self):
+        """Return the state of an empty group"""
+        return None
+
+    @abc.abstractmethod
+    def update(self, state, value):
+        """Return the state after adding a non None value"""
+
+    @abc.abstractmethod
+    def merge(self, state, other):
+        """Return the state combining two partial states of the same group"""
+
+    def result(self, state):
+        """Return the aggregated value of a state"""
+        return state
+
+
+class Count(Aggregate):
+    """Count the rows, or the rows where the field is not None"""
+
+    def __init__(self, field=None):
+        super().__init__(field if field is not None else (lambda row: True))
+        self.field = field
+
+    def initial(self):
+        return 0
+
+    def update(self, state, value):
+        return state + 1
+
+    def merge(self, state, other):
+        return state + other
+
+
+class Sum(Aggregate):
+    """Sum the values of the field"""
+
+    def initial(self):
+        return 0
+
+    def update(self, state, value):
+        return state + value
+
+    def merge(self, state, other):
+        return state + other
+
+
+class Avg(Aggregate):
+    """Average the values of the field, None for an empty group"""
+
+    def initial(self):
+        return (0, 0)
+
+    def update(self, state, value):
+        return (state[0] + value, state[1] + 1)
+
+    def merge(self, state, other):
+        return (state[0] + other[0], state[1] + other[1])
+
+    def result(self, state):
+        total, count = state
+        return total / count if count else None
+
+
+class Min(Aggregate):
+    """Smallest value of the field"""
+
+    def update(self, state, value):
+        return value if state is None or value < state else state
+
+    def merge(self, state, other):
+        return state if other is None else self.update(state, other)
+
+
+class Max(Aggregate):
+    """Largest value of the field"""
+
+    def update(self, state, value):
+        return value if state is None or value > state else state
+
+    def merge(self, state, other):
+        return state if other is None else self.update(state, other)
+
+
+def accumulate_groups(rows, key, aggregates):
+    """
+    Read rows once, keeping only one state per aggregate and group.
+
+    Args:
+        rows (iterable): The rows.
+        key (function or None): The group key function, None for a single group.
+        aggregates (dict): Result names mapped to Aggregate objects.
+
+    Returns:
+        dict: Group keys mapped to the list of states, in the order of aggregates.
+    """
+    specs = [(agg.getter, agg.update) for agg in aggregates.values()]
+    initials = [agg.initial() for agg in aggregates.values()]
+    groups = {}
+    for row in rows:
+        group_key = key(row) if key is not None else None
+        states = groups.get(group_key)
+        if states is None:
+            states = groups[group_key] = list(initials)
+        for position, (getter, update) in enumerate(specs):
+            value = getter(row)
+            if value is not None:
+                states[position] = update(states[position], value)
+    return groups
+
+
+def merge_groups(partials, aggregates):
+    """
+    Combine the results of accumulate_groups() over consecutive chunks of rows.
+
+    Groups keep the order in which they first appear across the chunks.
+
+    Args:
+        partials (iterable): dicts returned by accumulate_groups().
+        aggregates (dict): The Aggregate objects used for every chunk.
+
+    Returns:
+        dict: Group keys mapped to the merged list of states.
+    """
+    merges = [agg.merge for agg in aggregates.values()]
+    groups = {}
+    for partial in partials:
+        for group_key, states in partial.items():
+            current = groups.get(group_key)
+            if current is None:
+                groups[group_key] = list(states)
+                continue
+            for position, merge in enumerate(merges):
+                current[position] = merge(current[position], states[position])
+    return groups
+
+
+def finalize_groups(groups, aggregates):
+    """
+    Turn accumulated states into results.
+
+    Returns:
+        dict: Group keys mapped to an ObjDict of the aggregated values.
+    """
+    names = list(aggregates)
+    results = [agg.result for agg in aggregates.values()]
+    return {
+        group_key: ObjDict(
+            zip(names, (result(state) for result, state in zip(results, states)))
+        )
+        for group_key, states in groups.items()
+    }
+
+
+def aggregate_groups(rows, key, aggregates):
+    """
+    Aggregate rows by group in one pass, keeping only one state per aggregate and group.
+
+    Args:
+        rows (iterable): The rows, read once.
+        key (function or None): The group key function, None for a single group.
+        aggregates (dict): Result names mapped to Aggregate objects.
+
+    Returns:
+        dict: Group keys mapped to an ObjDict of the aggregated values.
+    """
+    return finalize_groups(accumulate_groups(rows, key, aggregates), aggregates)
+
+
+class GroupBy(Mapping):
+    """
+    The groups of rows sharing the same key, as returned by group_by().
+
+    As a mapping, it holds an OrmCollection per group, built on first access.
+    aggregate() doesn't build those collections: it reads the rows once and keeps a
+    running accumulator per group, so it also works over a StreamingCollection.
+    """
+
+    def __init__(self, rows, key):
+        self._rows = rows
+        self._key = as_getter(key)
+        self._groups = None
+
+    def aggregate(self, **aggregates):
+        """
+        Aggregate each group in a single pass over the rows.
+
+        Args:
+            **aggregates (Aggregate): Result names mapped to Count, Sum, Avg, Min or Max.
+
+        Returns:
+            dict: Group keys mapped to an ObjDict of the aggregated values.
+
+        Example:
+            >>> employees.group_by("dept").aggregate(count=Count(), total=Sum("salary"))
+        """
+        return aggregate_groups(self._rows, self._key, aggregates)
+
+    def _collect(self):
+        if self._groups is None:
+            groups = {}
+            for row in self._rows:
+                key = self._key(row)
+                if key not in groups:
+                    groups[key] = OrmCollection()
+                groups[key].append(row)
+            self._groups = groups
+        return self._groups
+
+    def __getitem__(self, key):
+        return self._collect()[key]
+
+    def __iter__(self):
+        return iter(self._collect())
+
+    def __len__(self):
+        return len(self._collect())
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._collect()!r})"
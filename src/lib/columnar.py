@@ -0,0 +1,410 @@
+"""Module columnar: NumPy-backed OrmCollection storage for numeric-heavy datasets"""
+
+import operator
+
+from src.lib.aggregates import GroupBy
+from src.lib.exception import BaseMultipleFound, BaseNotFound
+from src.lib.ordering import DESCENDING_PREFIX, parse_order_keys, sort_key
+from src.lib.query import EXACT, OPERATORS, REGEX, compile_query
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+# Comparisons numpy evaluates element-wise on a whole column at once
+VECTOR_OPERATORS = {
+    EXACT: operator.eq,
+    "not": operator.ne,
+    "lt": operator.lt,
+    "gt": operator.gt,
+    "lte": operator.le,
+    "gte": operator.ge,
+}
+
+# Rows are materialized by chunks while iterating
+CHUNK_SIZE = 1024
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for columnar collections")
+
+
+def _to_column(values):
+    """Return a numeric array for numbers, an object array for anything else"""
+    if all(
+        isinstance(value, (int, float)) and not isinstance(value, bool)
+        for value in values
+    ) or all(isinstance(value, bool) for value in values):
+        return np.array(values)
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def _argsort(values, descending):
+    """Return the positions sorting values, equal values staying in collection order"""
+    if not descending:
+        return np.argsort(values, kind="stable")
+    # Sort the reversed values, so that the descending order keeps ties in order
+    return len(values) - 1 - np.argsort(values[::-1], kind="stable")[::-1]
+
+
+class ColumnarCollection:
+    """
+    A read-only collection of homogeneous records stored as one NumPy array per field.
+
+    It answers the same queries as OrmCollection, with the same operator names, but
+    where() comparisons, order_by() and distinct() run as vectorized masks, argsort
+    and np.unique. Query results share the columns of their source and only hold the
+    selected positions. Rows are built as ObjDict when they are accessed.
+    Build one with OrmCollection.from_records(records, columnar=True).
+    """
+
+    def __init__(self, columns, positions=None):
+        _require_numpy()
+        self._columns = columns
+        self._positions = positions
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Build a columnar collection from dict-like records sharing the same fields.
+
+        Args:
+            records (iterable): The records. The fields are those of the first one.
+
+        Returns:
+            ColumnarCollection: The collection.
+
+        Raises:
+            KeyError: If a record lacks a field of the first record.
+        """
+        _require_numpy()
+        records = list(records)
+        fields = list(records[0]) if records else []
+        return cls(
+            {
+                field: _to_column([record[field] for record in records])
+                for field in fields
+            }
+        )
+
+    @property
+    def fields(self):
+        """The field names, in column order"""
+        return list(self._columns)
+
+    def column(self, field):
+        """
+        Return the values of a field for the rows of the collection.
+
+        Raises:
+            KeyError: If the field does not exist.
+        """
+        values = self._columns[field]
+        if self._positions is None:
+            return values
+        return values[self._positions]
+
+    def _select(self, positions):
+        """Return a collection of the given positions, relative to this collection"""
+        if self._positions is not None:
+            positions = self._positions[positions]
+        return self.__class__(self._columns, positions)
+
+    def __len__(self):
+        if self._positions is not None:
+            return len(self._positions)
+        return len(next(iter(self._columns.values()), ()))
+
+    def _rows(self, start, stop):
+        from src.lib.obj_dict import ObjDict
+
+        chunk = {
+            field: self.column(field)[start:stop].tolist() for field in self._columns
+        }
+        return [ObjDict(zip(chunk, values)) for values in zip(*chunk.values())]
+
+    def __iter__(self):
+        size = len(self)
+        for start in range(0, size, CHUNK_SIZE):
+            yield from self._rows(start, min(start + CHUNK_SIZE, size))
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self._select(np.arange(len(self))[item])
+        position = range(len(self))[item]
+        return self._rows(position, position + 1)[0]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self)} rows, fields={self.fields})"
+
+    def to_collection(self):
+        """Materialize every row into an OrmCollection of ObjDict"""
+        from src.lib.orm_collection import OrmCollection
+
+        return OrmCollection(self)
+
+    @property
+    def inspect(self):
+        """display the rows like ImprovedList.inspect"""
+        import pprint
+
+        print(f"{self.__class__.__name__}(ObjDict) data:")
+        pretty_print = pprint.PrettyPrinter(indent=3)
+        for row in self:
+            pretty_print.pprint(row)
+
+    def _mask(self, kind, value, values):
+        """Return the boolean mask of a resolved lookup on a column"""
+        if kind in VECTOR_OPERATORS and np.ndim(value) == 0:
+            return np.asarray(VECTOR_OPERATORS[kind](values, value), dtype=bool)
+        if kind in ("in", "nin") and isinstance(value, (list, tuple, set, frozenset)):
+            mask = np.isin(values, list(value))
+            return mask if kind == "in" else ~mask
+        if kind == REGEX:
+            test = lambda attr_value, pattern: pattern.search(attr_value)
+        elif kind == EXACT:
+            test = operator.eq
+        else:
+            test = OPERATORS[kind]
+        return np.fromiter(
+            (bool(test(attr_value, value)) for attr_value in values.tolist()),
+            dtype=bool,
+            count=len(values),
+        )
+
+    def where(self, **kwargs) -> "ColumnarCollection":
+        """
+        Filters the collection like OrmCollection.where(), with one mask per lookup.
+
+        Raises:
+            ValueError: If an invalid operator is used.
+            KeyError: If a field does not exist.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for attr, kind, value in compile_query(kwargs).conditions:
+            mask &= self._mask(kind, value, self.column(attr))
+        return self._select(np.flatnonzero(mask))
+
+    def find_by(self, **kwargs) -> object:
+        """
+        Finds the single row matching the criteria, like OrmCollection.find_by().
+
+        Raises:
+            BaseNotFound: If no objects are found that match the given attributes.
+            BaseMultipleFound: If more than one object is found that matches the given attributes.
+        """
+        matches = self.where(**kwargs)
+        if len(matches) == 0:
+            raise BaseNotFound(f"No {self.__class__.__name__} found for {kwargs}")
+        if len(matches) > 1:
+            raise BaseMultipleFound(
+                f"More than one {self.__class__.__name__} found for {kwargs}"
+            )
+        return matches[0]
+
+    def order_by(self, *keys, reverse=False, limit=None) -> "ColumnarCollection":
+        """
+        Sort like OrmCollection.order_by(), with a stable argsort for a single field name.
+
+        As with OrmCollection, None values are placed last, whatever the direction.
+
+        Raises:
+            ValueError: If no key is given, rows are records and not numbers.
+            TypeError: If a key is not a valid attribute name or function.
+        """
+        if not keys:
+            raise ValueError("All elements in the list must be integers or floats.")
+        order = parse_order_keys(keys, reverse)
+        if len(keys) == 1 and isinstance(keys[0], str):
+            field = keys[0]
+            if field.startswith(DESCENDING_PREFIX):
+                field = field[1:]
+            values = self.column(field)
+            missing = None
+            if values.dtype == object:
+                missing = np.fromiter(
+                    (value is None for value in values.tolist()),
+                    dtype=bool,
+                    count=len(values),
+                )
+            if missing is None or not missing.any():
+                positions = _argsort(values, order[0][1])
+            else:
+                # None values are placed last, whatever the direction, as sort_key() does
+                present = np.flatnonzero(~missing)
+                positions = np.concatenate(
+                    (
+                        present[_argsort(values[present], order[0][1])],
+                        np.flatnonzero(missing),
+                    )
+                )
+        else:
+            rows = list(self)
+            key, descending = sort_key(order)
+            positions = sorted(
+                range(len(rows)),
+                key=lambda position: key(rows[position]),
+                reverse=descending,
+            )
+            positions = np.array(positions, dtype=np.intp)
+        return self._select(positions[:limit])
+
+    def distinct(self, *args) -> "ColumnarCollection":
+        """
+        Keep the first row of each combination of the given fields, like OrmCollection.distinct().
+
+        Raises:
+            ValueError: If no arguments are provided.
+            AttributeError: If at least one argument is not a field.
+        """
+        if not args:
+            raise ValueError("At least one field must be provided")
+        for field in args:
+            if field not in self._columns:
+                raise AttributeError(
+                    f"Le champ '{field}' n'existe pas dans la classe {self.__class__.__name__}."
+                )
+        if len(args) == 1 and self._columns[args[0]].dtype != object:
+            _, first = np.unique(self.column(args[0]), return_index=True)
+            return self._select(np.sort(first))
+        seen = {}
+        columns = (self.column(field).tolist() for field in args)
+        for position, values in enumerate(zip(*columns)):
+            seen.setdefault(values, position)
+        return self._select(np.fromiter(seen.values(), dtype=np.intp, count=len(seen)))
+
+    def group_by(self, key_func):
+        """
+        Group the rows like OrmCollection.group_by().
+
+        Args:
+            key_func (function or str): A function of the row, or a field name whose
+                column is read without building rows.
+
+        Returns:
+            ColumnarGroupBy: A GroupBy holding a ColumnarCollection per group, with the
+            same aggregate() method.
+
+        Raises:
+            TypeError: If key_func is neither a function nor a string.
+        """
+        return ColumnarGroupBy(self, key_func)
+
+    def limit(self, count) -> "ColumnarCollection":
+        """Return the first count rows"""
+        return self[:count]
+
+    def offset(self, count) -> "ColumnarCollection":
+        """Return the rows after the first count rows"""
+        return self[count:]
+
+    def all(self) -> "ColumnarCollection":
+        """Return a collection of all rows, sharing the columns"""
+        return self.__class__(self._columns, self._positions)
+
+    def first(self, count=1):
+        """Return the first count rows, see ImprovedList.first()"""
+        return self[:count].to_collection().first(count)
+
+    def last(self, count=1):
+        """Return the last count rows, see ImprovedList.last()"""
+        return self[-count:].to_collection().last(count)
+
+    def values(self, *fields):
+        """Return one tuple of values per row, read from the columns, see OrmCollection.values()"""
+        return self.values_list(*fields)
+
+    def values_list(self, *fields, flat=False):
+        """
+        Return the values of some fields of the rows, see OrmCollection.values_list().
+
+        The values are read column by column, without building rows.
+
+        Raises:
+            KeyError: If a field does not exist.
+            ValueError: If no field is given, or several with flat=True.
+        """
+        if not fields:
+            raise ValueError("At least one field must be provided")
+        if flat:
+            if len(fields) != 1:
+                raise ValueError("flat=True needs exactly one field")
+            return self.column(fields[0]).tolist()
+        return list(zip(*(self.column(field).tolist() for field in fields)))
+
+    def pluck(self, field):
+        """
+        Return the values of a field, as a NumPy array owned by the caller.
+
+        Raises:
+            KeyError: If the field does not exist.
+        """
+        if self._positions is None:
+            return self._columns[field].copy()
+        return self.column(field)
+
+    def select(self, *fields) -> "ColumnarCollection":
+        """
+        Keep only some fields, sharing their columns.
+
+        Raises:
+            KeyError: If a field does not exist.
+            ValueError: If no field is given.
+        """
+        if not fields:
+            raise ValueError("At least one field must be provided")
+        columns = {field: self._columns[field] for field in fields}
+        return self.__class__(columns, self._positions)
+
+    def map(self, called, *args, lazy=False, workers=None, **kwargs):
+        """
+        Read an attribute or call a method on each row, see ImprovedList.map().
+
+        An attribute which is a field is read from its column without building rows.
+        """
+        from src.lib.orm_collection import OrmCollection
+
+        plain_field = isinstance(called, str) and called in self._columns
+        if plain_field and not args and not kwargs:
+            values = self.column(called).tolist()
+            return iter(values) if lazy else OrmCollection(values)
+        return OrmCollection(self).map(
+            called, *args, lazy=lazy, workers=workers, **kwargs
+        )
+
+
+class ColumnarGroupBy(GroupBy):
+    """
+    The groups of a ColumnarCollection, see GroupBy.
+
+    Each group is a ColumnarCollection sharing the columns of the source, and only
+    holding the positions of its rows.
+    """
+
+    def __init__(self, rows, key):
+        super().__init__(rows, key)
+        # A field name is read from its column
+        self._field = key if isinstance(key, str) else None
+
+    def _keys(self):
+        if self._field is not None:
+            return self._rows.column(self._field).tolist()
+        return map(self._key, self._rows)
+
+    def _collect(self):
+        if self._groups is None:
+            groups = {}
+            for position, key in enumerate(self._keys()):
+                groups.setdefault(key, []).append(position)
+            self._groups = {
+                key: self._rows._select(np.array(positions, dtype=np.intp))
+                for key, positions in groups.items()
+            }
+        return self._groups
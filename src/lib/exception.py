@@ -8,3 +8,7 @@ class BaseNotFound(BaseError):
 
 class BaseMultipleFound(BaseError):
     """Base multiple found excetion"""
+
+
+class BaseDuplicateFound(BaseError):
+    """Base duplicate found excetion"""
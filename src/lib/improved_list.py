@@ -1,4 +1,5 @@
-import pprint
+from src.lib.mapper import map_function, map_rows
+from src.lib.view import CollectionView
 
 
 class ImprovedList(list):
@@ -7,6 +8,8 @@ class ImprovedList(list):
     @property
     def inspect(self):
         """display list with inspect for each element"""
+        import pprint
+
         if not self:
             print([])
         else:
@@ -20,28 +23,65 @@ class ImprovedList(list):
                     pertty_peint.pprint(value)
 
     def first(self, count=1):
-        """return fist count elements"""
-        data = self[:count]
-        data_size = len(data)
-        if data_size > 1:
-            return self.__class__(data)
-        if data_size == 1:
-            return data[0]
-        return None
+        """return fist element, or a read-only view of the first count elements"""
+        return CollectionView(self).first(count)
 
     def last(self, count=1):
-        """return last count elements"""
-        data = self[-count:]
-        data_size = len(data)
-        if data_size > 1:
-            return self.__class__(data)
-        if data_size == 1:
-            return data[0]
-        return None
-
-    def map(self, called):
-        """advance map for call method or attribute"""
-        if called.startswith(":"):
-            print(called[1:])
-            return self.__class__(map(lambda obj: getattr(obj, called[1:])(), self))
-        return self.__class__(map(lambda obj: getattr(obj, called), self))
+        """return last element, or a read-only view of the last count elements"""
+        return CollectionView(self).last(count)
+
+    def view(self, start=None, stop=None):
+        """
+        Return a read-only view of the elements between start and stop, without copying them.
+
+        Args:
+            start (int, optional): First position, as in a slice. Defaults to None.
+            stop (int, optional): Position after the last one, as in a slice. Defaults to None.
+
+        Returns:
+            CollectionView: The window over the list.
+        """
+        return CollectionView(self, range(len(self))[start:stop])
+
+    def map(self, called, *args, lazy=False, workers=None, **kwargs):
+        """
+        advance map for call method or attribute
+
+        Args:
+            called (str or function): An attribute name, or a method name prefixed with ":",
+                both accepting dotted paths ("address.city", ":address.format"), or a function.
+            *args: Positional arguments given to the method.
+            lazy (bool, optional): True to return an iterator instead of a list. Defaults to False.
+            workers (int, optional): Run the calls on that many threads, for I/O-bound methods.
+                Results keep the order of the elements. Defaults to None.
+            **kwargs: Keyword arguments given to the method.
+
+        Returns:
+            ImprovedList or iterator: The results, in the order of the elements.
+
+        Raises:
+            ValueError: If arguments are given for an attribute.
+        """
+        results = map_rows(self, map_function(called, *args, **kwargs), workers)
+        return results if lazy else self.__class__(results)
+
+    def parallel(self, workers=None, chunk_size=None, min_size=None, executor=None):
+        """
+        Return a view running where, map and group_by aggregates over a process pool.
+
+        Args:
+            workers (int, optional): Number of processes. Defaults to the number of CPUs.
+            chunk_size (int, optional): Rows per task. Defaults to a quarter of a worker share.
+            min_size (int, optional): Below this number of rows, run in the current process.
+                Defaults to src.lib.parallel.PARALLEL_THRESHOLD.
+            executor (Executor, optional): An existing pool to reuse. Defaults to a new
+                ProcessPoolExecutor per call.
+
+        Returns:
+            ParallelCollection: The parallel view of the list.
+        """
+        from src.lib.parallel import PARALLEL_THRESHOLD, ParallelCollection
+
+        if min_size is None:
+            min_size = PARALLEL_THRESHOLD
+        return ParallelCollection(self, workers, chunk_size, min_size, executor)
@@ -0,0 +1,323 @@
+"""Module index: attribute indexes kept up to date by OrmCollection"""
+
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain
+from operator import attrgetter, itemgetter
+
+from src.lib.exception import BaseDuplicateFound
+from src.lib.query import EXACT
+
+
+class BaseIndex:
+    """
+    Common part of the attribute indexes of an OrmCollection.
+
+    An index follows the membership of the collection (append, insert, remove...),
+    not in-place changes of the rows themselves: after mutating an indexed attribute
+    of a row, call OrmCollection.reindex().
+    """
+
+    def __init__(self, field, unique=False):
+        self.field = field
+        self.unique = unique
+        # A tuple of fields indexes the tuple of their values
+        self.fields = field if isinstance(field, tuple) else (field,)
+        self._item_getter = itemgetter(*self.fields)
+        self._attr_getter = attrgetter(*self.fields)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.field!r}, unique={self.unique})"
+
+    def key(self, row):
+        """Return the indexed value of a row"""
+        if isinstance(row, dict):
+            return self._item_getter(row)
+        return self._attr_getter(row)
+
+    def _duplicate(self, value):
+        return BaseDuplicateFound(
+            f"Duplicate value {value!r} for unique index on '{self.field}'"
+        )
+
+
+class HashIndex(BaseIndex):
+    """Map each value of a field to the ascending positions of the rows holding it"""
+
+    def __init__(self, field, unique=False):
+        super().__init__(field, unique)
+        self._positions = {}
+
+    def __len__(self):
+        return len(self._positions)
+
+    def build(self, rows):
+        """
+        Rebuild the index from scratch.
+
+        Args:
+            rows (iterable): The rows of the collection, in order.
+
+        Raises:
+            BaseDuplicateFound: If the index is unique and two rows share a value.
+            TypeError: If an indexed value is not hashable.
+        """
+        self._positions = {}
+        for position, row in enumerate(rows):
+            self.add(row, position)
+
+    def add(self, row, position):
+        """Register a row at the given position"""
+        value = self.key(row)
+        positions = self._positions.get(value)
+        if positions is None:
+            self._positions[value] = [position]
+            return
+        if self.unique:
+            raise self._duplicate(value)
+        if positions[-1] < position:
+            positions.append(position)
+        else:
+            insort(positions, position)
+
+    def discard(self, row, position):
+        """Unregister the row stored at the given position"""
+        value = self.key(row)
+        positions = self._positions.get(value)
+        if positions is None:
+            return
+        positions.remove(position)
+        if not positions:
+            del self._positions[value]
+
+    def check_unique(self, rows, replaced=()):
+        """
+        Check that adding rows would not break the unique constraint.
+
+        Args:
+            rows (iterable): The rows about to be added.
+            replaced (container, optional): Positions being overwritten by those rows.
+
+        Raises:
+            BaseDuplicateFound: If a value already exists or is repeated in rows.
+        """
+        if not self.unique:
+            return
+        seen = set()
+        for row in rows:
+            value = self.key(row)
+            taken = any(pos not in replaced for pos in self._positions.get(value, ()))
+            if taken or value in seen:
+                raise self._duplicate(value)
+            seen.add(value)
+
+    def lookup(self, value):
+        """Return the positions of the rows whose field equals value"""
+        return self._positions.get(value, [])
+
+    def positions_for(self, conditions):
+        """
+        Return the ascending positions answering a lookup, or None if the index can't.
+
+        Args:
+            conditions (list): (kind, value) pairs on the indexed field, with kinds as
+                resolved by src.lib.query.resolve_lookup.
+
+        Returns:
+            list or None: Candidate positions, None when the collection must be scanned.
+        """
+        for kind, value in conditions:
+            try:
+                if kind == EXACT:
+                    return self.lookup(value)
+                if kind == "in" and isinstance(value, (list, tuple, set, frozenset)):
+                    found = [self._positions.get(item, ()) for item in set(value)]
+                    return sorted(chain.from_iterable(found))
+            except TypeError:
+                # Unhashable lookup value: only a scan can compare it
+                continue
+        return None
+
+
+class SortedIndex(BaseIndex):
+    """
+    Keep the values of a field sorted, with the permutation of row positions.
+
+    Range lookups (lt, lte, gt, gte) and equality become binary searches, and the
+    permutation gives the rows in field order without sorting. Values must be
+    comparable with each other. Rows with equal values keep their collection order.
+    """
+
+    def __init__(self, field, unique=False):
+        super().__init__(field, unique)
+        self._keys = []
+        self._positions = []
+
+    def __len__(self):
+        return len(self._keys)
+
+    def build(self, rows):
+        """
+        Rebuild the index from scratch.
+
+        Args:
+            rows (iterable): The rows of the collection, in order.
+
+        Raises:
+            BaseDuplicateFound: If the index is unique and two rows share a value.
+            TypeError: If the values can't be compared with each other.
+        """
+        values = [self.key(row) for row in rows]
+        order = sorted(range(len(values)), key=values.__getitem__)
+        keys = [values[position] for position in order]
+        if self.unique:
+            for previous, current in zip(keys, keys[1:]):
+                if previous == current:
+                    raise self._duplicate(current)
+        self._keys = keys
+        self._positions = order
+
+    def _bounds(self, value):
+        return bisect_left(self._keys, value), bisect_right(self._keys, value)
+
+    def add(self, row, position):
+        """Register a row at the given position"""
+        value = self.key(row)
+        low, high = self._bounds(value)
+        if self.unique and low < high:
+            raise self._duplicate(value)
+        slot = bisect_right(self._positions, position, low, high)
+        self._keys.insert(slot, value)
+        self._positions.insert(slot, position)
+
+    def discard(self, row, position):
+        """Unregister the row stored at the given position"""
+        low, high = self._bounds(self.key(row))
+        slot = bisect_left(self._positions, position, low, high)
+        if slot < high and self._positions[slot] == position:
+            del self._keys[slot]
+            del self._positions[slot]
+
+    def check_unique(self, rows, replaced=()):
+        """
+        Check that adding rows would not break the unique constraint.
+
+        Args:
+            rows (iterable): The rows about to be added.
+            replaced (container, optional): Positions being overwritten by those rows.
+
+        Raises:
+            BaseDuplicateFound: If a value already exists or is repeated in rows.
+        """
+        if not self.unique:
+            return
+        seen = set()
+        for row in rows:
+            value = self.key(row)
+            low, high = self._bounds(value)
+            taken = any(pos not in replaced for pos in self._positions[low:high])
+            if taken or value in seen:
+                raise self._duplicate(value)
+            seen.add(value)
+
+    def lookup(self, value):
+        """Return the positions of the rows whose field equals value"""
+        low, high = self._bounds(value)
+        return sorted(self._positions[low:high])
+
+    def positions_for(self, conditions):
+        """
+        Return the ascending positions answering a lookup, or None if the index can't.
+
+        All the range and equality conditions on the field are narrowed to a single
+        slice of the sorted keys.
+
+        Args:
+            conditions (list): (kind, value) pairs on the indexed field, with kinds as
+                resolved by src.lib.query.resolve_lookup.
+
+        Returns:
+            list or None: Candidate positions, None when the collection must be scanned.
+        """
+        low, high = 0, len(self._keys)
+        narrowed = False
+        in_values = None
+        for kind, value in conditions:
+            try:
+                if kind == EXACT:
+                    low = max(low, bisect_left(self._keys, value))
+                    high = min(high, bisect_right(self._keys, value))
+                elif kind == "gt":
+                    low = max(low, bisect_right(self._keys, value))
+                elif kind == "gte":
+                    low = max(low, bisect_left(self._keys, value))
+                elif kind == "lt":
+                    high = min(high, bisect_left(self._keys, value))
+                elif kind == "lte":
+                    high = min(high, bisect_right(self._keys, value))
+                elif kind == "in" and isinstance(value, (list, tuple, set, frozenset)):
+                    in_values = value
+                    continue
+                else:
+                    continue
+            except TypeError:
+                # Value not comparable with the keys: let the scan report it
+                return None
+            narrowed = True
+        if not narrowed and in_values is not None:
+            try:
+                found = [self.lookup(item) for item in set(in_values)]
+            except TypeError:
+                return None
+            return sorted(chain.from_iterable(found))
+        if not narrowed:
+            return None
+        return sorted(self._positions[low:high]) if low < high else []
+
+    def ordered_positions(self, reverse=False):
+        """
+        Return the row positions sorted by field value.
+
+        Args:
+            reverse (bool, optional): True for descending values. Rows with equal values
+                keep their collection order either way, as with sorted(). Defaults to False.
+
+        Returns:
+            list: The positions of every row.
+        """
+        if not reverse:
+            return list(self._positions)
+        ordered = []
+        high = len(self._keys)
+        while high:
+            low = bisect_left(self._keys, self._keys[high - 1], 0, high)
+            ordered.extend(self._positions[low:high])
+            high = low
+        return ordered
+
+    def positions_after(self, value, count, reverse=False):
+        """
+        Return the positions of the next count rows after value, in field order.
+
+        This is a keyset (cursor) page: a binary search finds where value stands, and
+        only the rows of the page are visited, however deep the page is.
+
+        Args:
+            value: The last value of the previous page, None for the first page.
+            count (int): The size of the page.
+            reverse (bool, optional): True for descending values, the page then holding
+                values lower than value. Defaults to False.
+
+        Returns:
+            list: At most count positions.
+        """
+        keys = self._keys
+        if not reverse:
+            low = 0 if value is None else bisect_right(keys, value)
+            return self._positions[low : low + count]
+        page = []
+        high = len(keys) if value is None else bisect_left(keys, value)
+        while high and len(page) < count:
+            low = bisect_left(keys, keys[high - 1], 0, high)
+            page.extend(self._positions[low:high])
+            high = low
+        return page[:count]
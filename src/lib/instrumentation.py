@@ -0,0 +1,201 @@
+"""Module instrumentation: opt-in statistics of the queries run on OrmCollection"""
+
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+
+SCAN = "scan"
+WINDOW = "window"
+INDEX = "index"
+INDEX_ORDER = "index_order"
+UNIQUE_INDEX = "unique_index"
+
+# Functions called with the QueryStats of every query that completes. While the list
+# is empty, a query only pays for one truth test of it.
+HOOKS = []
+
+
+def lookup_shape(kind, keys):
+    """
+    Normalize the lookups of a query step, without their values.
+
+    Args:
+        kind (str): The step, such as "where" or "find_by".
+        keys (iterable): The lookup keys, such as "age__gte".
+
+    Returns:
+        str: The step and its sorted keys, such as "where(age__gte, dept)".
+    """
+    return f"{kind}({', '.join(sorted(keys))})"
+
+
+class QueryStats:
+    """
+    Statistics of one query, published to the hooks once its rows are exhausted or dropped.
+
+    Attributes:
+        source (str): The class name of the queried collection.
+        shape (str): The normalized steps of the query, such as
+            "where(age__gte, dept) order_by(-salary) limit".
+        access (str): How the rows were read: SCAN, WINDOW (offset/limit by position),
+            INDEX (candidates given by an index), INDEX_ORDER (rows sorted by an ordered
+            index) or UNIQUE_INDEX (find_by() on a unique index).
+        index (str): The repr of the index used, or None.
+        rows_scanned (int): The number of rows read from the collection.
+        rows_returned (int): The number of rows the query returned.
+        elapsed (float): The wall time in seconds, from the start of the query to the
+            last row read.
+    """
+
+    __slots__ = (
+        "source",
+        "shape",
+        "access",
+        "index",
+        "rows_scanned",
+        "rows_returned",
+        "elapsed",
+        "_start",
+    )
+
+    def __init__(self, source, shape):
+        self.source = source
+        self.shape = shape
+        self.access = SCAN
+        self.index = None
+        self.rows_scanned = 0
+        self.rows_returned = 0
+        self.elapsed = 0.0
+        self._start = perf_counter()
+
+    def scanned(self, rows):
+        """Count the rows read from the collection, as they are read"""
+        for row in rows:
+            self.rows_scanned += 1
+            yield row
+
+    def track(self, rows):
+        """Count the rows returned, then publish the statistics when the query ends"""
+        try:
+            for row in rows:
+                self.rows_returned += 1
+                yield row
+        finally:
+            self.elapsed = perf_counter() - self._start
+            for hook in tuple(HOOKS):
+                hook(self)
+
+    def to_dict(self):
+        """Return the statistics as a new dict"""
+        return {field: getattr(self, field) for field in self.__slots__[:-1]}
+
+    def __repr__(self):
+        return (
+            f"QueryStats({self.source}, {self.shape!r}, access={self.access}, "
+            f"scanned={self.rows_scanned}, returned={self.rows_returned}, "
+            f"elapsed={self.elapsed:.6f})"
+        )
+
+
+class StatsRegistry:
+    """
+    A hook aggregating the statistics of the queries by source, shape and access path.
+
+    Example:
+        >>> registry = StatsRegistry()
+        >>> add_hook(registry)
+        >>> users.where(age__gte=30).count()
+        >>> registry.export()
+        [{'source': 'OrmCollection', 'shape': 'where(age__gte)', 'access': 'scan', ...}]
+    """
+
+    def __init__(self):
+        self._entries = {}
+        # Queries may run in the threads of map(workers=...)
+        self._lock = Lock()
+
+    def __call__(self, stats):
+        key = (stats.source, stats.shape, stats.access, stats.index)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = dict.fromkeys(
+                    ("calls", "rows_scanned", "rows_returned", "total_time"), 0
+                )
+                entry["max_time"] = 0.0
+            entry["calls"] += 1
+            entry["rows_scanned"] += stats.rows_scanned
+            entry["rows_returned"] += stats.rows_returned
+            entry["total_time"] += stats.elapsed
+            entry["max_time"] = max(entry["max_time"], stats.elapsed)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def export(self):
+        """
+        Return the aggregated statistics, the most time consuming queries first.
+
+        Returns:
+            list: One dict per source, shape, access and index, with the number of calls,
+            the rows scanned and returned, and the total, mean and max time in seconds.
+        """
+        with self._lock:
+            entries = [
+                dict(
+                    source=source,
+                    shape=shape,
+                    access=access,
+                    index=index,
+                    mean_time=entry["total_time"] / entry["calls"],
+                    **entry,
+                )
+                for (source, shape, access, index), entry in self._entries.items()
+            ]
+        return sorted(entries, key=lambda entry: entry["total_time"], reverse=True)
+
+    def reset(self):
+        """Forget every statistic"""
+        with self._lock:
+            self._entries.clear()
+
+
+def add_hook(hook):
+    """
+    Call a function with the QueryStats of every query from now on.
+
+    Args:
+        hook (function): Takes a QueryStats. It runs when the query ends, in the thread
+            of the query, and should not raise.
+    """
+    HOOKS.append(hook)
+
+
+def remove_hook(hook):
+    """
+    Stop calling a hook added with add_hook().
+
+    Raises:
+        ValueError: If the hook was not added.
+    """
+    HOOKS.remove(hook)
+
+
+@contextmanager
+def instrument(hook=None):
+    """
+    Instrument the queries run inside a with block.
+
+    Args:
+        hook (function, optional): The hook to add during the block. Defaults to None
+            for a new StatsRegistry.
+
+    Yields:
+        The hook, so that a registry can be exported after the block.
+    """
+    hook = StatsRegistry() if hook is None else hook
+    add_hook(hook)
+    try:
+        yield hook
+    finally:
+        remove_hook(hook)
@@ -0,0 +1,196 @@
+"""Module join: hash joins and key-based set operations between collections"""
+
+from collections.abc import Mapping, Sized
+
+from src.lib.query import field_getter, fields_getter
+from src.lib.record import Record
+
+INNER = "inner"
+LEFT = "left"
+JOINS = (INNER, LEFT)
+
+
+def key_function(on):
+    """
+    Return the function reading the join key of a row.
+
+    Args:
+        on (str, tuple or None): A field name, a tuple of field names for a composite
+            key, or None for the row itself.
+
+    Returns:
+        function: The key getter, taking a row.
+    """
+    if on is None:
+        return lambda row: row
+    if isinstance(on, str):
+        return field_getter(on)
+    return fields_getter(tuple(on))
+
+
+def as_dict(row):
+    """Return the fields of a row as a new dict: dicts, records and plain objects"""
+    if isinstance(row, Record):
+        return row.to_dict()
+    if isinstance(row, Mapping):
+        return dict(row)
+    return dict(vars(row))
+
+
+def _sized(rows):
+    return rows if isinstance(rows, Sized) else list(rows)
+
+
+def _build(rows, key):
+    """Map each key to the (position, row) pairs holding it, None keys left out"""
+    table = {}
+    for position, row in enumerate(rows):
+        value = key(row)
+        if value is not None:
+            table.setdefault(value, []).append((position, row))
+    return table
+
+
+def hash_join(left, right, on, how=INNER, right_on=None, suffix="_right"):
+    """
+    Join two collections on equal keys, with a hash table built on the smaller one.
+
+    The smaller side is read once into a dict of its keys, then every row of the larger
+    side is matched with a single lookup: O(n + m) instead of the O(n * m) of nested
+    loops. The rows come in the order of the larger side, and when the left side is
+    the smaller one, the unmatched rows of a left join come last. Rows whose key is
+    None never match.
+
+    Args:
+        left (iterable): The left rows: dicts, records or objects.
+        right (iterable): The right rows.
+        on (str or tuple): The key field, or fields, of the left rows.
+        how (str, optional): "inner" to keep matched pairs only, "left" to also keep the
+            unmatched left rows, with None for the right fields. Defaults to "inner".
+        right_on (str or tuple, optional): The key fields of the right rows, when named
+            differently. Defaults to None for the same fields as on, which are then
+            kept once.
+        suffix (str, optional): Appended to the name of a right field which is also a
+            left field. Defaults to "_right".
+
+    Returns:
+        iterator: One ObjDict per pair, with the fields of both rows.
+
+    Raises:
+        ValueError: If how is not "inner" or "left".
+        TypeError: If a key is not hashable.
+    """
+    if how not in JOINS:
+        raise ValueError(f"Invalid join {how!r}, expected one of {JOINS}")
+    left_key = key_function(on)
+    right_key = key_function(on if right_on is None else right_on)
+    if right_on is None:
+        skipped = {on} if isinstance(on, str) else set(on)
+    else:
+        skipped = set()
+    left, right = _sized(left), _sized(right)
+    right_fields = next((tuple(as_dict(row)) for row in right), ())
+    merge = _merger(right_fields, skipped, suffix)
+    if len(right) <= len(left):
+        return _probe_left(left, left_key, _build(right, right_key), merge, how)
+    return _probe_right(left, _build(left, left_key), right, right_key, merge, how)
+
+
+def _merger(right_fields, skipped, suffix):
+    """Return the function merging a left row and a right row, or None, into an ObjDict"""
+    from src.lib.obj_dict import ObjDict
+
+    missing = {field: None for field in right_fields if field not in skipped}
+
+    def merge(left_row, right_row):
+        merged = as_dict(left_row)
+        values = missing if right_row is None else as_dict(right_row)
+        for field, value in values.items():
+            if field not in skipped:
+                merged[field + suffix if field in merged else field] = value
+        return ObjDict(merged)
+
+    return merge
+
+
+def _probe_left(left, left_key, table, merge, how):
+    for row in left:
+        matches = table.get(left_key(row), ())
+        for _, match in matches:
+            yield merge(row, match)
+        if not matches and how == LEFT:
+            yield merge(row, None)
+
+
+def _probe_right(left, table, right, right_key, merge, how):
+    matched = set()
+    for match in right:
+        for position, row in table.get(right_key(match), ()):
+            matched.add(position)
+            yield merge(row, match)
+    if how == LEFT:
+        for position, row in enumerate(left):
+            if position not in matched:
+                yield merge(row, None)
+
+
+def key_set(rows, on):
+    """
+    Return the set of the keys of some rows.
+
+    Args:
+        rows (iterable): The rows, read once.
+        on (str, tuple or None): The key, see key_function().
+
+    Returns:
+        set: The keys.
+
+    Raises:
+        TypeError: If a key is not hashable.
+    """
+    return set(map(key_function(on), rows))
+
+
+def union_rows(left, right, on=None):
+    """
+    Yield the first row of each key of left, then of right, in a single pass of each.
+
+    Args:
+        left (iterable): The first rows.
+        right (iterable): The rows added after them.
+        on (str, tuple, optional): The key, see key_function(). Defaults to None.
+
+    Yields:
+        The rows, in their original order.
+
+    Raises:
+        TypeError: If a key is not hashable.
+    """
+    key = key_function(on)
+    seen = set()
+    for rows in (left, right):
+        for row in rows:
+            value = key(row)
+            if value not in seen:
+                seen.add(value)
+                yield row
+
+
+def intersection_rows(left, right, on=None):
+    """Yield the first row of left of each key which is also a key of right, see union_rows()"""
+    return _select_keys(left, key_set(right, on), on, True)
+
+
+def difference_rows(left, right, on=None):
+    """Yield the first row of left of each key which is not a key of right, see union_rows()"""
+    return _select_keys(left, key_set(right, on), on, False)
+
+
+def _select_keys(rows, keys, on, keep):
+    key = key_function(on)
+    seen = set()
+    for row in rows:
+        value = key(row)
+        if (value in keys) is keep and value not in seen:
+            seen.add(value)
+            yield row
@@ -0,0 +1,37 @@
+"""Module lazy: package attributes imported on first access"""
+
+import sys
+from importlib import import_module
+
+
+def lazy_attributes(name, mapping):
+    """
+    Return the module __getattr__ and __dir__ of a package with lazy attributes (PEP 562).
+
+    An attribute is imported from its submodule on first access, then kept in the
+    package, so that importing the package, or one of its modules, stays cheap.
+
+    Args:
+        name (str): The __name__ of the package.
+        mapping (dict): The submodule defining each attribute, relative to the package,
+            such as {"OrmCollection": ".orm_collection"}.
+
+    Returns:
+        tuple: The (__getattr__, __dir__) functions of the package.
+
+    Example:
+        >>> __getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
+    """
+
+    def __getattr__(attribute):
+        module = mapping.get(attribute)
+        if module is None:
+            raise AttributeError(f"module {name!r} has no attribute {attribute!r}")
+        value = getattr(import_module(module, name), attribute)
+        setattr(sys.modules[name], attribute, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[name])) | set(mapping))
+
+    return __getattr__, __dir__
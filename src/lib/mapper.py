@@ -0,0 +1,78 @@
+"""Module mapper: compiled attribute/method getters and thread pool mapping for map()"""
+
+from collections import deque
+from operator import attrgetter, methodcaller
+
+METHOD_PREFIX = ":"
+
+
+def map_function(called, *args, **kwargs):
+    """
+    Compile what map() applies to each element.
+
+    Args:
+        called (str or function): An attribute name, or a method name prefixed with ":".
+            Both accept dotted paths ("address.city", ":address.format"). A function is
+            used as it is.
+        *args: Positional arguments given to the method.
+        **kwargs: Keyword arguments given to the method.
+
+    Returns:
+        function: A function of the element, built on operator.attrgetter/methodcaller.
+
+    Raises:
+        ValueError: If arguments are given for an attribute.
+        TypeError: If called is neither a string nor a function.
+    """
+    if callable(called) and not isinstance(called, str):
+        if args or kwargs:
+            return lambda obj: called(obj, *args, **kwargs)
+        return called
+    if not isinstance(called, str):
+        raise TypeError("called must be an attribute name, a ':method' or a function")
+    if not called.startswith(METHOD_PREFIX):
+        if args or kwargs:
+            raise ValueError(f"Arguments given for the attribute {called!r}")
+        return attrgetter(called)
+    path, _, name = called[len(METHOD_PREFIX) :].rpartition(".")
+    call = methodcaller(name, *args, **kwargs)
+    if not path:
+        return call
+    get_owner = attrgetter(path)
+    return lambda obj: call(get_owner(obj))
+
+
+def map_rows(rows, func, workers=None):
+    """
+    Apply func to each row, lazily.
+
+    With workers, func runs on a pool of that many threads, which suits I/O-bound
+    methods (files, caches, network): at most 2 * workers calls are submitted ahead of
+    the results being read, and results come back in the order of the rows.
+
+    Args:
+        rows (iterable): The rows.
+        func (function): The function to apply, see map_function().
+        workers (int, optional): Number of threads. Defaults to None to run in the
+            current thread.
+
+    Returns:
+        iterator: The results, in the order of the rows.
+    """
+    if not workers or workers <= 1:
+        return map(func, rows)
+    return _threaded_map(rows, func, workers)
+
+
+def _threaded_map(rows, func, workers):
+    # Imported here: concurrent.futures is only needed with workers
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for row in rows:
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+            pending.append(executor.submit(func, row))
+        while pending:
+            yield pending.popleft().result()
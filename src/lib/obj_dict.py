@@ -1,4 +1,3 @@
-import pprint
 from src.lib.orm_collection import OrmCollection
 
 # class ObjDictException(AttributeError):
@@ -6,15 +5,29 @@ from src.lib.orm_collection import OrmCollection
 
 
 class ObjDict(dict):
-    """Dynamic Class as dict"""
+    """
+    Dynamic Class as dict
+
+    Nested dicts and lists are wrapped in ObjDict and OrmCollection once, on first
+    attribute access, and stored back in place: later reads return the same object,
+    and changes made through it are kept. Values set with obj.x = ... or obj["x"] = ...
+    are wrapped when they are set.
+    """
 
     def __getattr__(self, name):
         if name in self:
-            return self._clean_item(self[name])
+            value = self[name]
+            cleaned = self._clean_item(value)
+            if cleaned is not value:
+                super().__setitem__(name, cleaned)
+            return cleaned
         raise KeyError("no such attribute: " + name)
 
     def __setattr__(self, name, value):
-        self[name] = self._clean_item(value)
+        self[name] = value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, self._clean_item(value))
 
     def __delattr__(self, name):
         if name in self:
@@ -25,18 +38,21 @@ class ObjDict(dict):
     @property
     def inspect(self):
         """Return a pretty formatted informatopn of object"""
+        import pprint
+
         pretty_print = pprint.PrettyPrinter(indent=4)
         pretty_print.pprint(self)
 
     def select(self, wanted_keys):
         """Filter dict by returning only some keys"""
-        return self.__class__(
-            {k: v for (k, v) in self.items() if k in set(wanted_keys)}
-        )
+        wanted_keys = set(wanted_keys)
+        return self.__class__({k: v for (k, v) in self.items() if k in wanted_keys})
 
     @staticmethod
     def _clean_item(item):
-        """Improve type of object"""
+        """Improve type of object, values already improved are returned as they are"""
+        if isinstance(item, (ObjDict, OrmCollection)):
+            return item
         if isinstance(item, dict):
             return ObjDict(item)
         if isinstance(item, list):
@@ -0,0 +1,129 @@
+"""Module ordering: sort keys and top-k selection for order_by()"""
+
+import heapq
+
+from src.lib.query import field_getter
+
+DESCENDING_PREFIX = "-"
+
+
+class _Descending:
+    """Wrap a sort key component to invert its order inside an ascending sort"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+def parse_order_keys(keys, reverse=False):
+    """
+    Parse the keys given to order_by().
+
+    Args:
+        keys (tuple): Field names, prefixed with "-" for descending order, or functions.
+        reverse (bool, optional): True to invert every direction. Defaults to False.
+
+    Returns:
+        list: (extract, descending) pairs, extract being a function of the row.
+
+    Raises:
+        TypeError: If a key is not a string attribute name or a function.
+    """
+    order = []
+    for key in keys:
+        if isinstance(key, str):
+            descending = key.startswith(DESCENDING_PREFIX)
+            field = key[1:] if descending else key
+            order.append((field_getter(field), descending != reverse))
+        elif callable(key):
+            order.append((key, reverse))
+        else:
+            raise TypeError("key must be a string attribute name or a function")
+    return order
+
+
+def sort_key(order):
+    """
+    Build the key function for parsed order keys.
+
+    Each value is computed once per row. None values are placed after every other
+    value, whatever the direction.
+
+    Args:
+        order (list): (extract, descending) pairs from parse_order_keys().
+
+    Returns:
+        tuple: (key function, reverse flag) to give to sorted() or heapq.
+    """
+    directions = {descending for _, descending in order}
+    if len(directions) == 1:
+        # A single direction: sort ascending or reversed on plain components
+        reverse = directions.pop()
+        if len(order) == 1:
+            extract = order[0][0]
+
+            def single_key(row):
+                value = extract(row)
+                return ((value is None) != reverse, value)
+
+            return single_key, reverse
+        extracts = [extract for extract, _ in order]
+
+        def uniform_key(row):
+            values = [extract(row) for extract in extracts]
+            return tuple(((value is None) != reverse, value) for value in values)
+
+        return uniform_key, reverse
+
+    def mixed_key(row):
+        components = []
+        for extract, descending in order:
+            value = extract(row)
+            if descending:
+                components.append(_Descending((value is not None, value)))
+            else:
+                components.append((value is None, value))
+        return tuple(components)
+
+    return mixed_key, False
+
+
+def sort_rows(rows, keys=(), reverse=False, limit=None):
+    """
+    Sort rows like OrmCollection.order_by().
+
+    With a limit, the first rows are selected with a heap, in O(n log limit), instead
+    of sorting everything. The result is the same as sorting then slicing: rows with
+    equal keys keep their original order.
+
+    Args:
+        rows (iterable): The rows to sort.
+        keys (tuple, optional): See parse_order_keys(). Defaults to the natural order of numbers.
+        reverse (bool, optional): True to invert every direction. Defaults to False.
+        limit (int, optional): The number of rows to keep. Defaults to None for all.
+
+    Returns:
+        list: The sorted rows.
+
+    Raises:
+        ValueError: If no key is given and not all rows are integers or floats.
+        TypeError: If a key is not a string attribute name or a function.
+    """
+    if not keys:
+        rows = list(rows)
+        if not all(isinstance(item, (int, float)) for item in rows):
+            raise ValueError("All elements in the list must be integers or floats.")
+        key = None
+    else:
+        key, reverse = sort_key(parse_order_keys(keys, reverse))
+    if limit is None:
+        return sorted(rows, key=key, reverse=reverse)
+    select = heapq.nlargest if reverse else heapq.nsmallest
+    return select(limit, rows, key=key)
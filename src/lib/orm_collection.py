@@ -1,7 +1,27 @@
-import re
+import heapq
+import operator
+from contextlib import contextmanager
 from src.lib.improved_list import ImprovedList
-from src.lib.exception import BaseMultipleFound, BaseNotFound
-from collections import OrderedDict
+from src.lib.distinct import count_distinct, iter_distinct
+from src.lib.exception import BaseDuplicateFound, BaseNotFound
+from src.lib.index import HashIndex, SortedIndex
+from src.lib.instrumentation import (
+    HOOKS,
+    INDEX,
+    INDEX_ORDER,
+    SCAN,
+    UNIQUE_INDEX,
+    QueryStats,
+    lookup_shape,
+)
+from src.lib.join import difference_rows, hash_join, intersection_rows, union_rows
+from src.lib.ordering import DESCENDING_PREFIX
+from src.lib.projection import iter_records, values_list
+from src.lib.query import EXACT, compile_query, field_getter
+from src.lib.query_set import QuerySet
+from src.lib.record import Record, record_class
+from src.lib.view import CollectionView
+from itertools import chain
 
 
 class OrmCollection(ImprovedList):
@@ -10,62 +30,413 @@ class OrmCollection(ImprovedList):
     providing an interface and additional methods for querying and manipulating objects in the list.
     """
 
-    def where(self, **kwargs) -> "OrmCollection":
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._indexes = {}
+
+    def __reduce__(self):
+        # Indexes are rebuilt rather than copied, so that copies never share them
+        specs = [
+            (field, index.unique, isinstance(index, SortedIndex))
+            for field, index in self._indexes.items()
+        ]
+        state = {k: v for k, v in self.__dict__.items() if k != "_indexes"}
+        return (self.__class__, (list(self),), (state, specs))
+
+    def __setstate__(self, state):
+        state, specs = state
+        self.__dict__.update(state)
+        for field, unique, ordered in specs:
+            self.create_index(field, unique=unique, ordered=ordered)
+
+    @classmethod
+    def from_records(cls, records, columnar=False):
+        """
+        Build a collection of ObjDict rows from dict records.
+
+        Args:
+            records (iterable): The records, as dicts.
+            columnar (bool, optional): True to store homogeneous records as one NumPy
+                array per field (see src.lib.columnar), with the same query API.
+                Defaults to False.
+
+        Returns:
+            OrmCollection or ColumnarCollection: The collection.
+
+        Raises:
+            ImportError: If columnar is True and numpy is not installed.
+        """
+        if columnar:
+            from src.lib.columnar import ColumnarCollection
+
+            return ColumnarCollection.from_records(records)
+        from src.lib.obj_dict import ObjDict
+
+        return cls(ObjDict(record) for record in records)
+
+    @classmethod
+    def from_dicts(cls, rows, schema):
+        """
+        Build a collection of compact records from dicts sharing a schema.
+
+        Each row becomes an instance of a __slots__ class generated once per schema (see
+        src.lib.record), which takes a fraction of the memory of an ObjDict and reads its
+        attributes faster. Records keep attribute access, row["field"] and inspect, and
+        to_dict() converts them back.
+
+        Args:
+            rows (iterable): The rows, as dicts. Keys outside the schema are ignored and
+                missing fields are set to None.
+            schema (list): The field names.
+
+        Returns:
+            OrmCollection: The collection of records.
+
+        Raises:
+            ValueError: If a field name of the schema is invalid.
+        """
+        from_dict = record_class(tuple(schema)).from_dict
+        return cls(map(from_dict, rows))
+
+    def to_dicts(self):
+        """
+        Convert the rows of the collection to plain dicts.
+
+        Returns:
+            list: One new dict per row, for records (see from_dicts) and other dicts.
+        """
+        return [row.to_dict() if isinstance(row, Record) else dict(row) for row in self]
+
+    def create_index(self, field, unique=False, ordered=False):
+        """
+        Build an index on a field, used by where() and find_by() to avoid full scans.
+
+        A hash index serves equality and "in" lookups. An ordered index (bisect over the
+        sorted values) also serves "lt", "lte", "gt" and "gte" lookups, and lets order_by()
+        on the field return the rows without sorting.
+
+        The index is kept up to date through append, extend, insert, remove, pop, __setitem__
+        and __delitem__. Changing the indexed attribute of a row in place is not tracked:
+        call reindex() afterwards.
+
+        Args:
+            field (str or tuple): The attribute to index, or a tuple of attributes to index
+                the tuple of their values. Its values must be hashable.
+            unique (bool, optional): True to refuse two rows with the same value. Defaults to False.
+            ordered (bool, optional): True for a SortedIndex, whose values must be comparable.
+                Defaults to False.
+
+        Returns:
+            HashIndex or SortedIndex: The index, which replaces any previous index on this field.
+
+        Raises:
+            BaseDuplicateFound: If unique is True and the collection already holds duplicates.
+            TypeError: If ordered is True and the values can't be compared.
+        """
+        index_class = SortedIndex if ordered else HashIndex
+        index = index_class(field, unique=unique)
+        index.build(self)
+        self._indexes[field] = index
+        return index
+
+    def add_unique(self, *fields):
+        """
+        Declare a unique constraint on one field, or on the combination of several fields.
+
+        The constraint is a unique HashIndex: every insertion is checked with a dict lookup
+        and raises BaseDuplicateFound instead of adding a duplicate, and find_by() on the
+        fields becomes a single lookup.
+
+        Args:
+            *fields (str): The attributes whose values (or combination of values) must be unique.
+
+        Returns:
+            HashIndex: The index enforcing the constraint.
+
+        Raises:
+            BaseDuplicateFound: If the collection already holds duplicates.
+            ValueError: If no field is given.
+        """
+        if not fields:
+            raise ValueError("add_unique() needs at least one field")
+        return self.create_index(fields[0] if len(fields) == 1 else fields, unique=True)
+
+    def drop_index(self, field):
+        """
+        Remove the index on a field.
+
+        Args:
+            field (str): The indexed attribute.
+
+        Raises:
+            KeyError: If the field is not indexed.
+        """
+        del self._indexes[field]
+
+    def reindex(self):
+        """Rebuild every index from the current rows"""
+        for index in self._indexes.values():
+            index.build(self)
+
+    def _check_unique(self, rows, replaced=()):
+        for index in self._indexes.values():
+            index.check_unique(rows, replaced)
+
+    def _unique_positions(self, query):
+        """Return the unique index covering the equality lookups and its positions, or (None, None)"""
+        exact = {attr: value for attr, kind, value in query.conditions if kind == EXACT}
+        for index in self._indexes.values():
+            if index.unique and all(field in exact for field in index.fields):
+                values = tuple(exact[field] for field in index.fields)
+                try:
+                    return index, index.lookup(values if len(values) > 1 else values[0])
+                except TypeError:
+                    continue
+        return None, None
+
+    def _index_positions(self, queries):
+        """Return the most selective index and its candidate positions, or (None, None)"""
+        if not self._indexes:
+            return None, None
+        conditions = {}
+        for attr, kind, value in chain.from_iterable(q.conditions for q in queries):
+            if attr in self._indexes:
+                conditions.setdefault(attr, []).append((kind, value))
+        best, best_positions = None, None
+        for attr, attr_conditions in conditions.items():
+            positions = self._indexes[attr].positions_for(attr_conditions)
+            if positions is not None and (
+                best_positions is None or len(positions) < len(best_positions)
+            ):
+                best, best_positions = self._indexes[attr], positions
+        return best, best_positions
+
+    def _access_path(self, queries, order_keys=(), reverse=False):
+        """
+        Choose how the rows of a query are read, for _select() and QuerySet.explain().
+
+        Args:
+            queries (list): CompiledQuery objects, all of which must match.
+            order_keys (tuple, optional): The keys of an order_by() applied next.
+            reverse (bool, optional): The reverse flag of that order_by().
+
+        Returns:
+            tuple: (access, index, positions) where access is INDEX with the candidate
+            positions of the index, INDEX_ORDER when an ordered index gives the rows
+            sorted by order_keys, or SCAN. index and positions are None when unused.
+        """
+        index, positions = self._index_positions(queries)
+        if positions is not None:
+            return INDEX, index, positions
+        if len(order_keys) == 1 and isinstance(order_keys[0], str):
+            field = order_keys[0]
+            if field.startswith(DESCENDING_PREFIX):
+                field = field[1:]
+            index = self._indexes.get(field)
+            if isinstance(index, SortedIndex):
+                return INDEX_ORDER, index, None
+        return SCAN, None, None
+
+    def _select(self, queries, order_keys=(), reverse=False, stats=None):
+        """
+        Return the rows matching all the compiled queries, for QuerySet.
+
+        Args:
+            queries (list): CompiledQuery objects, all of which must match.
+            order_keys (tuple, optional): The keys of an order_by() applied next.
+            reverse (bool, optional): The reverse flag of that order_by().
+            stats (QueryStats, optional): Statistics to fill when the query is
+                instrumented (see src.lib.instrumentation). Defaults to None.
+
+        Returns:
+            tuple: (rows iterator, True if the rows are already sorted by order_keys)
+        """
+        access, index, positions = self._access_path(queries, order_keys, reverse)
+        if access == INDEX_ORDER:
+            if order_keys[0].startswith(DESCENDING_PREFIX):
+                reverse = not reverse
+            rows = map(self.__getitem__, index.ordered_positions(reverse=reverse))
+        elif access == INDEX:
+            rows = map(self.__getitem__, positions)
+        else:
+            rows = iter(self)
+        if stats is not None:
+            stats.access, stats.index = access, index and repr(index)
+            rows = stats.scanned(rows)
+        for query in queries:
+            if query.conditions:
+                rows = filter(query.predicate, rows)
+        return rows, access == INDEX_ORDER
+
+    @contextmanager
+    def _rollback(self, undo=None):
+        """
+        Keep the rows and the indexes consistent when an index refuses a change.
+
+        An index may raise after others took the new rows, for instance on a value
+        that is unhashable or can't be compared. The change of the rows is then undone
+        and every index rebuilt, before the error propagates.
+
+        Args:
+            undo (function, optional): Restores the rows as they were before the change.
+                Defaults to None when the rows were not changed yet.
+        """
+        try:
+            yield
+        except Exception:
+            if undo is not None:
+                undo()
+            self.reindex()
+            raise
+
+    def append(self, item):
+        if self._indexes:
+            self._check_unique((item,))
+            with self._rollback():
+                for index in self._indexes.values():
+                    index.add(item, len(self))
+        super().append(item)
+
+    def extend(self, items):
+        if not self._indexes:
+            return super().extend(items)
+        items = list(items)
+        self._check_unique(items)
+        start = len(self)
+        super().extend(items)
+        with self._rollback(lambda: list.__delitem__(self, slice(start, None))):
+            for index in self._indexes.values():
+                for position, item in enumerate(items, start):
+                    index.add(item, position)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def insert(self, position, item):
+        if not self._indexes:
+            return super().insert(position, item)
+        if position >= len(self):
+            return self.append(item)
+        self._check_unique((item,))
+        # The position the row lands at, as insert() clamps negative positions
+        position = slice(position, None).indices(len(self))[0]
+        super().insert(position, item)
+        with self._rollback(lambda: list.__delitem__(self, position)):
+            self.reindex()
+
+    def __setitem__(self, position, item):
+        if not self._indexes:
+            return super().__setitem__(position, item)
+        if isinstance(position, slice):
+            item = list(item)
+            self._check_unique(item, range(*position.indices(len(self))))
+            replaced = list.__getitem__(self, position)
+            written = position
+            if position.step in (None, 1):
+                # A plain slice may change the length: the new rows replace the old ones
+                start = position.indices(len(self))[0]
+                written = slice(start, start + len(item))
+            super().__setitem__(position, item)
+            with self._rollback(lambda: list.__setitem__(self, written, replaced)):
+                self.reindex()
+            return
+        position = range(len(self))[position]
+        self._check_unique((item,), (position,))
+        with self._rollback():
+            for index in self._indexes.values():
+                index.discard(self[position], position)
+                index.add(item, position)
+        super().__setitem__(position, item)
+
+    def __delitem__(self, position):
+        if not self._indexes:
+            return super().__delitem__(position)
+        if (
+            not isinstance(position, slice)
+            and range(len(self))[position] == len(self) - 1
+        ):
+            return self.pop()
+        super().__delitem__(position)
+        self.reindex()
+
+    def pop(self, position=-1):
+        if not self._indexes:
+            return super().pop(position)
+        position = range(len(self))[position]
+        item = super().pop(position)
+        if position == len(self):
+            for index in self._indexes.values():
+                index.discard(item, position)
+        else:
+            self.reindex()
+        return item
+
+    def remove(self, item):
+        if not self._indexes:
+            return super().remove(item)
+        self.pop(self.index(item))
+
+    def clear(self):
+        super().clear()
+        self.reindex()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self.reindex()
+
+    def reverse(self):
+        super().reverse()
+        self.reindex()
+
+    def __imul__(self, count):
+        if count > 1 and self and any(i.unique for i in self._indexes.values()):
+            raise BaseDuplicateFound("Repeating rows would break a unique index")
+        super().__imul__(count)
+        self.reindex()
+        return self
+
+    def query(self) -> QuerySet:
+        """
+        Return a lazy QuerySet over the collection.
+
+        Returns:
+            QuerySet: A query with no step, which chains where/order_by/offset/limit.
+        """
+        return QuerySet(self)
+
+    def where(self, **kwargs) -> QuerySet:
         """
         Filters the collection to only include objects that match the provided criteria.
 
+        The lookups are compiled once into a predicate (see src.lib.query), and plans are
+        cached by the shape of the query, so repeated filters skip the parsing step.
+        Lookups on an indexed field (see create_index) only visit the rows given by the
+        index: equality and "in" for any index, ranges for an ordered one.
+        The filter is lazy and only runs when the result is iterated or measured.
+
+        A plain value, string or not, is compared with ==. Regular expressions are only
+        used for "regex"/"iregex" lookups and re.Pattern values, and match anywhere in
+        the value (anchor them with ^ and $). Patterns are compiled once and cached.
+
         Args:
             **kwargs (dict): Key-value pairs of field names and values to filter by.
-                Valid operators include "lt", "gt", "lte", "gte", "endswith", "startswith", "in", "nin", "contains".
-                If an invalid operator is used, a ValueError is raised.
-
-        Returns:
-            OrmCollection: A new OrmCollection containing only objects where all given attributes match.
-
-        Raises:
-            ValueError: If an invalid operator is used.
-        """
-        op_funcs = {
-            "lt": lambda x, y: x < y,
-            "gt": lambda x, y: x > y,
-            "endswith": lambda x, y: x.endswith(y),
-            "startswith": lambda x, y: x.startswith(y),
-            "in": lambda x, y: x in y,
-            "contains": lambda x, y: y in x,
-            "nin": lambda x, y: x not in y,
-            "not": lambda x, y: x != y,
-            "lte": lambda x, y: x <= y,
-            "gte": lambda x, y: x >= y,
-        }
-
-        results = self.__class__()
-        for elm in self:
-            matches = True
-            for key, value in kwargs.items():
-                attribute, operator = key.split("__") if "__" in key else (key, None)
-                attr_value = getattr(elm, attribute)
-                if operator is not None and operator not in op_funcs:
-                    raise ValueError(f"Invalid operator {operator}")
-                if operator in op_funcs:
-                    op_func = op_funcs.get(operator, lambda x, y: x == y)
-                    matches = matches and op_func(attr_value, value)
-                elif self.contains_regex(value):
-                    matches = matches and re.match(value, attr_value)
-                else:
-                    matches = matches and attr_value == value
-
-                if not matches:
-                    break
-
-            if matches:
-                results.append(elm)
-
-        return results
+                Valid operators include "lt", "gt", "lte", "gte", "endswith", "startswith", "in", "nin", "contains",
+                "regex", "iregex". If an invalid operator is used, a ValueError is raised.
+
+        Returns:
+            QuerySet: A lazy query containing only objects where all given attributes match.
+
+        Raises:
+            ValueError: If an invalid operator or regular expression is used.
+        """
+        return self.query().where(**kwargs)
 
     def find_by(self, **kwargs) -> object:
         """
         Finds a single object in the collection that matches the provided criteria. Raises an exception if no or more than
-        one object is found.
+        one object is found. The scan stops as soon as a second match is found, and when a unique index (see add_unique)
+        covers equality lookups, there is no scan at all: only the row it returns is checked.
 
         Args:
             **kwargs: Key-value (Dictionary) of field names and values to filter by.
@@ -77,132 +448,234 @@ class OrmCollection(ImprovedList):
             BaseNotFound: If no objects are found that match the given attributes.
             BaseMultipleFound: If more than one object is found that matches the given attributes.
         """
-        matching_objs = self.where(**kwargs)
-        if len(matching_objs) == 0:
-            raise BaseNotFound(f"No {self.__class__.__name__} found for {kwargs}")
-        if len(matching_objs) > 1:
-            raise BaseMultipleFound(
-                f"More than one {self.__class__.__name__} found for {kwargs}"
-            )
-        return matching_objs.first()
-
-    def order_by(self, key=None, reverse=False):
+        if self._indexes:
+            query = compile_query(kwargs)
+            index, positions = self._unique_positions(query)
+            if positions is not None:
+                rows = filter(query.predicate, map(self.__getitem__, positions))
+                if HOOKS:
+                    stats = QueryStats(
+                        self.__class__.__name__, lookup_shape("find_by", kwargs)
+                    )
+                    stats.access, stats.index = UNIQUE_INDEX, repr(index)
+                    stats.rows_scanned = len(positions)
+                    rows = stats.track(rows)
+                for row in rows:
+                    return row
+                raise BaseNotFound(f"No {self.__class__.__name__} found for {kwargs}")
+        return self.query().find_by(**kwargs)
+
+    def order_by(self, *keys, reverse=False, limit=None):
         """
-        Sort the objects in the collection based on a field or a custom function.
+        Sort the objects in the collection based on fields or custom functions.
+
+        Each key is computed once per row, and None values are placed last. With a limit,
+        only the first rows are selected, with a heap instead of a full sort.
 
         Args:
-            key (str or function, optional): Field name or function to sort by. Defaults to None.
-            reverse (bool, optional): True to sort in descending order, False to sort in ascending order. Defaults to False.
+            *keys (str or function): Field names or functions to sort by, by priority.
+                A field prefixed with "-" is sorted in descending order. Without key, the
+                elements themselves must be numbers. A single field with an ordered index
+                is read from the index instead of sorted.
+            reverse (bool, optional): True to invert the direction of every key. Defaults to False.
+            limit (int, optional): The number of objects to keep. Defaults to None for all.
 
         Returns:
-            A new OrmCollection containing the sorted objects.
+            QuerySet: A lazy query over the sorted objects.
 
         Raises:
-            ValueError: If key is None and not all elements in the list are integers or floats.
-            TypeError: If key is not a valid attribute name or function.
+            ValueError: If no key is given and not all elements in the list are integers or floats.
+            TypeError: If a key is not a valid attribute name or function.
         """
-        if not key:
-            if all(isinstance(item, (int, float)) for item in self):
-                return self.__class__(sorted(self))
+        if not keys and not all(isinstance(item, (int, float)) for item in self):
             raise ValueError("All elements in the list must be integers or floats.")
-        if isinstance(key, str):
-            return self.__class__(
-                sorted(self, key=lambda x: getattr(x, key), reverse=reverse)
-            )
-        elif callable(key):
-            return self.__class__(sorted(self, key=key, reverse=reverse))
-        else:
-            raise TypeError("key must be a string attribute name or a function")
+        return self.query().order_by(*keys, reverse=reverse, limit=limit)
 
     def group_by(self, key_func):
         """
-        Group the objects in the collection based on a given function.
+        Group the objects in the collection based on a given function or attribute.
 
         Args:
-            key_func (function): A function that takes an object as input and returns the group key.
+            key_func (function or str): A function that takes an object as input and returns the group key,
+                or the name of the attribute holding it.
 
         Returns:
-            A dictionary where the keys are the return values of the key function and
-            the values are OrmCollections containing the corresponding objects.
+            GroupBy: A mapping where the keys are the group keys and the values are OrmCollections
+            containing the corresponding objects. GroupBy.aggregate() computes Count, Sum, Avg,
+            Min or Max per group in one pass, without building those collections.
 
         Raises:
-            N/A
+            TypeError: If key_func is neither a function nor a string.
         """
-        groups = {}
-        for obj in self:
-            key = key_func(obj)
-            if key not in groups:
-                groups[key] = OrmCollection()
-            groups[key].append(obj)
-        return groups
+        from src.lib.aggregates import GroupBy
+
+        return GroupBy(self, key_func)
 
     def limit(self, count):
         """
-        Return a new OrmCollection with the first n objects in the collection.
+        Return the first n objects in the collection.
 
         Args:
             count (int): The number of objects to include in the new collection.
 
         Returns:
-            A new OrmCollection containing the first n objects in the collection.
+            QuerySet: A lazy query over the first n objects in the collection.
 
         Raises:
             N/A
         """
-        return self.__class__(self[:count])
+        return self.query().limit(count)
 
     def offset(self, count):
         """
-        Return a new OrmCollection with the objects after the first n objects in the collection.
+        Return the objects after the first n objects in the collection.
 
         Args:
             count (int): The number of objects to skip.
 
         Returns:
-            A new OrmCollection containing the objects after the first n objects in the collection.
+            QuerySet: A lazy query over the objects after the first n objects in the collection.
 
         Raises:
             N/A
         """
-        return self.__class__(self[count:])
+        return self.query().offset(count)
 
     def all(self):
         """
-        Return a new OrmCollection containing all objects in the collection.
+        Return a read-only view of all objects in the collection, without copying them.
 
         Args:
             N/A
 
         Returns:
-            A new OrmCollection containing all objects in the collection.
+            CollectionView: A view of all objects in the collection. Use to_collection() on it
+            for an independent copy.
 
         Raises:
             N/A
         """
-        return self.__class__(self)
+        return CollectionView(self)
 
-    def _check_simple_type(self, lst):
+    def paginate(self, after, limit):
         """
-        Check if all items in the given list are of simple types.
+        Return a page of objects sorted by a field, starting after a given value of that field.
+
+        Keyset (cursor) pagination: the next page starts after the last value of the current
+        one, instead of skipping the rows of every previous page as offset() does. With an
+        ordered index on the field (see create_index), a binary search finds the page and only
+        its rows are read. Otherwise the collection is scanned once and the page selected
+        with a heap. The field should be unique, such as an id, since rows sharing the last
+        value of a page are skipped. Rows where the field is None are never returned.
 
         Args:
-            lst (list): The list to check.
+            after (tuple): (key, value) where key is a field name, prefixed with "-" for
+                descending order, and value the last value of the previous page, None for
+                the first page.
+            limit (int): The size of the page.
 
         Returns:
-            bool: True if all items in the list are of simple types (int, float, or str), False otherwise.
+            CollectionView: The objects of the page, in key order.
+
+        Example:
+            >>> page = users.paginate(after=("id", None), limit=20)
+            >>> next_page = users.paginate(after=("id", page[-1].id), limit=20)
+        """
+        key, value = after
+        reverse = key.startswith(DESCENDING_PREFIX)
+        field = key[1:] if reverse else key
+        index = self._indexes.get(field)
+        if isinstance(index, SortedIndex):
+            return CollectionView(self, index.positions_after(value, limit, reverse))
+        getter = field_getter(field)
+        candidates = (
+            (getter(row), position)
+            for position, row in enumerate(self)
+            if getter(row) is not None
+        )
+        if value is not None:
+            after_value = operator.lt if reverse else operator.gt
+            candidates = (item for item in candidates if after_value(item[0], value))
+        if reverse:
+            page = heapq.nlargest(
+                limit, candidates, key=lambda item: (item[0], -item[1])
+            )
+        else:
+            page = heapq.nsmallest(limit, candidates)
+        return CollectionView(self, [position for _, position in page])
+
+    def values(self, *fields):
+        """
+        Return the values of some fields of every object, in a single pass.
+
+        Args:
+            *fields (str): The attribute names.
+
+        Returns:
+            list: One tuple of values per object.
 
         Raises:
-            N/A
+            ValueError: If no field is given.
+        """
+        return values_list(self, fields)
+
+    def values_list(self, *fields, flat=False):
+        """
+        Return the values of some fields of every object, see values().
+
+        Args:
+            *fields (str): The attribute names.
+            flat (bool, optional): True to return a list of the values of a single field
+                instead of 1-tuples. Defaults to False.
+
+        Returns:
+            list: One tuple, or one value when flat is True, per object.
+
+        Raises:
+            ValueError: If no field is given, or several with flat=True.
+        """
+        return values_list(self, fields, flat)
+
+    def pluck(self, field):
+        """
+        Return the values of a field of every object.
+
+        Args:
+            field (str): The attribute name.
+
+        Returns:
+            list: One value per object.
+        """
+        return values_list(self, (field,), flat=True)
+
+    def select(self, *fields):
+        """
+        Project every object onto some fields, in a single pass.
+
+        Args:
+            *fields (str): The attribute names.
+
+        Returns:
+            OrmCollection: Compact records holding only the given fields (see src.lib.record).
+
+        Raises:
+            ValueError: If no field is given or a field name is invalid.
         """
-        return all(isinstance(item, (int, float, str)) for item in lst)
+        return self.__class__(iter_records(self, fields))
 
-    def distinct(self, *args):
+    def distinct(self, *args, lazy=False):
         """
         Return a new OrmCollection containing only the unique objects in the collection
         based on one or more attributes.
 
+        The collection is read once, keeping the first object of each value. Unhashable
+        values are compared with == instead of being rejected.
+
         Args:
             *args (str): One or more attribute names to use for finding unique objects.
+            lazy (bool, optional): True to return a generator yielding the unique objects
+                as they are found, in which case errors are raised while iterating.
+                Defaults to False.
 
         Returns:
             A new OrmCollection containing only the unique objects in the collection.
@@ -211,43 +684,102 @@ class OrmCollection(ImprovedList):
             ValueError: If no arguments are provided or if at least one argument is not a field.
             AttributeError: If at least one argument is not an attribute of the objects in the collection.
         """
+        rows = iter_distinct(self, args)
+        return rows if lazy else self.__class__(rows)
 
-        # If no args are provided, return a new collection with unique elements
-        if not args and self._check_simple_type(self):
-            return self.__class__(list(OrderedDict.fromkeys(self)))
-        elif not args and not self._check_simple_type(self):
-            raise ValueError("At least one field must be provided")
+    def count_distinct(self, field, approximate=False, precision=14):
+        """
+        Count the distinct values of a field.
 
-        for field in args:
-            if not hasattr(self[0], field):
-                raise AttributeError(
-                    f"Le champ '{field}' n'existe pas dans la classe {self[0].__class__.__name__}."
-                )
+        Args:
+            field (str or function): The attribute name, or a function of the object.
+            approximate (bool, optional): True to estimate the count with a HyperLogLog
+                sketch in bounded memory (see src.lib.distinct). Defaults to False.
+            precision (int, optional): The precision of the sketch: 2 ** precision bytes
+                of memory for a standard error of 1.04 / sqrt(2 ** precision), 0.81 % with
+                the default of 14.
 
-        distinct_values = []
-        seen = set()
-        for elm in self:
-            # distinct_values.append(tuple(getattr(elm, field) for field in args))
-            values = tuple(getattr(elm, field) for field in args)
-            if values not in seen:
-                seen.add(values)
-                distinct_values.append(elm)
+        Returns:
+            int: The number of distinct values, None included.
+        """
+        return count_distinct(self, field, approximate, precision)
 
-        # return self.__class__(list(dict.fromkeys(distinct_values)))
-        return self.__class__(distinct_values)
+    def join(self, other, on, how="inner", right_on=None, suffix="_right"):
+        """
+        Join the objects of the collection with those of another one on equal keys.
 
-    def contains_regex(self, s):
+        A hash join (see src.lib.join): the smaller collection is indexed by key in a dict,
+        then each object of the larger one is matched with a single lookup, instead of
+        nested loops. The objects come in the order of the larger collection.
+
+        Args:
+            other (iterable): The right collection, or QuerySet.
+            on (str or tuple): The key field, or fields, of this collection.
+            how (str, optional): "inner" to keep matched pairs only, "left" to also keep
+                the objects of this collection without match, with None for the fields of
+                the other. Defaults to "inner".
+            right_on (str or tuple, optional): The key fields of the other collection, when
+                named differently. Defaults to None for the same fields as on.
+            suffix (str, optional): Appended to the name of a field of the other collection
+                which is also a field of this one. Defaults to "_right".
+
+        Returns:
+            OrmCollection: One ObjDict per matched pair, with the fields of both objects.
+
+        Raises:
+            ValueError: If how is not "inner" or "left".
+            TypeError: If a key is not hashable.
+
+        Example:
+            >>> employees.join(departments, on="dept_id", right_on="id", how="left")
         """
-        Checks whether a string contains a regular expression.
+        return self.__class__(hash_join(self, other, on, how, right_on, suffix))
+
+    def union(self, other, on=None):
+        """
+        Return the objects of both collections, once per key.
 
         Args:
-            s (str): The string to check.
+            other (iterable): The other collection, whose objects come after these ones.
+            on (str or tuple, optional): The key field, or fields. Defaults to None to
+                compare the objects themselves, which must then be hashable.
 
         Returns:
-            True if the string contains a regular expression, False otherwise.
+            OrmCollection: The first object of each key, in order.
+
+        Raises:
+            TypeError: If a key is not hashable.
         """
-        try:
-            re.compile(s)
-        except (re.error, TypeError):
-            return False
-        return True
+        return self.__class__(union_rows(self, other, on))
+
+    def intersection(self, other, on=None):
+        """
+        Return the objects of the collection whose key is also a key of the other one.
+
+        Args:
+            other (iterable): The other collection, read once into a set of keys.
+            on (str or tuple, optional): The key, see union(). Defaults to None.
+
+        Returns:
+            OrmCollection: The first object of each selected key, in order.
+
+        Raises:
+            TypeError: If a key is not hashable.
+        """
+        return self.__class__(intersection_rows(self, other, on))
+
+    def difference(self, other, on=None):
+        """
+        Return the objects of the collection whose key is not a key of the other one.
+
+        Args:
+            other (iterable): The other collection, read once into a set of keys.
+            on (str or tuple, optional): The key, see union(). Defaults to None.
+
+        Returns:
+            OrmCollection: The first object of each selected key, in order.
+
+        Raises:
+            TypeError: If a key is not hashable.
+        """
+        return self.__class__(difference_rows(self, other, on))
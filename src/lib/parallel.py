@@ -0,0 +1,135 @@
+"""Module parallel: opt-in process pool execution of where/map/group_by aggregates"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+from src.lib.aggregates import (
+    accumulate_groups,
+    as_getter,
+    finalize_groups,
+    merge_groups,
+)
+from src.lib.mapper import map_function
+from src.lib.query import compile_query
+
+# Below this number of rows, spawning and feeding workers costs more than it saves
+PARALLEL_THRESHOLD = 50_000
+
+
+def _where_chunk(chunk, kwargs):
+    """Return the positions of the rows of chunk matching the lookups"""
+    predicate = compile_query(kwargs).predicate
+    return [position for position, row in enumerate(chunk) if predicate(row)]
+
+
+def _map_chunk(chunk, called):
+    """Read an attribute or call a ":method" on each row of chunk"""
+    return list(map(map_function(called), chunk))
+
+
+def _aggregate_chunk(chunk, key, aggregates):
+    """Return the partial aggregation states of chunk"""
+    return accumulate_groups(chunk, as_getter(key), aggregates)
+
+
+class ParallelCollection:
+    """
+    Run where(), map() and group_by aggregates of a list over a process pool.
+
+    The rows are split into chunks, each chunk is processed by a worker, and the
+    results are merged back in the original order. Below min_size rows, or with a
+    single worker, everything runs in the current process instead. Rows, lookup values,
+    group keys and aggregate fields are sent to the workers, so they must be picklable:
+    use attribute names or module level functions rather than lambdas.
+    Build one with ImprovedList.parallel().
+    """
+
+    def __init__(
+        self,
+        rows,
+        workers=None,
+        chunk_size=None,
+        min_size=PARALLEL_THRESHOLD,
+        executor=None,
+    ):
+        self._rows = rows
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.min_size = min_size
+        self._executor = executor
+
+    def _chunks(self):
+        rows = self._rows
+        size = self.chunk_size or max(1, -(-len(rows) // (self.workers * 4)))
+        return [rows[start : start + size] for start in range(0, len(rows), size)]
+
+    def _run(self, func, *args):
+        """
+        Apply func(chunk, *args) to each chunk.
+
+        Returns:
+            list: (chunk size, result) pairs, in the order of the rows.
+        """
+        if self.workers <= 1 or len(self._rows) < self.min_size:
+            return [(len(self._rows), func(self._rows, *args))]
+        chunks = self._chunks()
+        repeated = [[arg] * len(chunks) for arg in args]
+        if self._executor is not None:
+            results = self._executor.map(func, chunks, *repeated)
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(func, chunks, *repeated))
+        return list(zip(map(len, chunks), results))
+
+    def where(self, **kwargs):
+        """
+        Filter the rows like OrmCollection.where(), evaluated by the workers.
+
+        Workers only send back positions, so the result holds the rows of the source.
+
+        Returns:
+            OrmCollection: The matching rows, in their original order.
+
+        Raises:
+            ValueError: If an invalid operator is used.
+        """
+        from src.lib.orm_collection import OrmCollection
+
+        # Report invalid operators before starting the workers
+        compile_query(kwargs)
+        rows = self._rows
+        matched = OrmCollection()
+        start = 0
+        for size, positions in self._run(_where_chunk, kwargs):
+            matched.extend(rows[start + position] for position in positions)
+            start += size
+        return matched
+
+    def map(self, called):
+        """
+        Read an attribute or call a ":method" on each row, see ImprovedList.map().
+
+        Returns:
+            ImprovedList: The results, in the order of the rows.
+        """
+        from src.lib.improved_list import ImprovedList
+
+        results = self._run(_map_chunk, called)
+        return ImprovedList(chain.from_iterable(values for _, values in results))
+
+    def aggregate(self, key, **aggregates):
+        """
+        Aggregate by group like GroupBy.aggregate(): each worker aggregates a chunk and
+        the partial states are merged.
+
+        Args:
+            key (str or function): The group key, an attribute name or a picklable function.
+            **aggregates (Aggregate): Result names mapped to Count, Sum, Avg, Min or Max.
+
+        Returns:
+            dict: Group keys mapped to an ObjDict of the aggregated values.
+        """
+        as_getter(key)
+        partials = [part for _, part in self._run(_aggregate_chunk, key, aggregates)]
+        return finalize_groups(merge_groups(partials, aggregates), aggregates)
@@ -0,0 +1,69 @@
+"""Module projection: single-pass values/values_list/pluck/select over rows"""
+
+from src.lib.query import field_getter, fields_getter
+from src.lib.record import record_class
+
+
+def _check_fields(fields):
+    if not fields:
+        raise ValueError("At least one field must be provided")
+
+
+def iter_values(rows, fields):
+    """
+    Read the tuple of the given fields of each row, with a getter compiled once.
+
+    Args:
+        rows (iterable): The rows, read once.
+        fields (tuple): The attribute names.
+
+    Returns:
+        iterator: One tuple per row.
+
+    Raises:
+        ValueError: If no field is given.
+    """
+    _check_fields(fields)
+    return map(fields_getter(fields), rows)
+
+
+def values_list(rows, fields, flat=False):
+    """
+    Return the values of the given fields of each row.
+
+    Args:
+        rows (iterable): The rows, read once.
+        fields (tuple): The attribute names.
+        flat (bool, optional): True to return the values of a single field instead of
+            1-tuples. Defaults to False.
+
+    Returns:
+        list: One tuple per row, or one value per row when flat is True.
+
+    Raises:
+        ValueError: If no field is given, or several with flat=True.
+    """
+    if flat:
+        if len(fields) != 1:
+            raise ValueError("flat=True needs exactly one field")
+        return list(map(field_getter(fields[0]), rows))
+    return list(iter_values(rows, fields))
+
+
+def iter_records(rows, fields):
+    """
+    Project each row onto the given fields, as compact records (see src.lib.record).
+
+    Args:
+        rows (iterable): The rows, read once.
+        fields (tuple): The attribute names, valid Python identifiers.
+
+    Returns:
+        iterator: One Record per row.
+
+    Raises:
+        ValueError: If no field is given or a field name is invalid.
+    """
+    _check_fields(fields)
+    record = record_class(tuple(fields))
+    return (record(*values) for values in iter_values(rows, fields))
@@ -0,0 +1,253 @@
+"""Module query: compile OrmCollection lookups into reusable predicate plans"""
+
+import operator
+import re
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+
+LOOKUP_SEP = "__"
+EXACT = "exact"
+REGEX = "regex"
+IREGEX = "iregex"
+REGEX_LOOKUPS = (REGEX, IREGEX)
+
+OPERATORS = {
+    "lt": operator.lt,
+    "gt": operator.gt,
+    "endswith": lambda x, y: x.endswith(y),
+    "startswith": lambda x, y: x.startswith(y),
+    "in": lambda x, y: x in y,
+    "contains": operator.contains,
+    "nin": lambda x, y: x not in y,
+    "not": operator.ne,
+    "lte": operator.le,
+    "gte": operator.ge,
+}
+
+
+def field_getter(field):
+    """
+    Return a function reading a field, with itemgetter on dict rows and attrgetter otherwise.
+
+    Args:
+        field (str): The attribute name.
+
+    Returns:
+        function: The getter, taking a row.
+    """
+    get_item = itemgetter(field)
+    get_attr = attrgetter(field)
+    return lambda row: get_item(row) if isinstance(row, dict) else get_attr(row)
+
+
+def fields_getter(fields):
+    """
+    Return a function reading the tuple of several fields of a row.
+
+    Args:
+        fields (tuple): The attribute names.
+
+    Returns:
+        function: The getter, taking a row and returning a tuple of len(fields) values.
+    """
+    if len(fields) == 1:
+        get_one = field_getter(fields[0])
+        return lambda row: (get_one(row),)
+    get_items = itemgetter(*fields)
+    get_attrs = attrgetter(*fields)
+    return lambda row: get_items(row) if isinstance(row, dict) else get_attrs(row)
+
+
+def parse_lookup(key):
+    """
+    Split a lookup key such as "age__gte" into its attribute and operator.
+
+    Args:
+        key (str): The keyword argument name given to where().
+
+    Returns:
+        tuple: (attribute, operator) where operator is None for a bare attribute.
+
+    Raises:
+        ValueError: If the operator is not a known operator.
+    """
+    attribute, sep, op_name = key.partition(LOOKUP_SEP)
+    if not sep:
+        return attribute, None
+    if op_name not in OPERATORS and op_name not in REGEX_LOOKUPS:
+        raise ValueError(f"Invalid operator {op_name}")
+    return attribute, op_name
+
+
+@lru_cache(maxsize=256)
+def compile_pattern(pattern, flags=0):
+    """
+    Return the compiled regex for a pattern string, shared by every query.
+
+    Args:
+        pattern (str): The regular expression.
+        flags (int, optional): re flags. Defaults to 0.
+
+    Returns:
+        re.Pattern: The compiled pattern.
+
+    Raises:
+        ValueError: If pattern is not a valid regular expression.
+    """
+    try:
+        return re.compile(pattern, flags)
+    except (re.error, TypeError) as error:
+        raise ValueError(f"Invalid regular expression {pattern!r}: {error}") from error
+
+
+def as_regex(value, ignore_case=False):
+    """
+    Return the compiled pattern for the value of a regex lookup.
+
+    Args:
+        value (str or re.Pattern): The pattern, compiled ones are used as they are.
+        ignore_case (bool, optional): True for an "iregex" lookup. Defaults to False.
+
+    Returns:
+        re.Pattern
+    """
+    flags = re.IGNORECASE if ignore_case else 0
+    if isinstance(value, re.Pattern):
+        if value.flags & flags == flags:
+            return value
+        return compile_pattern(value.pattern, value.flags | flags)
+    return compile_pattern(value, flags)
+
+
+def resolve_lookup(op_name, value):
+    """
+    Resolve the kind of a lookup once its value is known.
+
+    A lookup without operator is an exact comparison, unless the value is a compiled
+    re.Pattern. "regex" and "iregex" lookups compile their pattern once, through the
+    shared cache of compile_pattern().
+
+    Args:
+        op_name (str or None): The operator parsed from the lookup key.
+        value: The value given for the lookup.
+
+    Returns:
+        tuple: (kind, value) where value is the compiled pattern for a regex lookup.
+
+    Raises:
+        ValueError: If the pattern of a regex lookup is invalid.
+    """
+    if op_name in REGEX_LOOKUPS:
+        return REGEX, as_regex(value, ignore_case=op_name == IREGEX)
+    if op_name is not None:
+        return op_name, value
+    if isinstance(value, re.Pattern):
+        return REGEX, value
+    return EXACT, value
+
+
+class QueryPlan:
+    """
+    Parsed shape of a where() query: the attributes, their accessors and the operators.
+
+    A plan only depends on the lookup keys, so it is built once per shape and bound to
+    the values of each call with bind().
+    """
+
+    __slots__ = ("shape", "attributes", "lookups", "item_getters", "attr_getters")
+
+    def __init__(self, shape):
+        self.shape = shape
+        self.lookups = tuple(parse_lookup(key) for key in shape)
+        # Each attribute is read once per row, whatever the number of lookups on it
+        self.attributes = tuple(dict.fromkeys(attr for attr, _ in self.lookups))
+        self.item_getters = tuple(itemgetter(attr) for attr in self.attributes)
+        self.attr_getters = tuple(attrgetter(attr) for attr in self.attributes)
+
+    def bind(self, values):
+        """
+        Bind the values of a where() call to the plan.
+
+        Args:
+            values (tuple): The lookup values, in the same order as the shape.
+
+        Returns:
+            CompiledQuery: The executable query.
+        """
+        return CompiledQuery(self, values)
+
+    def __repr__(self):
+        return f"QueryPlan({', '.join(self.shape)})"
+
+
+@lru_cache(maxsize=256)
+def get_plan(shape):
+    """Return the cached QueryPlan for a tuple of lookup keys"""
+    return QueryPlan(shape)
+
+
+def compile_query(kwargs):
+    """
+    Compile where() keyword arguments into an executable query.
+
+    Args:
+        kwargs (dict): Key-value pairs of lookups and values.
+
+    Returns:
+        CompiledQuery: The query, with a predicate ready to be applied to each row.
+
+    Raises:
+        ValueError: If an invalid operator or regular expression is used.
+    """
+    return get_plan(tuple(kwargs)).bind(tuple(kwargs.values()))
+
+
+class CompiledQuery:
+    """A QueryPlan bound to values, exposing a single predicate(row) function"""
+
+    __slots__ = ("plan", "values", "conditions", "predicate")
+
+    def __init__(self, plan, values):
+        self.plan = plan
+        self.values = values
+        self.conditions = tuple(
+            (attr,) + resolve_lookup(op_name, value)
+            for (attr, op_name), value in zip(plan.lookups, values)
+        )
+        self.predicate = self._build_predicate()
+
+    @staticmethod
+    def _build_test(kind, value):
+        """Return a one argument test for a single resolved lookup"""
+        if kind == EXACT:
+            return lambda attr_value: attr_value == value
+        if kind == REGEX:
+            return value.search
+        op_func = OPERATORS[kind]
+        return lambda attr_value: op_func(attr_value, value)
+
+    def _build_predicate(self):
+        """Group the tests by attribute and build the row predicate"""
+        plan = self.plan
+        if not plan.attributes:
+            return lambda elm: True
+        tests = {attr: [] for attr in plan.attributes}
+        for attr, kind, value in self.conditions:
+            tests[attr].append(self._build_test(kind, value))
+        tests = tuple(tuple(tests[attr]) for attr in plan.attributes)
+        item_checks = tuple(zip(plan.item_getters, tests))
+        attr_checks = tuple(zip(plan.attr_getters, tests))
+
+        def predicate(elm):
+            checks = item_checks if isinstance(elm, dict) else attr_checks
+            for getter, attr_tests in checks:
+                attr_value = getter(elm)
+                for test in attr_tests:
+                    if not test(attr_value):
+                        return False
+            return True
+
+        return predicate
+
+    def __repr__(self):
+        return f"CompiledQuery({self.conditions})"
@@ -0,0 +1,390 @@
+"""Module query_set: lazy where/order_by/offset/limit chains over an OrmCollection"""
+
+from collections import deque
+from itertools import islice
+
+from src.lib.distinct import count_distinct, iter_distinct
+from src.lib.exception import BaseMultipleFound, BaseNotFound
+from src.lib.instrumentation import (
+    HOOKS,
+    INDEX,
+    INDEX_ORDER,
+    SCAN,
+    WINDOW,
+    QueryStats,
+    lookup_shape,
+)
+from src.lib.join import difference_rows, hash_join, intersection_rows, union_rows
+from src.lib.mapper import map_function, map_rows
+from src.lib.ordering import parse_order_keys, sort_rows
+from src.lib.projection import iter_records, values_list
+from src.lib.query import compile_query
+
+WHERE = "where"
+ORDER_BY = "order_by"
+OFFSET = "offset"
+LIMIT = "limit"
+
+
+def _needed_rows(steps):
+    """Return how many rows the offset/limit steps read from their input, or None for all"""
+    skipped, needed = 0, None
+    for kind, *args in steps:
+        if kind == OFFSET:
+            skipped += args[0]
+        elif kind == LIMIT:
+            bound = skipped + args[0]
+            needed = bound if needed is None else min(needed, bound)
+        else:
+            break
+    return needed
+
+
+def _window(size, steps):
+    """
+    Return the positions read by the leading offset/limit steps, for a source of size rows.
+
+    The skipped rows are not walked through and nothing is copied. The steps are
+    removed from the list.
+    """
+    start, stop = 0, None
+    while steps and steps[0][0] in (OFFSET, LIMIT):
+        kind, count = steps.pop(0)
+        if kind == OFFSET:
+            start += count
+        else:
+            stop = start + count if stop is None else min(stop, start + count)
+    return range(size)[start:stop]
+
+
+def _key_name(key):
+    return key if isinstance(key, str) else getattr(key, "__name__", repr(key))
+
+
+def _shape(steps):
+    """Normalize the steps of a query, without the lookup values, for instrumentation"""
+    parts = []
+    for kind, *args in steps:
+        if kind == WHERE:
+            parts.append(lookup_shape(WHERE, args[0].plan.shape))
+        elif kind == ORDER_BY:
+            keys, reverse = args
+            names = [_key_name(key) for key in keys] + (["reverse"] if reverse else [])
+            parts.append(f"{ORDER_BY}({', '.join(names)})")
+        else:
+            parts.append(kind)
+    return " ".join(parts) or "all"
+
+
+class QuerySet:
+    """
+    A lazy query over an OrmCollection.
+
+    where(), order_by(), offset() and limit() only record a step. The chain runs in a
+    single pass over the source when the QuerySet is evaluated, and only as far as
+    needed: limit(), first(), exists(), find_by() and indexing stop the scan early,
+    and only order_by() holds the rows in memory. An order_by() followed by limit()
+    selects the top rows with a heap instead of sorting them all, and offset()/limit()
+    directly on the source read the rows of the page by position, without walking
+    through the skipped ones. Iteration, len() and comparisons evaluate the chain once
+    and keep the result, so that list(queryset) runs it once. The source is read at
+    evaluation time, not when the chain is built.
+    """
+
+    def __init__(self, source, steps=()):
+        self._source = source
+        self._steps = tuple(steps)
+        self._result_cache = None
+        # A CollectionView source builds collections of the class of its own source
+        self._collection_class = getattr(source, "collection_class", source.__class__)
+
+    def _chain(self, *step):
+        return self.__class__(self._source, self._steps + (step,))
+
+    def where(self, **kwargs) -> "QuerySet":
+        """
+        Add a filter step, see OrmCollection.where().
+
+        Raises:
+            ValueError: If an invalid operator is used.
+        """
+        return self._chain(WHERE, compile_query(kwargs))
+
+    def order_by(self, *keys, reverse=False, limit=None) -> "QuerySet":
+        """
+        Add a sort step, see OrmCollection.order_by().
+
+        Raises:
+            TypeError: If a key is not a valid attribute name or function.
+        """
+        parse_order_keys(keys)
+        chained = self._chain(ORDER_BY, keys, reverse)
+        return chained if limit is None else chained.limit(limit)
+
+    def offset(self, count) -> "QuerySet":
+        """Add a step skipping the first count rows"""
+        return self._chain(OFFSET, count)
+
+    def limit(self, count) -> "QuerySet":
+        """Add a step keeping at most count rows"""
+        return self._chain(LIMIT, count)
+
+    def all(self) -> "QuerySet":
+        """Return a copy of this QuerySet"""
+        return self.__class__(self._source, self._steps)
+
+    def _run(self):
+        """Build the fused iterator for the recorded steps"""
+        stats = None
+        if HOOKS:
+            stats = QueryStats(self._source.__class__.__name__, _shape(self._steps))
+        steps = list(self._steps)
+        queries = []
+        while steps and steps[0][0] == WHERE:
+            queries.append(steps.pop(0)[1])
+        if not queries and steps and steps[0][0] in (OFFSET, LIMIT):
+            rows = map(self._source.__getitem__, _window(len(self._source), steps))
+            if stats is not None:
+                stats.access = WINDOW
+                rows = stats.scanned(rows)
+        else:
+            order = steps[0][1:] if steps and steps[0][0] == ORDER_BY else ((), False)
+            rows, ordered = self._source._select(queries, *order, stats=stats)
+            if ordered:
+                steps.pop(0)
+        for position, (kind, *args) in enumerate(steps):
+            if kind == WHERE:
+                rows = filter(args[0].predicate, rows)
+            elif kind == ORDER_BY:
+                # A following limit only needs the first rows: select them with a heap
+                limit = _needed_rows(steps[position + 1 :])
+                rows = iter(sort_rows(rows, *args, limit=limit))
+            elif kind == OFFSET:
+                rows = islice(rows, args[0], None)
+            elif kind == LIMIT:
+                rows = islice(rows, args[0])
+        return rows if stats is None else stats.track(rows)
+
+    def explain(self):
+        """
+        Describe how the QuerySet would run, without reading any row.
+
+        Returns:
+            dict: The plan, with:
+                - "source": the class name of the source and "rows" its size,
+                - "shape": the normalized steps, lookups without their values, as
+                  reported by instrumentation (see src.lib.instrumentation),
+                - "access": how rows are read, "scan", "window" (offset/limit by
+                  position), "index" or "index_order" (sorted by an ordered index),
+                - "index": the index used, or None,
+                - "candidates": the number of rows read from the source, at most,
+                - "operations": the operations applied to these rows, in order.
+        """
+        source = self._source
+        steps = list(self._steps)
+        queries = []
+        while steps and steps[0][0] == WHERE:
+            queries.append(steps.pop(0)[1])
+        index, candidates = None, len(source)
+        operations = [
+            lookup_shape("filter", query.plan.shape)
+            for query in queries
+            if query.conditions
+        ]
+        if not queries and steps and steps[0][0] in (OFFSET, LIMIT):
+            access = WINDOW
+            candidates = len(_window(len(source), steps))
+        else:
+            order = steps[0][1:] if steps and steps[0][0] == ORDER_BY else ((), False)
+            access_path = getattr(source, "_access_path", None)
+            if access_path is not None:
+                access, index, positions = access_path(queries, *order)
+            else:
+                access, positions = SCAN, None
+            if access == INDEX:
+                candidates = len(positions)
+            elif access == INDEX_ORDER:
+                steps.pop(0)
+        for position, (kind, *args) in enumerate(steps):
+            if kind == WHERE:
+                operations.append(lookup_shape("filter", args[0].plan.shape))
+            elif kind == ORDER_BY:
+                limit = _needed_rows(steps[position + 1 :])
+                keys = ", ".join(_key_name(key) for key in args[0])
+                strategy = "sort" if limit is None else f"top {limit} (heap)"
+                operations.append(f"{strategy} by ({keys})" + " reversed" * args[1])
+            else:
+                operations.append(f"{kind} {args[0]}")
+        return {
+            "source": source.__class__.__name__,
+            "rows": len(source),
+            "shape": _shape(self._steps),
+            "access": access,
+            "index": index and repr(index),
+            "candidates": candidates,
+            "operations": operations,
+        }
+
+    def _rows(self):
+        """Return an iterator over the matching rows, without keeping them"""
+        if self._result_cache is not None:
+            return iter(self._result_cache)
+        return self._run()
+
+    def to_collection(self):
+        """
+        Evaluate the QuerySet.
+
+        Returns:
+            OrmCollection: The matching rows, in a collection of the source class.
+        """
+        if self._result_cache is None:
+            self._result_cache = self._collection_class(self._run())
+        return self._result_cache
+
+    def __iter__(self):
+        # list() and tuple() call len() after iter(): both read the result cache
+        return iter(self.to_collection())
+
+    def __len__(self):
+        return len(self.to_collection())
+
+    def __bool__(self):
+        return self.exists()
+
+    def __getitem__(self, item):
+        if self._result_cache is not None:
+            return self._result_cache[item]
+        if isinstance(item, slice):
+            start, stop, step = item.start or 0, item.stop, item.step
+            if start >= 0 and (stop is None or stop >= 0) and step is None:
+                chained = self.offset(start) if start else self.all()
+                if stop is not None:
+                    chained = chained.limit(max(stop - start, 0))
+                return chained
+            return self.to_collection()[item]
+        if item < 0:
+            return self.to_collection()[item]
+        for row in islice(self._rows(), item, None):
+            return row
+        raise IndexError("QuerySet index out of range")
+
+    def __eq__(self, other):
+        if isinstance(other, QuerySet):
+            other = other.to_collection()
+        return self.to_collection() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+    def count(self):
+        """Return the number of matching rows"""
+        if self._result_cache is not None:
+            return len(self._result_cache)
+        return sum(1 for _ in self._run())
+
+    def exists(self):
+        """Return True if at least one row matches, stopping at the first one"""
+        if self._result_cache is not None:
+            return bool(self._result_cache)
+        for _ in self._run():
+            return True
+        return False
+
+    def first(self, count=1):
+        """
+        Return the first count matching rows, see ImprovedList.first().
+
+        The scan stops as soon as count rows are found, and a previous order_by() only
+        selects the first rows.
+        """
+        rows = (
+            self._result_cache if self._result_cache is not None else self.limit(count)
+        )
+        return self._collection_class(islice(rows, count)).first(count)
+
+    def last(self, count=1):
+        """Return the last count matching rows, see ImprovedList.last()"""
+        return self._collection_class(deque(self, maxlen=count)).last(count)
+
+    def find_by(self, **kwargs) -> object:
+        """
+        Find the single matching row, see OrmCollection.find_by().
+
+        The scan stops at the second match.
+
+        Raises:
+            BaseNotFound: If no objects are found that match the given attributes.
+            BaseMultipleFound: If more than one object is found that matches the given attributes.
+        """
+        matches = list(islice(self.where(**kwargs)._rows(), 2))
+        name = self._collection_class.__name__
+        if not matches:
+            raise BaseNotFound(f"No {name} found for {kwargs}")
+        if len(matches) > 1:
+            raise BaseMultipleFound(f"More than one {name} found for {kwargs}")
+        return matches[0]
+
+    def group_by(self, key_func):
+        """Group the matching rows, see OrmCollection.group_by()"""
+        from src.lib.aggregates import GroupBy
+
+        return GroupBy(self, key_func)
+
+    def distinct(self, *args, lazy=False):
+        """
+        Deduplicate the matching rows in a single pass, see OrmCollection.distinct().
+
+        With lazy=True, the unique rows are yielded as the chain runs.
+        """
+        rows = iter_distinct(self._rows() if lazy else self, args)
+        return rows if lazy else self._collection_class(rows)
+
+    def count_distinct(self, field, approximate=False, precision=14):
+        """Count the distinct values of a field, see OrmCollection.count_distinct()"""
+        return count_distinct(self, field, approximate, precision)
+
+    def values(self, *fields):
+        """Return the values of some fields of the matching rows, see OrmCollection.values()"""
+        return values_list(self, fields)
+
+    def values_list(self, *fields, flat=False):
+        """Return the values of some fields of the matching rows, see OrmCollection.values_list()"""
+        return values_list(self, fields, flat)
+
+    def pluck(self, field):
+        """Return the values of a field of the matching rows, see OrmCollection.pluck()"""
+        return values_list(self, (field,), flat=True)
+
+    def select(self, *fields):
+        """Project the matching rows onto some fields, see OrmCollection.select()"""
+        return self._collection_class(iter_records(self, fields))
+
+    def join(self, other, on, how="inner", right_on=None, suffix="_right"):
+        """Join the matching rows with another collection, see OrmCollection.join()"""
+        return self._collection_class(hash_join(self, other, on, how, right_on, suffix))
+
+    def union(self, other, on=None):
+        """Return the matching rows and those of other, once per key, see OrmCollection.union()"""
+        return self._collection_class(union_rows(self, other, on))
+
+    def intersection(self, other, on=None):
+        """Return the matching rows whose key is a key of other, see OrmCollection.intersection()"""
+        return self._collection_class(intersection_rows(self, other, on))
+
+    def difference(self, other, on=None):
+        """Return the matching rows whose key is not a key of other, see OrmCollection.difference()"""
+        return self._collection_class(difference_rows(self, other, on))
+
+    def map(self, called, *args, lazy=False, workers=None, **kwargs):
+        """Map the matching rows as they are found, see ImprovedList.map()"""
+        rows = self._rows() if lazy else self
+        results = map_rows(rows, map_function(called, *args, **kwargs), workers)
+        return results if lazy else self._collection_class(results)
+
+    @property
+    def inspect(self):
+        """Evaluate the QuerySet and display it, see ImprovedList.inspect"""
+        return self.to_collection().inspect
@@ -0,0 +1,119 @@
+"""Module record: compact __slots__ rows bound to a schema, an alternative to ObjDict"""
+
+import keyword
+from collections.abc import Mapping
+from functools import lru_cache
+
+
+class Record:
+    """
+    Base class of the record classes built by record_class().
+
+    A record stores its values in __slots__: no dict per row, and attribute reads are
+    plain slot accesses instead of going through ObjDict.__getattr__. Records also
+    support row["field"], to_dict() and inspect, like ObjDict.
+    """
+
+    __slots__ = ()
+    _fields = ()
+
+    def __init__(self, *values):
+        if len(values) != len(self._fields):
+            raise TypeError(
+                f"{self.__class__.__name__} takes {len(self._fields)} values, got {len(values)}"
+            )
+        for field, value in zip(self._fields, values):
+            setattr(self, field, value)
+
+    @classmethod
+    def from_dict(cls, mapping):
+        """
+        Build a record from a dict, keys outside the schema are ignored.
+
+        Args:
+            mapping (dict): The row. Missing fields are set to None.
+
+        Returns:
+            Record: The record.
+        """
+        return cls(*map(mapping.get, cls._fields))
+
+    def to_dict(self):
+        """Return the values of the record as a new dict"""
+        return {field: getattr(self, field) for field in self._fields}
+
+    def keys(self):
+        """Return the field names, so that dict(record) works"""
+        return self._fields
+
+    def __getitem__(self, field):
+        if field not in self._fields:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return self._fields == other._fields and self.to_dict() == other.to_dict()
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        values = ", ".join(
+            f"{field}={getattr(self, field)!r}" for field in self._fields
+        )
+        return f"{self.__class__.__name__}({values})"
+
+    def __reduce__(self):
+        # Record classes are built at runtime: pickle the schema rather than the class
+        return (_rebuild, (self._fields, tuple(getattr(self, f) for f in self._fields)))
+
+    @property
+    def inspect(self):
+        """Return a pretty formatted informatopn of object"""
+        import pprint
+
+        pretty_print = pprint.PrettyPrinter(indent=4)
+        pretty_print.pprint(self.to_dict())
+
+
+@lru_cache(maxsize=None)
+def record_class(schema):
+    """
+    Return the record class of a schema, built once per schema.
+
+    Args:
+        schema (tuple): The field names, valid Python identifiers.
+
+    Returns:
+        type: A Record subclass with one slot per field.
+
+    Raises:
+        ValueError: If a field name is not a valid identifier, is repeated, starts with
+            an underscore or shadows a Record method.
+    """
+    schema = tuple(schema)
+    for field in schema:
+        if (
+            not isinstance(field, str)
+            or not field.isidentifier()
+            or keyword.iskeyword(field)
+            or field.startswith("_")
+            or hasattr(Record, field)
+        ):
+            raise ValueError(f"Invalid field name {field!r}")
+    if len(set(schema)) != len(schema):
+        raise ValueError(f"Repeated field name in {schema}")
+    return type("Record", (Record,), {"__slots__": schema, "_fields": schema})
+
+
+def _rebuild(schema, values):
+    return record_class(schema)(*values)
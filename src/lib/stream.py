@@ -0,0 +1,199 @@
+"""Module stream: OrmCollection queries over iterables, files and generators"""
+
+import csv
+import json
+from functools import partial
+from itertools import islice
+
+from src.lib.aggregates import GroupBy, as_getter
+from src.lib.distinct import count_distinct, iter_distinct
+from src.lib.exception import BaseMultipleFound, BaseNotFound
+from src.lib.mapper import map_function, map_rows
+from src.lib.obj_dict import ObjDict
+from src.lib.orm_collection import OrmCollection
+from src.lib.query import compile_query
+
+
+class _Stage:
+    """Re-iterable generator stage: calls func on a fresh iterator of its parent"""
+
+    def __init__(self, parent, func):
+        self._parent = parent
+        self._func = func
+
+    def __iter__(self):
+        return iter(self._func(iter(self._parent)))
+
+
+class _FileRows:
+    """Re-iterable reader opening the file again on each iteration"""
+
+    def __init__(self, path, parse):
+        self._path = path
+        self._parse = parse
+
+    def __iter__(self):
+        with open(self._path, "r", encoding="utf-8", newline="") as tmpf:
+            yield from self._parse(tmpf)
+
+
+def _jsonl_rows(lines):
+    for line in lines:
+        if line.strip():
+            yield ObjDict(json.loads(line))
+
+
+def _csv_rows(lines, **reader_kwargs):
+    for row in csv.DictReader(lines, **reader_kwargs):
+        yield ObjDict(row)
+
+
+class StreamingCollection:
+    """
+    A query pipeline over any iterable, evaluated one row at a time.
+
+    where(), map(), distinct(), offset() and limit() return a new StreamingCollection
+    wrapping a generator stage, so nothing is read until the result is iterated and
+    rows are never held all at once. Only distinct() keeps state: the set of values
+    already seen. A pipeline is re-iterable when its source is, which is the case for
+    lists and for the from_jsonl()/from_csv() readers, but not for a generator.
+    """
+
+    def __init__(self, source):
+        self._source = source
+
+    @classmethod
+    def from_jsonl(cls, path):
+        """
+        Stream the records of a JSON Lines file, one ObjDict per non blank line.
+
+        Args:
+            path (str): The file path.
+
+        Returns:
+            StreamingCollection: The stream of records.
+        """
+        return cls(_FileRows(path, _jsonl_rows))
+
+    @classmethod
+    def from_csv(cls, path, **reader_kwargs):
+        """
+        Stream the rows of a CSV file with a header, one ObjDict of strings per row.
+
+        Args:
+            path (str): The file path.
+            **reader_kwargs: Extra arguments given to csv.DictReader.
+
+        Returns:
+            StreamingCollection: The stream of rows.
+        """
+        return cls(_FileRows(path, partial(_csv_rows, **reader_kwargs)))
+
+    def __iter__(self):
+        return iter(self._source)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._source!r})"
+
+    def _pipe(self, func):
+        return self.__class__(_Stage(self, func))
+
+    def where(self, **kwargs) -> "StreamingCollection":
+        """
+        Keep the rows matching the criteria, see OrmCollection.where().
+
+        Raises:
+            ValueError: If an invalid operator is used.
+        """
+        predicate = compile_query(kwargs).predicate
+        return self._pipe(partial(filter, predicate))
+
+    def map(self, called, *args, workers=None, **kwargs) -> "StreamingCollection":
+        """
+        Read an attribute or call a ":method" on each row, see ImprovedList.map().
+
+        With workers, the calls run on a thread pool, a few rows ahead of the reader.
+        """
+        func = map_function(called, *args, **kwargs)
+        return self._pipe(partial(map_rows, func=func, workers=workers))
+
+    def distinct(self, *args) -> "StreamingCollection":
+        """
+        Keep the first row of each combination of the given fields, or of each value
+        when no field is given, see OrmCollection.distinct().
+
+        Memory grows with the number of distinct values, not with the number of rows.
+        """
+        return self._pipe(partial(iter_distinct, fields=args))
+
+    def offset(self, count) -> "StreamingCollection":
+        """Skip the first count rows"""
+        return self._pipe(lambda rows: islice(rows, count, None))
+
+    def limit(self, count) -> "StreamingCollection":
+        """Stop after count rows, without reading the rest of the source"""
+        return self._pipe(lambda rows: islice(rows, count))
+
+    def group_by(self, key_func, func=None, initial=None):
+        """
+        Group the rows based on a given function or attribute.
+
+        Args:
+            key_func (function or str): A function that takes a row as input and returns the
+                group key, or the name of the attribute holding it.
+            func (function, optional): Fold each group with func(accumulator, row), like
+                functools.reduce, keeping a single accumulator per group in memory.
+                Defaults to None.
+            initial (optional): The accumulator of a new group. Defaults to None.
+
+        Returns:
+            dict or GroupBy: Group keys mapped to their accumulator when func is given.
+            Otherwise a GroupBy, whose aggregate() reads the stream once with a running
+            accumulator per group, and which collects the rows when used as a mapping.
+        """
+        if func is None:
+            return GroupBy(self, key_func)
+        key_func = as_getter(key_func)
+        groups = {}
+        for row in self:
+            key = key_func(row)
+            groups[key] = func(groups.get(key, initial), row)
+        return groups
+
+    def count(self):
+        """Return the number of rows, reading the whole stream"""
+        return sum(1 for _ in self)
+
+    def count_distinct(self, field, approximate=False, precision=14):
+        """
+        Count the distinct values of a field, see OrmCollection.count_distinct().
+
+        With approximate=True, memory stays bounded by the HyperLogLog sketch instead of
+        growing with the number of distinct values.
+        """
+        return count_distinct(self, field, approximate, precision)
+
+    def first(self, count=1):
+        """Return the first count rows, see ImprovedList.first()"""
+        return OrmCollection(islice(self, count)).first(count)
+
+    def find_by(self, **kwargs) -> object:
+        """
+        Find the single matching row, stopping at the second match.
+
+        Raises:
+            BaseNotFound: If no row matches.
+            BaseMultipleFound: If more than one row matches.
+        """
+        matches = list(islice(self.where(**kwargs), 2))
+        if not matches:
+            raise BaseNotFound(f"No {self.__class__.__name__} found for {kwargs}")
+        if len(matches) > 1:
+            raise BaseMultipleFound(
+                f"More than one {self.__class__.__name__} found for {kwargs}"
+            )
+        return matches[0]
+
+    def to_collection(self):
+        """Read the whole stream into an OrmCollection"""
+        return OrmCollection(self)
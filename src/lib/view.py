@@ -0,0 +1,172 @@
+"""Module view: read-only windows over a collection, without copying its rows"""
+
+from collections.abc import Sequence
+
+from src.lib.query_set import QuerySet
+
+
+class CollectionView(Sequence):
+    """
+    A read-only sequence of some rows of a collection, given by their positions.
+
+    The view holds its source and a range (or list) of positions, never the rows:
+    building one, slicing it or taking first()/last() of it doesn't copy anything.
+    Rows are read from the source when accessed, so a view follows in-place changes
+    of the source, but not insertions or removals, which shift the positions.
+    The query methods of OrmCollection are available, through a QuerySet over the
+    view, and to_collection() makes an actual copy.
+    """
+
+    __slots__ = ("_source", "_positions")
+
+    def __init__(self, source, positions=None):
+        self._source = source
+        self._positions = range(len(source)) if positions is None else positions
+
+    @property
+    def collection_class(self):
+        """The class of the collections built from the view"""
+        source = self._source
+        return getattr(source, "collection_class", source.__class__)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.__class__(self._source, self._positions[item])
+        return self._source[self._positions[item]]
+
+    def __iter__(self):
+        return map(self._source.__getitem__, self._positions)
+
+    def __eq__(self, other):
+        if isinstance(other, QuerySet):
+            return other == self
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            mine == theirs for mine, theirs in zip(self, other)
+        )
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+    def to_collection(self):
+        """
+        Copy the rows of the view.
+
+        Returns:
+            OrmCollection: A new collection of the class of the source.
+        """
+        return self.collection_class(self)
+
+    def _select(self, queries, order_keys=(), reverse=False, stats=None):
+        """Return the rows matching all the compiled queries, for QuerySet"""
+        rows = iter(self)
+        if stats is not None:
+            rows = stats.scanned(rows)
+        for query in queries:
+            if query.conditions:
+                rows = filter(query.predicate, rows)
+        return rows, False
+
+    def query(self) -> QuerySet:
+        """Return a lazy QuerySet over the rows of the view"""
+        return QuerySet(self)
+
+    def where(self, **kwargs) -> QuerySet:
+        """Filter the rows of the view, see OrmCollection.where()"""
+        return self.query().where(**kwargs)
+
+    def find_by(self, **kwargs) -> object:
+        """Find the single matching row of the view, see OrmCollection.find_by()"""
+        return self.query().find_by(**kwargs)
+
+    def order_by(self, *keys, reverse=False, limit=None) -> QuerySet:
+        """Sort the rows of the view, see OrmCollection.order_by()"""
+        return self.query().order_by(*keys, reverse=reverse, limit=limit)
+
+    def limit(self, count) -> "CollectionView":
+        """Return a view of the first count rows"""
+        return self[:count]
+
+    def offset(self, count) -> "CollectionView":
+        """Return a view of the rows after the first count rows"""
+        return self[count:]
+
+    def all(self) -> "CollectionView":
+        """Return the view itself: views are read-only, there is nothing to protect"""
+        return self
+
+    def first(self, count=1):
+        """Return the first row, or a view of the first count rows, see ImprovedList.first()"""
+        return _single_or_view(self[:count])
+
+    def last(self, count=1):
+        """Return the last row, or a view of the last count rows, see ImprovedList.last()"""
+        return _single_or_view(self[-count:])
+
+    def group_by(self, key_func):
+        """Group the rows of the view, see OrmCollection.group_by()"""
+        return self.query().group_by(key_func)
+
+    def distinct(self, *args, lazy=False):
+        """Deduplicate the rows of the view, see OrmCollection.distinct()"""
+        return self.query().distinct(*args, lazy=lazy)
+
+    def count_distinct(self, field, approximate=False, precision=14):
+        """Count the distinct values of a field, see OrmCollection.count_distinct()"""
+        return self.query().count_distinct(field, approximate, precision)
+
+    def values(self, *fields):
+        """Return the values of some fields of the rows, see OrmCollection.values()"""
+        return self.query().values(*fields)
+
+    def values_list(self, *fields, flat=False):
+        """Return the values of some fields of the rows, see OrmCollection.values_list()"""
+        return self.query().values_list(*fields, flat=flat)
+
+    def pluck(self, field):
+        """Return the values of a field of the rows, see OrmCollection.pluck()"""
+        return self.query().pluck(field)
+
+    def select(self, *fields):
+        """Project the rows onto some fields, see OrmCollection.select()"""
+        return self.query().select(*fields)
+
+    def join(self, other, on, how="inner", right_on=None, suffix="_right"):
+        """Join the rows of the view with another collection, see OrmCollection.join()"""
+        return self.query().join(other, on, how, right_on, suffix)
+
+    def union(self, other, on=None):
+        """Return the rows of the view and of other, once per key, see OrmCollection.union()"""
+        return self.query().union(other, on)
+
+    def intersection(self, other, on=None):
+        """Return the rows of the view whose key is a key of other, see OrmCollection.intersection()"""
+        return self.query().intersection(other, on)
+
+    def difference(self, other, on=None):
+        """Return the rows of the view whose key is not a key of other, see OrmCollection.difference()"""
+        return self.query().difference(other, on)
+
+    def map(self, called, *args, lazy=False, workers=None, **kwargs):
+        """Read an attribute or call a ":method" on each row, see ImprovedList.map()"""
+        return self.query().map(called, *args, lazy=lazy, workers=workers, **kwargs)
+
+    @property
+    def inspect(self):
+        """Display the rows of the view, see ImprovedList.inspect"""
+        return self.to_collection().inspect
+
+
+def _single_or_view(view):
+    """Apply the return convention of ImprovedList.first() and last() to a view"""
+    if len(view) > 1:
+        return view
+    if len(view) == 1:
+        return view[0]
+    return None
@@ -1,3 +1,27 @@
-from .context import Context, DependencyContainer
-from .controller import UserController
-from .service import UserService, Service, AnotherService
+from importlib import import_module
+
+# Attributes of the package and the submodule defining them, imported on first access
+# (PEP 562) so that importing the package, or one of its modules, stays cheap
+_LAZY_ATTRIBUTES = {
+    "Context": ".context",
+    "DependencyContainer": ".context",
+    "UserController": ".controller",
+    "UserService": ".service",
+    "Service": ".service",
+    "AnotherService": ".service",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1 +1,10 @@
-from .visitor import AbsVisitor
+from .lazy import lazy_attributes
+
+# Attributes of the package and the submodule defining them, see lazy_attributes()
+_LAZY_ATTRIBUTES = {
+    "AbsVisitor": ".visitor",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
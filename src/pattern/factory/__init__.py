@@ -1 +1,11 @@
-from .employee_factory import ObjectFactory
+from ..lazy import lazy_attributes
+
+# Attributes of the package and the submodule defining them, see lazy_attributes()
+_LAZY_ATTRIBUTES = {
+    "ObjectFactory": ".employee_factory",
+    "ClassRegistry": ".registry",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
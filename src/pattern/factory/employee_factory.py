@@ -1,35 +1,182 @@
-from typing import List, Union
+import logging
+from typing import Iterable, Iterator, List, Mapping, Tuple
+
+logger = logging.getLogger(__name__)
+
+RESERVED_KEYS = frozenset(("class", "params"))
+
+# Steps of a build plan
+CREATE = "create"
+WIRE = "wire"
+
+# Build plans kept per factory, one per configuration shape
+MAX_PLANS = 256
+
+
+def parse_conf(conf: dict) -> Tuple[tuple, List[dict]]:
+    """
+    Split a configuration into its shape and the params of its objects.
+
+    The configuration is walked with a stack, so its depth is not bound by the
+    recursion limit.
+
+    Args:
+        conf (dict): The configuration of the root object: "class", optional "params",
+            and one key per attribute holding a child configuration or a list of them.
+
+    Returns:
+        tuple: (shape, params) where shape holds a (class name, parent slot, attribute)
+        tuple per object, in creation order, and params the params of each object. A slot
+        is the position of an object in that order.
+    """
+    shape, params = [], []
+    stack = [(conf, None, None)]
+    while stack:
+        node, parent, key = stack.pop()
+        slot = len(shape)
+        shape.append((node.get("class"), parent, key))
+        params.append(node.get("params", {}))
+        children = [
+            (child, slot, child_key)
+            for child_key, value in node.items()
+            if child_key not in RESERVED_KEYS
+            for child in (value if isinstance(value, list) else (value,))
+        ]
+        stack.extend(reversed(children))
+    return tuple(shape), params
+
+
+def compile_plan(shape: tuple, class_map: Mapping) -> List[Tuple]:
+    """
+    Compile the shape of a configuration into a flat build plan, resolving every class once.
+
+    The plan lists the steps of the construction in the order of the former recursive
+    factory: an object is created before its children, and each child is set on its
+    parent once the whole child is built. It holds no params, so that every
+    configuration of the same shape shares it.
+
+    Args:
+        shape (tuple): The shape given by parse_conf().
+        class_map (dict or ClassRegistry): The classes by name. Only the classes of the
+            shape are looked up, so that a ClassRegistry only imports those.
+
+    Returns:
+        list: (CREATE, slot, class) and (WIRE, parent slot, attribute, child slot) steps.
+
+    Raises:
+        ValueError: If a class is not in the class map.
+    """
+    plan = []
+    building = []
+
+    def wire(slot):
+        _, parent, key = shape[slot]
+        if parent is not None:
+            plan.append((WIRE, parent, key, slot))
+
+    for slot, (class_type, parent, _) in enumerate(shape):
+        class_ = class_map.get(class_type)
+        if class_ is None:
+            raise ValueError(f"Class type {class_type} not found in class map")
+        # The objects built since the parent are complete
+        while building and building[-1] != parent:
+            wire(building.pop())
+        plan.append((CREATE, slot, class_))
+        building.append(slot)
+    while building:
+        wire(building.pop())
+    return plan
+
+
+def run_plan(plan: List[Tuple], params: List[dict]):
+    """
+    Execute a build plan, see compile_plan().
+
+    Each created object and each attribute set is reported with logging, at debug level.
+
+    Args:
+        plan (list): The steps.
+        params (list): The params of each object, see parse_conf().
+
+    Returns:
+        The root object.
+    """
+    debug = logger.isEnabledFor(logging.DEBUG)
+    objects = []
+    for step in plan:
+        if step[0] == CREATE:
+            _, slot, class_ = step
+            obj = class_(**params[slot])
+            objects.append(obj)
+            if debug:
+                logger.debug("%s()", obj.__class__.__name__)
+        else:
+            _, parent, key, child = step
+            setattr(objects[parent], key, objects[child])
+            if debug:
+                logger.debug(
+                    "%s.%s = %s",
+                    objects[parent].__class__.__name__,
+                    key,
+                    objects[child].__class__.__name__,
+                )
+    return objects[0]
 
 
 class ObjectFactory:
-    def __init__(self, conf: dict, class_map: dict):
+    def __init__(self, conf: dict = None, class_map: Mapping = None):
+        """
+        Args:
+            conf (dict, optional): The configuration built by get_object(). Defaults to
+                None for a factory only used with create_object() and create_many().
+            class_map (dict or ClassRegistry): The classes by name.
+        """
+        if class_map is None:
+            raise TypeError("ObjectFactory needs a class_map")
         self.class_map = class_map
         self.conf = conf
+        self._plans = {}
+
+    def plan(self, shape: tuple) -> List[Tuple]:
+        """Return the build plan of a configuration shape, compiled once per shape"""
+        plan = self._plans.get(shape)
+        if plan is None:
+            if len(self._plans) >= MAX_PLANS:
+                del self._plans[next(iter(self._plans))]
+            plan = self._plans[shape] = compile_plan(shape, self.class_map)
+        return plan
 
     def get_object(self):
+        if self.conf is None:
+            raise ValueError("The factory has no conf, use create_object() instead")
         return self.create_object(self.conf)
 
     def create_object(self, conf: dict):
-        class_type = conf.get("class")
-        class_name = self.class_map.get(class_type)
-        if class_name is None:
-            raise ValueError(f"Class type {class_type} not found in class map")
-        obj = class_name(**conf.get("params", {}))
-        print(f"{obj.__class__.__name__}()")
-        for key, value in conf.items():
-            if key in ["class", "params"]:
-                continue
-            if isinstance(value, list):
-                for item in value:
-                    child_obj = self.create_object(item)
-                    setattr(obj, key, child_obj)
-                    print(
-                        f"{obj.__class__.__name__}.{key} = {child_obj.__class__.__name__}"
-                    )
-            else:
-                child_obj = self.create_object(value)
-                setattr(obj, key, child_obj)
-                print(
-                    f"{obj.__class__.__name__}.{key} = {child_obj.__class__.__name__}"
-                )
-        return obj
+        shape, params = parse_conf(conf)
+        return run_plan(self.plan(shape), params)
+
+    def create_many(self, confs: Iterable[dict]) -> Iterator:
+        """
+        Build one object per configuration, lazily.
+
+        Configurations of the same shape (same classes and attributes, whatever their
+        params) share a compiled build plan, and only their params are read per object.
+        Nothing is kept between objects but the plans, so a stream of configurations
+        such as a multi-document YAML file or JSON lines is built in flat memory.
+
+        Args:
+            confs (iterable): The configurations, read one at a time.
+
+        Yields:
+            The root object of each configuration.
+
+        Raises:
+            ValueError: If a class is not in the class map.
+
+        Example:
+            >>> factory = ObjectFactory(class_map=class_map)
+            >>> docs = yaml.safe_load_all(stream)
+            >>> employees = factory.create_many(doc["employee"] for doc in docs)
+        """
+        for conf in confs:
+            yield self.create_object(conf)
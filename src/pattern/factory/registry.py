@@ -0,0 +1,113 @@
+from collections.abc import Mapping
+from importlib import import_module
+from operator import attrgetter
+from typing import Iterator, Union
+
+PATH_SEPARATOR = ":"
+
+
+class ClassRegistry(Mapping):
+    """
+    A class map for ObjectFactory importing each class on first use.
+
+    Classes are registered by name with a "module:Class" path, and only the module of
+    a class that a configuration uses is imported, once: the class is then cached.
+    Classes can also be registered directly, with register() as a decorator, or from
+    the entry points of installed packages.
+
+    Example:
+        >>> registry = ClassRegistry({"Payroll": "pattern.observer.observers:Payroll"})
+        >>> @registry.register
+        ... class Audit:
+        ...     pass
+        >>> ObjectFactory(conf, registry).get_object()
+    """
+
+    def __init__(self, paths: Mapping = None):
+        self._paths = {}
+        self._classes = {}
+        for name, path in (paths or {}).items():
+            self.add(name, path)
+
+    def add(self, name: str, path: Union[str, type]):
+        """
+        Register a class by name.
+
+        Args:
+            name (str): The name used in the "class" key of the configurations.
+            path (str or type): "module:Class", with a dotted Class for a nested class,
+                or the class itself.
+
+        Raises:
+            ValueError: If path is a string without ":".
+        """
+        if isinstance(path, str):
+            if PATH_SEPARATOR not in path:
+                raise ValueError(
+                    f"Invalid class path {path!r}, expected 'module:Class'"
+                )
+            self._classes.pop(name, None)
+        else:
+            self._classes[name] = path
+        self._paths[name] = path
+
+    def register(self, name_or_class=None):
+        """
+        Register a class, as a decorator.
+
+        Args:
+            name_or_class (str or type, optional): The class, registered under its own
+                name, or the name to register the decorated class under.
+
+        Returns:
+            The class, or a decorator registering it under the given name.
+        """
+        if isinstance(name_or_class, type):
+            self.add(name_or_class.__name__, name_or_class)
+            return name_or_class
+
+        def decorator(class_):
+            self.add(name_or_class or class_.__name__, class_)
+            return class_
+
+        return decorator
+
+    def load_entry_points(self, group: str):
+        """
+        Register the entry points of a group, without importing them.
+
+        Installed packages declare their classes in their metadata, for instance in
+        pyproject.toml:
+
+            [project.entry-points."auta.classes"]
+            Audit = "plugin.audit:Audit"
+
+        Args:
+            group (str): The entry point group.
+        """
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=group):
+            self.add(entry_point.name, entry_point.value)
+
+    def __getitem__(self, name: str) -> type:
+        class_ = self._classes.get(name)
+        if class_ is None:
+            path = self._paths[name]
+            module_name, _, qualname = path.partition(PATH_SEPARATOR)
+            class_ = attrgetter(qualname)(import_module(module_name))
+            self._classes[name] = class_
+        return class_
+
+    def __contains__(self, name) -> bool:
+        # Without importing the class
+        return name in self._paths
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({sorted(self._paths)})"
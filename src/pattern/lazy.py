@@ -0,0 +1,34 @@
+"""Module lazy: attributes of the pattern packages imported on first access"""
+
+import sys
+from importlib import import_module
+
+
+def lazy_attributes(name, mapping):
+    """
+    Return the module __getattr__ and __dir__ of a package with lazy attributes (PEP 562).
+
+    The pattern packages, and employees which builds on them, don't depend on lib:
+    this is their counterpart of lib.lazy.lazy_attributes().
+
+    Args:
+        name (str): The __name__ of the package.
+        mapping (dict): The submodule defining each attribute, relative to the package,
+            such as {"ObjectFactory": ".employee_factory"}.
+
+    Returns:
+        tuple: The (__getattr__, __dir__) functions of the package.
+    """
+
+    def __getattr__(attribute):
+        module = mapping.get(attribute)
+        if module is None:
+            raise AttributeError(f"module {name!r} has no attribute {attribute!r}")
+        value = getattr(import_module(module, name), attribute)
+        setattr(sys.modules[name], attribute, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[name])) | set(mapping))
+
+    return __getattr__, __dir__
@@ -1,3 +1,12 @@
-from .observers import AbsObserver
-from .observers import Payroll
-from .observers import TaxAuthority
+from ..lazy import lazy_attributes
+
+# Attributes of the package and the submodule defining them, see lazy_attributes()
+_LAZY_ATTRIBUTES = {
+    "AbsObserver": ".observers",
+    "Payroll": ".observers",
+    "TaxAuthority": ".observers",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
@@ -1,3 +1,12 @@
-from .strategies import AbsTaxStrategy
-from .strategies import FlatTaxStrategy
-from .strategies import ProgressiveTaxStrategy
+from ..lazy import lazy_attributes
+
+# Attributes of the package and the submodule defining them, see lazy_attributes()
+_LAZY_ATTRIBUTES = {
+    "AbsTaxStrategy": ".strategies",
+    "FlatTaxStrategy": ".strategies",
+    "ProgressiveTaxStrategy": ".strategies",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
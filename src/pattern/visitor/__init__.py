@@ -1,3 +1,12 @@
-from .visitors import PayrollVisitor
-from .visitors import TaxAuthorityVisitor
-from .visitors import AbsVisitor
+from ..lazy import lazy_attributes
+
+# Attributes of the package and the submodule defining them, see lazy_attributes()
+_LAZY_ATTRIBUTES = {
+    "PayrollVisitor": ".visitors",
+    "TaxAuthorityVisitor": ".visitors",
+    "AbsVisitor": ".visitors",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+__getattr__, __dir__ = lazy_attributes(__name__, _LAZY_ATTRIBUTES)
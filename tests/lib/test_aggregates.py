@@ -0,0 +1,66 @@
+import pytest
+from src.lib import (
+    OrmCollection,
+    ObjDict,
+    StreamingCollection,
+    Count,
+    Sum,
+    Avg,
+    Min,
+    Max,
+)
+
+
+@pytest.fixture
+def employees():
+    return OrmCollection(
+        [
+            ObjDict({"name": "Alice", "dept": "it", "age": 25, "salary": 3000}),
+            ObjDict({"name": "Bob", "dept": "hr", "age": 40, "salary": None}),
+            ObjDict({"name": "Charlie", "dept": "it", "age": 30, "salary": 5000}),
+            ObjDict({"name": "Dave", "dept": "hr", "age": 30, "salary": 5000}),
+        ]
+    )
+
+
+EXPECTED = {
+    "it": {"count": 2, "paid": 2, "total": 8000, "avg": 27.5, "mn": 25, "mx": 5000},
+    "hr": {"count": 2, "paid": 1, "total": 5000, "avg": 35.0, "mn": 30, "mx": 5000},
+}
+
+
+def aggregate(groups):
+    return groups.aggregate(
+        count=Count(),
+        paid=Count("salary"),
+        total=Sum("salary"),
+        avg=Avg("age"),
+        mn=Min(lambda row: row.age),
+        mx=Max("salary"),
+    )
+
+
+def test_group_by_aggregate(employees):
+    assert aggregate(employees.group_by("dept")) == EXPECTED
+    assert aggregate(employees.where(age__gte=0).group_by(lambda r: r.dept)) == EXPECTED
+
+
+def test_group_by_aggregate_on_stream(employees):
+    stream = StreamingCollection(iter(employees))
+    assert aggregate(stream.group_by("dept")) == EXPECTED
+
+
+def test_group_by_mapping(employees):
+    groups = employees.group_by("dept")
+    assert list(groups) == ["it", "hr"]
+    assert groups["hr"].map("name") == ["Bob", "Dave"]
+    assert employees.group_by("age").aggregate(avg=Avg("salary"))[40] == {"avg": None}
+    with pytest.raises(TypeError):
+        employees.group_by(123)
+
+
+def test_aggregate_is_abstract():
+    from src.lib.aggregates import Aggregate
+
+    with pytest.raises(TypeError):
+        Aggregate("salary")
@@ -0,0 +1,133 @@
+import pytest
+from src.lib import (
+    OrmCollection,
+    ObjDict,
+    BaseMultipleFound,
+    BaseNotFound,
+    Avg,
+    Count,
+    Max,
+    Sum,
+)
+
+np = pytest.importorskip("numpy")
+
+RECORDS = [
+    {"name": "Alice", "age": 25, "salary": 3000.0},
+    {"name": "Bob", "age": 40, "salary": 5000.0},
+    {"name": "Charlie", "age": 30, "salary": 4000.0},
+    {"name": "Dave", "age": 30, "salary": 5000.0},
+]
+
+
+@pytest.fixture
+def columnar():
+    return OrmCollection.from_records(RECORDS, columnar=True)
+
+
+@pytest.fixture
+def rows():
+    return OrmCollection.from_records(RECORDS)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"age": 30},
+        {"age__gte": 30, "salary__lt": 5000},
+        {"age__in": [25, 40]},
+        {"age__nin": [25, 40]},
+        {"age__not": 30},
+        {"name__startswith": "C"},
+        {"name": "Bob"},
+        {"name__regex": "^[AB]"},
+        {"name__iregex": "LI"},
+        {"name__contains": "li"},
+        {},
+    ],
+)
+def test_where_matches_row_storage(columnar, rows, query):
+    assert list(columnar.where(**query)) == list(rows.where(**query))
+
+
+def test_columns_are_typed(columnar):
+    assert columnar.column("age").dtype.kind == "i"
+    assert columnar.column("name").dtype == object
+
+
+def test_order_by_and_distinct(columnar, rows):
+    assert list(columnar.order_by("age")) == list(rows.order_by("age"))
+    assert list(columnar.order_by("salary", reverse=True)) == list(
+        rows.order_by("salary", reverse=True)
+    )
+    assert list(columnar.distinct("age")) == list(rows.distinct("age"))
+    assert list(columnar.distinct("age", "salary")) == list(
+        rows.distinct("age", "salary")
+    )
+    with pytest.raises(TypeError):
+        columnar.order_by(123)
+
+
+@pytest.mark.parametrize("key", ["name", "-name", "age", "-age"])
+def test_order_by_puts_none_last(key):
+    records = [
+        {"name": "Dave", "age": 30},
+        {"name": None, "age": None},
+        {"name": "Alice", "age": 25},
+        {"name": None, "age": 40},
+        {"name": "Bob", "age": 30},
+    ]
+    columnar = OrmCollection.from_records(records, columnar=True)
+    rows = OrmCollection.from_records(records)
+    assert list(columnar.order_by(key)) == list(rows.order_by(key))
+    assert list(columnar.order_by(key, reverse=True)) == list(
+        rows.order_by(key, reverse=True)
+    )
+    assert list(columnar.order_by(key, limit=2)) == list(rows.order_by(key, limit=2))
+
+
+def test_rows_and_chaining(columnar):
+    assert columnar[1] == ObjDict(RECORDS[1])
+    assert isinstance(columnar[0].age, int)
+    page = columnar.order_by("age").offset(1).limit(2)
+    assert page.map("name") == ["Charlie", "Dave"]
+    assert columnar.where(age=30).first().name == "Charlie"
+    assert columnar.find_by(name__endswith="b").age == 40
+    with pytest.raises(BaseNotFound):
+        columnar.find_by(age=99)
+    with pytest.raises(BaseMultipleFound):
+        columnar.find_by(age=30)
+    with pytest.raises(KeyError):
+        columnar.where(email="x")
+
+
+def test_order_by_multiple_keys(columnar, rows):
+    for keys in [("-salary", "name"), ("-age",), ("age", "-name")]:
+        assert list(columnar.order_by(*keys, limit=3)) == list(
+            rows.order_by(*keys, limit=3)
+        )
+
+
+def test_projections_read_columns(columnar, rows):
+    query = columnar.where(age__gte=30)
+    assert query.values("name", "age") == rows.where(age__gte=30).values("name", "age")
+    assert query.values_list("name", flat=True) == ["Bob", "Charlie", "Dave"]
+    salaries = query.pluck("salary")
+    assert isinstance(salaries, np.ndarray)
+    assert salaries.tolist() == [5000.0, 4000.0, 5000.0]
+    columnar.pluck("age")[0] = 99
+    assert columnar[0].age == 25
+    assert query.select("name").fields == ["name"]
+
+
+@pytest.mark.parametrize("key", ["age", lambda row: row.age])
+def test_group_by_matches_row_storage(columnar, rows, key):
+    groups = columnar.group_by(key)
+    assert list(groups) == [25, 40, 30]
+    assert groups[30].__class__ is columnar.__class__
+    assert groups[30].map("name") == ["Charlie", "Dave"]
+    aggregates = dict(count=Count(), total=Sum("salary"), avg=Avg("salary"))
+    aggregates["top"] = Max(lambda row: row.name)
+    assert groups.aggregate(**aggregates) == rows.group_by(key).aggregate(**aggregates)
+    with pytest.raises(KeyError):
+        len(columnar.group_by("email"))
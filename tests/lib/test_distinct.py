@@ -0,0 +1,80 @@
+import pytest
+from src.lib import OrmCollection, ObjDict, StreamingCollection, HyperLogLog
+
+
+@pytest.fixture
+def visits():
+    return OrmCollection(
+        ObjDict({"visitor": f"v{number % 700}", "page": number % 3})
+        for number in range(5000)
+    )
+
+
+def test_distinct_is_lazy_and_single_pass():
+    read = []
+
+    def values():
+        for value in [3, 1, 3, 2, 1, 4]:
+            read.append(value)
+            yield value
+
+    rows = OrmCollection([3, 1, 3, 2, 1, 4])
+    distinct = rows.distinct(lazy=True)
+    assert next(distinct) == 3
+    assert list(distinct) == [1, 2, 4]
+    assert list(StreamingCollection(values()).distinct().limit(2)) == [3, 1]
+    assert read == [3, 1]
+
+
+def test_distinct_with_unhashable_values():
+    rows = OrmCollection(
+        [
+            ObjDict({"tags": ["a", "b"]}),
+            ObjDict({"tags": ["a"]}),
+            ObjDict({"tags": ["a", "b"]}),
+        ]
+    )
+    assert [row.tags for row in rows.distinct("tags")] == [["a", "b"], ["a"]]
+
+
+def test_distinct_on_plain_dicts():
+    dicts = [{"a": 1, "b": 1}, {"a": 1, "b": 2}, {"a": 2, "b": 2}]
+    rows = OrmCollection(dicts)
+    assert rows.distinct("a") == [dicts[0], dicts[2]]
+    assert rows.where(b=2).distinct("a", "b") == [dicts[1], dicts[2]]
+    assert list(StreamingCollection(iter(dicts)).distinct("b")) == dicts[:2]
+    assert rows.count_distinct("a") == 2
+    with pytest.raises(AttributeError):
+        rows.distinct("c")
+
+
+def test_count_distinct_exact(visits):
+    assert visits.count_distinct("visitor") == 700
+    assert visits.count_distinct("page") == 3
+    assert visits.where(page=0).count_distinct("visitor") == 700
+    assert visits.count_distinct(lambda row: row.visitor[:2]) == 10
+    assert StreamingCollection(visits).count_distinct("visitor") == 700
+
+
+def test_count_distinct_approximate(visits):
+    assert visits.count_distinct("page", approximate=True) == 3
+    estimate = visits.count_distinct("visitor", approximate=True)
+    assert abs(estimate - 700) <= 700 * 0.03
+
+
+def test_hyperloglog_bounded_error():
+    sketch = HyperLogLog(precision=12)
+    sketch.update(range(200_000))
+    assert len(sketch._registers) == 4096
+    assert sketch.error_rate == pytest.approx(0.01625)
+    # Within four standard errors
+    assert abs(sketch.count() - 200_000) <= 200_000 * 4 * sketch.error_rate
+
+    other = HyperLogLog(precision=12)
+    other.update(range(100_000, 300_000))
+    sketch.merge(other)
+    assert abs(sketch.count() - 300_000) <= 300_000 * 4 * sketch.error_rate
+    with pytest.raises(ValueError):
+        sketch.merge(HyperLogLog(precision=10))
+    with pytest.raises(ValueError):
+        HyperLogLog(precision=2)
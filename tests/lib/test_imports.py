@@ -0,0 +1,29 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import src.lib
+
+
+def run(statement):
+    return subprocess.run(
+        [sys.executable, "-c", statement],
+        cwd=Path(__file__).resolve().parents[2],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+
+
+def test_package_attributes_are_imported_on_first_access():
+    assert run(
+        "import sys; from src.lib import OrmCollection;"
+        "print('numpy' in sys.modules, 'src.lib.columnar' in sys.modules)"
+    ) == ["False", "False"]
+    assert run(
+        "import sys; from src.lib import ColumnarCollection; print('numpy' in sys.modules)"
+    ) == ["True"]
+    assert "ObjDict" in dir(src.lib)
+    with pytest.raises(AttributeError):
+        src.lib.Missing
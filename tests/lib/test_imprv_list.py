@@ -89,3 +89,43 @@ def test_map():
     assert people_list.map("name") == ImprovedList(["Alice", "Bob", "Charlie"])
     assert people_list.map("age") == ImprovedList([25, 30, 35])
     assert people_list.map(":upper_name") == ImprovedList(["ALICE", "BOB", "CHARLIE"])
+
+
+def test_map_paths_arguments_and_laziness(capsys):
+    words = ImprovedList(["a-b", "c-d-e"])
+    assert words.map(":split", "-") == [["a", "b"], ["c", "d", "e"]]
+    assert words.map(":replace", "-", "", 1) == ["ab", "cd-e"]
+    assert words.map(":__class__.__name__.upper") == ["STR", "STR"]
+    assert words.map("__class__.__name__") == ["str", "str"]
+    assert words.map(len) == [3, 5]
+    results = words.map(":upper", lazy=True)
+    assert not isinstance(results, list)
+    assert list(results) == ["A-B", "C-D-E"]
+    # No more debug output for method calls
+    assert capsys.readouterr().out == ""
+
+
+def test_map_on_threads_keeps_order():
+    import threading
+    import time
+
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    class Slow:
+        def __init__(self, value):
+            self.value = value
+
+        def load(self, factor):
+            with lock:
+                running.append(self)
+                peak.append(len(running))
+            time.sleep(0.01 * (self.value % 3))
+            with lock:
+                running.remove(self)
+            return self.value * factor
+
+    items = ImprovedList(Slow(value) for value in range(20))
+    assert items.map(":load", 10, workers=4) == [value * 10 for value in range(20)]
+    assert max(peak) <= 4
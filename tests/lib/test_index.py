@@ -0,0 +1,283 @@
+import pytest
+from src.lib import (
+    OrmCollection,
+    ObjDict,
+    BaseDuplicateFound,
+    BaseMultipleFound,
+    BaseNotFound,
+)
+
+
+@pytest.fixture
+def users():
+    coll = OrmCollection(
+        [
+            ObjDict({"email": "alice@example.com", "age": 25, "gender": "female"}),
+            ObjDict({"email": "bob@example.com", "age": 40, "gender": "male"}),
+            ObjDict({"email": "charlie@example.com", "age": 30, "gender": "male"}),
+            ObjDict({"email": "dave@example.com", "age": 30, "gender": "male"}),
+        ]
+    )
+    coll.create_index("age")
+    return coll
+
+
+def test_where_uses_index(users):
+    assert [u.email for u in users.where(age=30)] == [
+        "charlie@example.com",
+        "dave@example.com",
+    ]
+    assert [u.age for u in users.where(age__in=[40, 25])] == [25, 40]
+    assert users.where(age=99) == []
+    assert users.find_by(age=40).email == "bob@example.com"
+
+
+def test_where_only_visits_indexed_rows():
+    class Row:
+        reads = 0
+
+        def __init__(self, code):
+            self._code = code
+
+        @property
+        def code(self):
+            Row.reads += 1
+            return self._code
+
+    rows = OrmCollection(Row(code) for code in range(1000))
+    rows.create_index("code")
+    Row.reads = 0
+    assert rows.find_by(code=500).code == 500
+    assert Row.reads == 2
+
+
+def test_index_combined_with_other_lookups(users):
+    result = users.where(age=30, email__startswith="d")
+    assert [u.email for u in result] == ["dave@example.com"]
+    with pytest.raises(BaseMultipleFound):
+        users.find_by(age=30)
+
+
+def test_index_follows_mutations(users):
+    users.append(ObjDict({"email": "eve@example.com", "age": 30, "gender": "female"}))
+    users.insert(
+        0, ObjDict({"email": "zoe@example.com", "age": 30, "gender": "female"})
+    )
+    assert [u.email for u in users.where(age=30)] == [
+        "zoe@example.com",
+        "charlie@example.com",
+        "dave@example.com",
+        "eve@example.com",
+    ]
+    del users[2]  # bob
+    users.remove(users[0])
+    users[0] = ObjDict({"email": "carol@example.com", "age": 41, "gender": "female"})
+    users.extend([ObjDict({"email": "fred@example.com", "age": 41, "gender": "male"})])
+    assert [u.email for u in users.where(age=41)] == [
+        "carol@example.com",
+        "fred@example.com",
+    ]
+    assert [u.email for u in users.where(age=30)] == [
+        "charlie@example.com",
+        "dave@example.com",
+        "eve@example.com",
+    ]
+    assert users.pop().email == "fred@example.com"
+    assert users.where(age__in=(41,)) == [users[0]]
+
+
+def test_unique_index(users):
+    users.create_index("email", unique=True)
+    assert users.find_by(email="bob@example.com").age == 40
+    with pytest.raises(BaseDuplicateFound):
+        users.append(ObjDict({"email": "bob@example.com", "age": 1, "gender": "male"}))
+    with pytest.raises(BaseDuplicateFound):
+        users.create_index("age", unique=True)
+    # Replacing a row by itself doesn't violate the constraint
+    users[1] = ObjDict({"email": "bob@example.com", "age": 41, "gender": "male"})
+    assert len(users) == 4
+
+
+def test_find_by_with_unique_index_skips_the_scan():
+    class Row:
+        reads = 0
+
+        def __init__(self, code, kind):
+            self._code = code
+            self.kind = kind
+
+        @property
+        def code(self):
+            Row.reads += 1
+            return self._code
+
+    rows = OrmCollection(Row(code, code % 2) for code in range(1000))
+    rows.add_unique("code")
+    Row.reads = 0
+    assert rows.find_by(code=500, kind=0).code == 500
+    # One read per predicate check and one for the returned row, no scan
+    assert Row.reads == 2
+    with pytest.raises(BaseNotFound):
+        rows.find_by(code=500, kind=1)
+    with pytest.raises(BaseNotFound):
+        rows.find_by(code=5000)
+
+
+def test_composite_unique_constraint(users):
+    # Charlie and Dave are both 30 year old males
+    with pytest.raises(BaseDuplicateFound):
+        users.add_unique("gender", "age")
+    users.pop()
+    users.add_unique("gender", "age")
+    assert users.find_by(age=30, gender="male").email == "charlie@example.com"
+    users.append(ObjDict({"email": "eve@example.com", "age": 30, "gender": "female"}))
+    with pytest.raises(BaseDuplicateFound):
+        users.append(
+            ObjDict({"email": "fred@example.com", "age": 40, "gender": "male"})
+        )
+    assert len(users) == 4
+    with pytest.raises(BaseMultipleFound):
+        users.find_by(age=30)
+    with pytest.raises(ValueError):
+        users.add_unique()
+
+
+def test_reindex_after_in_place_change(users):
+    users[0].age = 30
+    assert len(users.where(age=30)) == 2
+    users.reindex()
+    assert len(users.where(age=30)) == 3
+
+
+@pytest.fixture
+def salaries():
+    coll = OrmCollection(
+        ObjDict({"name": name, "salary": salary})
+        for name, salary in [
+            ("Alice", 3000),
+            ("Bob", 5000),
+            ("Charlie", 4000),
+            ("Dave", 5000),
+            ("Eve", 2000),
+        ]
+    )
+    coll.create_index("salary", ordered=True)
+    return coll
+
+
+@pytest.mark.parametrize(
+    "query, expected_names",
+    [
+        ({"salary__gte": 3000, "salary__lt": 5000}, ["Alice", "Charlie"]),
+        ({"salary__gt": 3000}, ["Bob", "Charlie", "Dave"]),
+        ({"salary__lte": 3000}, ["Alice", "Eve"]),
+        ({"salary": 5000}, ["Bob", "Dave"]),
+        ({"salary__in": [2000, 4000]}, ["Charlie", "Eve"]),
+        ({"salary__gt": 9000}, []),
+        ({"salary__gte": 4000, "name__startswith": "D"}, ["Dave"]),
+    ],
+)
+def test_sorted_index_range_lookups(salaries, query, expected_names):
+    result = salaries.where(**query)
+    assert [row.name for row in result] == expected_names
+    salaries.drop_index("salary")
+    assert salaries.where(**query) == result
+
+
+def test_sorted_index_order_by(salaries):
+    expected = salaries.order_by(lambda row: row.salary)
+    assert salaries.order_by("salary") == expected
+    expected = salaries.order_by(lambda row: row.salary, reverse=True)
+    assert [row.name for row in salaries.order_by("salary", reverse=True)] == [
+        "Bob",
+        "Dave",
+        "Charlie",
+        "Alice",
+        "Eve",
+    ]
+    assert salaries.order_by("salary", reverse=True) == expected
+
+
+def test_sorted_index_follows_mutations(salaries):
+    salaries.append(ObjDict({"name": "Fred", "salary": 3500}))
+    salaries[0] = ObjDict({"name": "Gina", "salary": 6000})
+    salaries.insert(1, ObjDict({"name": "Hugo", "salary": 3500}))
+    del salaries[-1]
+    assert [row.name for row in salaries.where(salary__gt=3000)] == [
+        "Gina",
+        "Hugo",
+        "Bob",
+        "Charlie",
+        "Dave",
+    ]
+    assert [row.name for row in salaries.order_by("salary")] == [
+        "Eve",
+        "Hugo",
+        "Charlie",
+        "Bob",
+        "Dave",
+        "Gina",
+    ]
+
+
+def test_unique_sorted_index(salaries):
+    with pytest.raises(BaseDuplicateFound):
+        salaries.create_index("salary", unique=True, ordered=True)
+    salaries.create_index("name", unique=True, ordered=True)
+    with pytest.raises(BaseDuplicateFound):
+        salaries.append(ObjDict({"name": "Eve", "salary": 1}))
+    assert salaries.find_by(name="Eve").salary == 2000
+
+
+@pytest.fixture
+def constrained():
+    coll = OrmCollection(
+        [ObjDict({"email": "a", "age": 30}), ObjDict({"email": "b", "age": 20})]
+    )
+    coll.add_unique("email")
+    coll.create_index("age", ordered=True)
+    return coll
+
+
+def assert_consistent(coll, emails):
+    assert [row.email for row in coll] == emails
+    for email in emails:
+        assert coll.find_by(email=email).email == email
+    assert [row.email for row in coll.order_by("age")] == [
+        row.email for row in sorted(coll, key=lambda row: row.age)
+    ]
+
+
+def test_refused_append_leaves_indexes_unchanged(constrained):
+    with pytest.raises(TypeError):
+        constrained.append(ObjDict({"email": "c", "age": None}))
+    assert_consistent(constrained, ["a", "b"])
+    with pytest.raises(BaseNotFound):
+        constrained.find_by(email="c")
+    constrained.append(ObjDict({"email": "c", "age": 5}))
+    assert_consistent(constrained, ["a", "b", "c"])
+
+
+def test_refused_extend_leaves_rows_and_indexes_unchanged(constrained):
+    with pytest.raises(TypeError):
+        constrained.extend(
+            [ObjDict({"email": "c", "age": 5}), ObjDict({"email": "d", "age": "x"})]
+        )
+    assert_consistent(constrained, ["a", "b"])
+    constrained.extend([ObjDict({"email": "c", "age": 5})])
+    assert_consistent(constrained, ["a", "b", "c"])
+
+
+def test_refused_replacement_leaves_rows_and_indexes_unchanged(constrained):
+    with pytest.raises(TypeError):
+        constrained[0] = ObjDict({"email": "c", "age": None})
+    with pytest.raises(TypeError):
+        constrained[0:1] = [
+            ObjDict({"email": "c", "age": 1}),
+            ObjDict({"email": "d", "age": "x"}),
+        ]
+    with pytest.raises(TypeError):
+        constrained.insert(-1, ObjDict({"email": "c", "age": None}))
+    assert_consistent(constrained, ["a", "b"])
+    constrained[0] = ObjDict({"email": "c", "age": 40})
+    assert_consistent(constrained, ["c", "b"])
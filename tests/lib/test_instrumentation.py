@@ -0,0 +1,94 @@
+import pytest
+from src.lib import OrmCollection, ObjDict, QueryStats, StatsRegistry, instrument
+from src.lib.instrumentation import HOOKS, add_hook, remove_hook
+
+
+@pytest.fixture
+def users():
+    return OrmCollection(
+        ObjDict({"id": number, "age": 20 + number % 10, "dept": f"d{number % 4}"})
+        for number in range(100)
+    )
+
+
+def test_explain_does_not_read_rows(users):
+    users.create_index("dept")
+    users.create_index("age", ordered=True)
+    plan = users.where(dept="d1", age__gte=25).order_by("-id", limit=3).explain()
+    assert plan == {
+        "source": "OrmCollection",
+        "rows": 100,
+        "shape": "where(age__gte, dept) order_by(-id) limit",
+        "access": "index",
+        "index": "HashIndex('dept', unique=False)",
+        "candidates": 25,
+        "operations": ["filter(age__gte, dept)", "top 3 (heap) by (-id)", "limit 3"],
+    }
+    plan = users.order_by("age").explain()
+    assert (plan["access"], plan["operations"]) == ("index_order", [])
+    plan = users.offset(90).limit(20).explain()
+    assert (plan["access"], plan["candidates"]) == ("window", 10)
+    assert users.all().where(age=20).explain()["access"] == "scan"
+
+
+def test_hooks_receive_query_stats(users):
+    users.add_unique("id")
+    received = []
+    add_hook(received.append)
+    try:
+        assert users.where(age__lt=22).count() == 20
+        assert users.where(age=20, dept="d0").first().id == 0
+        assert users.find_by(id=42).id == 42
+        assert users.limit(5).to_collection().map("id") == [0, 1, 2, 3, 4]
+    finally:
+        remove_hook(received.append)
+    assert all(isinstance(stats, QueryStats) for stats in received)
+    scan, first, unique, window = received
+    assert (scan.shape, scan.access, scan.rows_scanned, scan.rows_returned) == (
+        "where(age__lt)",
+        "scan",
+        100,
+        20,
+    )
+    # first() stops the scan at the first match
+    assert (first.shape, first.rows_scanned, first.rows_returned) == (
+        "where(age, dept) limit",
+        1,
+        1,
+    )
+    assert (unique.shape, unique.access, unique.rows_scanned) == (
+        "find_by(id)",
+        "unique_index",
+        1,
+    )
+    assert (window.access, window.rows_scanned, window.rows_returned) == (
+        "window",
+        5,
+        5,
+    )
+    assert all(stats.elapsed >= 0 for stats in received)
+    users.where(age=20).count()
+    assert len(received) == 4
+
+
+def test_stats_registry_aggregates_by_shape(users):
+    with instrument() as registry:
+        for age in (20, 21, 22):
+            users.where(age=age).count()
+        users.where(dept="d1", age__gte=25).count()
+    assert not HOOKS
+    assert isinstance(registry, StatsRegistry)
+    exported = {entry["shape"]: entry for entry in registry.export()}
+    assert exported["where(age)"]["calls"] == 3
+    assert exported["where(age)"]["rows_scanned"] == 300
+    assert exported["where(age)"]["rows_returned"] == 30
+    assert exported["where(age__gte, dept)"]["rows_returned"] == 15
+    registry.reset()
+    assert registry.export() == []
+
+
+def test_list_of_a_query_is_one_call(users):
+    with instrument() as registry:
+        assert len(list(users.where(age=20))) == 10
+    (entry,) = registry.export()
+    assert entry["calls"] == 1
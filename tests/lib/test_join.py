@@ -0,0 +1,93 @@
+import pytest
+from src.lib import OrmCollection, ObjDict
+
+
+@pytest.fixture
+def employees():
+    return OrmCollection(
+        [
+            ObjDict({"id": 1, "name": "Alice", "dept_id": 10}),
+            ObjDict({"id": 2, "name": "Bob", "dept_id": 20}),
+            ObjDict({"id": 3, "name": "Charlie", "dept_id": 10}),
+            ObjDict({"id": 4, "name": "Dave", "dept_id": None}),
+        ]
+    )
+
+
+@pytest.fixture
+def departments():
+    return OrmCollection(
+        [
+            ObjDict({"id": 10, "name": "IT"}),
+            ObjDict({"id": 30, "name": "Sales"}),
+        ]
+    )
+
+
+def test_inner_join(employees, departments):
+    joined = employees.join(departments, on="dept_id", right_on="id")
+    assert isinstance(joined, OrmCollection)
+    assert [(row.name, row.name_right, row.id, row.id_right) for row in joined] == [
+        ("Alice", "IT", 1, 10),
+        ("Charlie", "IT", 3, 10),
+    ]
+    # Building on the left side, since it is now the smaller one
+    joined = departments.join(employees, on="id", right_on="dept_id")
+    assert [(row.name, row.name_right) for row in joined] == [
+        ("IT", "Alice"),
+        ("IT", "Charlie"),
+    ]
+
+
+def test_left_join(employees, departments):
+    joined = employees.join(departments, on="dept_id", right_on="id", how="left")
+    assert [row.name_right for row in joined] == ["IT", None, "IT", None]
+    joined = departments.join(employees, on="id", right_on="dept_id", how="left")
+    assert [(row.name, row.name_right) for row in joined] == [
+        ("IT", "Alice"),
+        ("IT", "Charlie"),
+        ("Sales", None),
+    ]
+    with pytest.raises(ValueError):
+        employees.join(departments, on="dept_id", how="outer")
+
+
+def test_join_on_a_shared_field_keeps_it_once(employees):
+    salaries = OrmCollection(
+        [{"id": 1, "salary": 100}, {"id": 3, "salary": 300}, {"id": 3, "salary": 310}]
+    )
+    joined = employees.where(dept_id=10).join(salaries, on="id")
+    assert [dict(row) for row in joined] == [
+        {"id": 1, "name": "Alice", "dept_id": 10, "salary": 100},
+        {"id": 3, "name": "Charlie", "dept_id": 10, "salary": 300},
+        {"id": 3, "name": "Charlie", "dept_id": 10, "salary": 310},
+    ]
+
+
+def test_set_operations_by_key(employees):
+    others = OrmCollection(
+        [
+            ObjDict({"id": 3, "name": "Charlie"}),
+            ObjDict({"id": 5, "name": "Eve"}),
+            ObjDict({"id": 5, "name": "Eve again"}),
+        ]
+    )
+    union = employees.union(others, on="id")
+    assert union.map("name") == ["Alice", "Bob", "Charlie", "Dave", "Eve"]
+    assert union[2] is employees[2]
+    assert employees.intersection(others, on="id").map("name") == ["Charlie"]
+    assert employees.difference(others, on="id").map("id") == [1, 2, 4]
+    assert employees.all().difference(others, on=("id", "name")).map("id") == [1, 2, 4]
+    assert OrmCollection([1, 2, 2, 3]).union([3, 4]) == [1, 2, 3, 4]
+    assert OrmCollection([1, 2, 3]).intersection({2, 3, 5}) == [2, 3]
+
+
+def test_join_is_linear():
+    left = OrmCollection({"key": number, "left": number} for number in range(50_000))
+    right = OrmCollection(
+        {"key": number, "right": -number} for number in range(0, 100_000, 2)
+    )
+    joined = left.join(right, on="key")
+    assert len(joined) == 25_000
+    assert joined[-1] == {"key": 49_998, "left": 49_998, "right": -49_998}
+    assert len(left.difference(right, on="key")) == 25_000
@@ -35,3 +35,21 @@ def test_obj_dict():
     obj.inspect  # just check it doesn't raise any error
     # méthode select qui filtre les clés de l'objet.
     assert {"b": {"c": 2, "d": [3, 4]}} == obj.select(["b"])
+
+
+def test_nested_values_are_wrapped_once():
+    obj = ObjDict({"address": {"city": "Paris"}, "tags": ["a"]})
+    address = obj.address
+    assert address is obj.address
+    assert obj.tags is obj.tags
+    obj.address.city = "Lyon"
+    obj.tags.append("b")
+    assert obj["address"]["city"] == "Lyon"
+    assert obj.tags == ["a", "b"]
+
+    obj["other"] = {"zip": 75000}
+    assert isinstance(obj["other"], ObjDict)
+    assert obj.other is obj["other"]
+    # Values already wrapped are not copied again
+    obj.same = address
+    assert obj.same is address
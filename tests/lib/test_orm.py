@@ -1,6 +1,7 @@
 import pytest
 import re
 from src.lib import OrmCollection, ObjDict, BaseMultipleFound, BaseNotFound
+from src.lib.query import compile_pattern, get_plan
 
 
 @pytest.fixture
@@ -24,7 +25,7 @@ def my_orm_collection():
             {"Charlie", "Dave"},
         ),  # Test finding all elements with gender equal to male and age equal to 30
         (
-            {"name": ".*a.*"},
+            {"name__regex": ".*a.*"},
             {"Charlie", "Dave"},
         ),  # Test finding all elements with name containing the letter "a"
         (
@@ -32,7 +33,7 @@ def my_orm_collection():
             set(),
         ),  # Test finding all elements with name containing the letter "z"
         (
-            {"name": ".*a.*|.*e.*"},
+            {"name__regex": ".*a.*|.*e.*"},
             {"Alice", "Charlie", "Dave"},
         ),  # Test finding all elements with name containing the letter "a" or "e"
         (
@@ -40,7 +41,7 @@ def my_orm_collection():
             {"Charlie"},
         ),  # Test finding all elements with name ending with "ie"
         (
-            {"name": ""},
+            {"name__regex": ""},
             {"Alice", "Bob", "Charlie", "Dave"},
         ),  # Test finding all elements with an empty name (should return all elements)
         (
@@ -52,15 +53,15 @@ def my_orm_collection():
             set(),
         ),  # Test finding all elements with age equal to 100 (should return an empty set)
         (
-            {"name": "^A.*"},
+            {"name__regex": "^A.*"},
             {"Alice"},
         ),  # Test finding all elements with name starting with "A"
         (
-            {"name": ".*e$"},
+            {"name__regex": ".*e$"},
             {"Alice", "Charlie", "Dave"},
         ),  # Test finding all elements with name ending with "e"
         (
-            {"name": "^A.*|.*e$"},
+            {"name__regex": "^A.*|.*e$"},
             {"Alice", "Dave", "Charlie"},
         ),  # Test finding all elements with name starting with "A" or ending with "e"
     ],
@@ -88,7 +89,7 @@ def test_where(my_orm_collection, query, expected_names):
             {"age": 25, "gender": "female", "name": "Alice"},
         ),  # Test finding the element with name equal to "Alice" and age equal to 25
         (
-            {"name": ".*a.*"},
+            {"name__regex": ".*a.*"},
             BaseMultipleFound,
         ),  # Test finding the element with name equal to "Charlie" (not unique)
         (
@@ -316,3 +317,90 @@ def test_distinct():
         pass
     else:
         assert False, "Expected AttributeError"
+
+
+def test_where_query_plan_is_cached():
+    get_plan.cache_clear()
+    coll = OrmCollection([ObjDict({"age": age}) for age in range(10)])
+    assert len(coll.where(age__gte=5)) == 5
+    assert len(coll.where(age__gte=8)) == 2
+    info = get_plan.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
+def test_where_string_equality_and_regex_lookups():
+    coll = OrmCollection(
+        [ObjDict({"name": name}) for name in ["Bob", "Bobby", "bob", "Alice"]]
+    )
+    assert [row.name for row in coll.where(name="Bob")] == ["Bob"]
+    assert [row.name for row in coll.where(name=".*")] == []
+    assert [row.name for row in coll.where(name__regex="^Bob")] == ["Bob", "Bobby"]
+    assert [row.name for row in coll.where(name__iregex="^bob$")] == ["Bob", "bob"]
+    assert [row.name for row in coll.where(name__regex="ic")] == ["Alice"]
+    pattern = re.compile("^b", re.IGNORECASE)
+    assert [row.name for row in coll.where(name=pattern)] == ["Bob", "Bobby", "bob"]
+    with pytest.raises(ValueError):
+        coll.where(name__regex="(")
+
+
+def test_regex_patterns_are_compiled_once():
+    compile_pattern.cache_clear()
+    coll = OrmCollection([ObjDict({"name": "Alice"}), ObjDict({"name": "Bob"})])
+    for _ in range(3):
+        assert len(coll.where(name__regex="^A")) == 1
+    info = compile_pattern.cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+
+
+def test_where_on_plain_dicts_and_objects():
+    class Person:
+        def __init__(self, name, age):
+            self.name = name
+            self.age = age
+
+    dicts = OrmCollection([{"name": "Alice", "age": 25}, {"name": "Bob", "age": 40}])
+    assert dicts.where(age__gt=30) == [{"name": "Bob", "age": 40}]
+
+    persons = OrmCollection([Person("Alice", 25), Person("Bob", 40)])
+    assert [p.name for p in persons.where(age__lt=30, name__startswith="A")] == [
+        "Alice"
+    ]
+    with pytest.raises(AttributeError):
+        list(persons.where(email="alice@example.com"))
+
+
+@pytest.fixture
+def employees():
+    return OrmCollection(
+        [
+            ObjDict({"name": "Alice", "dept": "it", "salary": 3000}),
+            ObjDict({"name": "Bob", "dept": "hr", "salary": None}),
+            ObjDict({"name": "Charlie", "dept": "it", "salary": 5000}),
+            ObjDict({"name": "Dave", "dept": "hr", "salary": 5000}),
+            ObjDict({"name": "Eve", "dept": "it", "salary": 4000}),
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "keys, reverse, expected_names",
+    [
+        (("salary",), False, ["Alice", "Eve", "Charlie", "Dave", "Bob"]),
+        (("-salary",), False, ["Charlie", "Dave", "Eve", "Alice", "Bob"]),
+        (("salary",), True, ["Charlie", "Dave", "Eve", "Alice", "Bob"]),
+        (("-salary", "name"), False, ["Charlie", "Dave", "Eve", "Alice", "Bob"]),
+        (("-salary", "-name"), False, ["Dave", "Charlie", "Eve", "Alice", "Bob"]),
+        (("dept", "-salary"), False, ["Dave", "Bob", "Charlie", "Eve", "Alice"]),
+        (("dept", lambda x: x.name), True, ["Eve", "Charlie", "Alice", "Dave", "Bob"]),
+    ],
+)
+def test_order_by_multiple_keys(employees, keys, reverse, expected_names):
+    ordered = employees.order_by(*keys, reverse=reverse)
+    assert [row.name for row in ordered] == expected_names
+    for limit in range(len(employees) + 1):
+        top = employees.order_by(*keys, reverse=reverse, limit=limit)
+        assert [row.name for row in top] == expected_names[:limit]
+    page = employees.order_by(*keys, reverse=reverse).offset(1).limit(2)
+    assert [row.name for row in page] == expected_names[1:3]
@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.lib import OrmCollection, ObjDict, ImprovedList, Count, Sum, Avg, Max
+
+
+@pytest.fixture
+def rows():
+    return OrmCollection(
+        ObjDict({"id": i, "dept": f"d{i % 3}", "salary": i * 10}) for i in range(100)
+    )
+
+
+@pytest.mark.parametrize("workers, min_size", [(1, 0), (2, 0), (2, 1000)])
+def test_parallel_matches_serial(rows, workers, min_size):
+    parallel = rows.parallel(workers=workers, chunk_size=7, min_size=min_size)
+    result = parallel.where(salary__gte=300, dept="d1")
+    assert result == list(rows.where(salary__gte=300, dept="d1"))
+    assert all(row is rows[row.id] for row in result)
+    assert parallel.map("salary") == rows.map("salary")
+    aggregates = {
+        "n": Count(),
+        "total": Sum("salary"),
+        "avg": Avg("id"),
+        "mx": Max("id"),
+    }
+    assert parallel.aggregate("dept", **aggregates) == rows.group_by("dept").aggregate(
+        **aggregates
+    )
+
+
+def test_parallel_reuses_executor(rows):
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        parallel = rows.parallel(workers=4, min_size=0, executor=executor)
+        assert len(parallel.where(dept="d0")) == 34
+    assert ImprovedList([1, 2, 3]).parallel().map(":__str__") == ["1", "2", "3"]
+
+
+def test_parallel_rejects_invalid_operator(rows):
+    with pytest.raises(ValueError):
+        rows.parallel(workers=2, min_size=0).where(salary__between=3)
@@ -0,0 +1,52 @@
+import pytest
+from src.lib import OrmCollection, ObjDict, Record
+
+
+@pytest.fixture
+def people():
+    return OrmCollection(
+        [
+            ObjDict({"name": "Alice", "age": 25, "gender": "female", "city": "Paris"}),
+            ObjDict({"name": "Bob", "age": 40, "gender": "male", "city": "Lyon"}),
+            ObjDict({"name": "Charlie", "age": 30, "gender": "male", "city": "Nice"}),
+        ]
+    )
+
+
+def test_values_and_pluck(people):
+    assert people.values("name", "age") == [
+        ("Alice", 25),
+        ("Bob", 40),
+        ("Charlie", 30),
+    ]
+    assert people.values_list("name") == [("Alice",), ("Bob",), ("Charlie",)]
+    assert people.values_list("name", flat=True) == ["Alice", "Bob", "Charlie"]
+    assert people.pluck("age") == [25, 40, 30]
+    assert people.where(gender="male").pluck("name") == ["Bob", "Charlie"]
+    assert people.all()[1:].values("city") == [("Lyon",), ("Nice",)]
+    with pytest.raises(ValueError):
+        people.values()
+    with pytest.raises(ValueError):
+        people.values_list("name", "age", flat=True)
+
+
+def test_select_projects_rows(people):
+    projected = people.order_by("-age").select("name", "city")
+    assert isinstance(projected, OrmCollection)
+    assert all(isinstance(row, Record) for row in projected)
+    assert projected[0].to_dict() == {"name": "Bob", "city": "Lyon"}
+    assert projected.find_by(city="Nice").name == "Charlie"
+    with pytest.raises(AttributeError):
+        projected[0].age
+    assert people[0].select(["name", "age"]) == {"name": "Alice", "age": 25}
+
+
+def test_projections_work_on_plain_objects():
+    class Person:
+        def __init__(self, name, age):
+            self.name = name
+            self.age = age
+
+    persons = OrmCollection([Person("Alice", 25), Person("Bob", 40)])
+    assert persons.values("age", "name") == [(25, "Alice"), (40, "Bob")]
+    assert persons.select("name").pluck("name") == ["Alice", "Bob"]
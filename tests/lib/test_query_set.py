@@ -0,0 +1,95 @@
+import pytest
+from src.lib import OrmCollection, ObjDict, BaseMultipleFound
+from src.lib.query_set import QuerySet
+
+
+class Row:
+    reads = 0
+
+    def __init__(self, value):
+        self._value = value
+
+    @property
+    def value(self):
+        Row.reads += 1
+        return self._value
+
+
+@pytest.fixture
+def rows():
+    Row.reads = 0
+    return OrmCollection(Row(value) for value in range(100))
+
+
+def test_chain_is_lazy(rows):
+    query = rows.where(value__gte=10).where(value__lt=50).offset(5).limit(3)
+    assert isinstance(query, QuerySet)
+    assert Row.reads == 0
+    assert [row._value for row in query] == [15, 16, 17]
+
+
+def test_limit_stops_the_scan(rows):
+    assert [row._value for row in rows.where(value__gte=10).limit(2)] == [10, 11]
+    assert Row.reads == 12
+
+
+def test_first_and_find_by_stop_early(rows):
+    assert rows.where(value__gt=4).first()._value == 5
+    assert Row.reads == 6
+    Row.reads = 0
+    with pytest.raises(BaseMultipleFound):
+        rows.find_by(value__lt=50)
+    assert Row.reads == 2
+
+
+@pytest.mark.parametrize(
+    "convert", [list, tuple, lambda rows: sorted(rows, key=id), OrmCollection]
+)
+def test_conversion_runs_the_query_once(rows, convert):
+    query = rows.where(value__gte=0)
+    assert len(convert(query)) == 100
+    assert Row.reads == 100
+    # The result is kept
+    assert len(query) == 100
+    assert len(list(query)) == 100
+    assert Row.reads == 100
+
+
+def test_lazy_consumers_stop_early(rows):
+    assert next(rows.where(value__gte=10).distinct("value", lazy=True))._value == 10
+    assert Row.reads < 20
+    Row.reads = 0
+    assert next(rows.where(value__gte=10).map("_value", lazy=True)) == 10
+    assert Row.reads == 11
+
+
+def test_source_is_read_at_evaluation():
+    coll = OrmCollection([ObjDict({"age": 20}), ObjDict({"age": 40})])
+    query = coll.where(age__gt=30)
+    coll.append(ObjDict({"age": 50}))
+    assert query.count() == 2
+    assert len(query) == 2
+
+
+def test_query_set_behaves_as_a_collection():
+    coll = OrmCollection(
+        [
+            ObjDict({"name": "Alice", "age": 25}),
+            ObjDict({"name": "Bob", "age": 40}),
+            ObjDict({"name": "Charlie", "age": 30}),
+            ObjDict({"name": "Dave", "age": 30}),
+        ]
+    )
+    query = coll.where(age__gte=30).order_by("name", reverse=True)
+    assert query == [coll[3], coll[2], coll[1]]
+    assert query != coll
+    assert query[0].name == "Dave"
+    assert query[-1].name == "Bob"
+    assert [row.name for row in query[1:]] == ["Charlie", "Bob"]
+    assert query.last().name == "Bob"
+    assert query.first(2) == [coll[3], coll[2]]
+    assert query.exists()
+    assert not coll.where(age__gt=99)
+    assert query.distinct("age") == [coll[3], coll[1]]
+    assert query.map("name") == ["Dave", "Charlie", "Bob"]
+    assert coll.order_by("age").limit(2).map("name") == ["Alice", "Charlie"]
@@ -0,0 +1,59 @@
+import pickle
+import pytest
+from src.lib import OrmCollection, Record, record_class
+
+ROWS = [
+    {"name": "Alice", "age": 25, "gender": "female"},
+    {"name": "Bob", "age": 40, "gender": "male", "extra": True},
+    {"name": "Charlie", "age": 30},
+]
+
+
+@pytest.fixture
+def people():
+    return OrmCollection.from_dicts(ROWS, schema=["name", "age", "gender"])
+
+
+def test_records_are_compact(people):
+    alice = people[0]
+    assert isinstance(alice, Record)
+    assert not hasattr(alice, "__dict__")
+    assert type(alice) is type(people[1]) is record_class(("name", "age", "gender"))
+    assert alice.name == "Alice"
+    assert alice["age"] == 25
+    assert people[2].gender is None
+    with pytest.raises(AttributeError):
+        alice.extra
+    with pytest.raises(KeyError):
+        alice["extra"]
+    alice.age = 26
+    assert alice.age == 26
+    with pytest.raises(AttributeError):
+        alice.email = "alice@example.com"
+
+
+def test_records_convert_back_to_dicts(people):
+    assert people[0].to_dict() == {"name": "Alice", "age": 25, "gender": "female"}
+    assert dict(people[1]) == {"name": "Bob", "age": 40, "gender": "male"}
+    assert people[0] == ROWS[0]
+    assert people.to_dicts()[2] == {"name": "Charlie", "age": 30, "gender": None}
+    assert pickle.loads(pickle.dumps(people)) == people
+    people[0].inspect  # just check it doesn't raise any error
+    people.inspect
+
+
+def test_records_support_queries(people):
+    assert people.find_by(name="Bob").age == 40
+    assert [p.name for p in people.where(age__gte=30).order_by("-age")] == [
+        "Bob",
+        "Charlie",
+    ]
+    people.create_index("name", unique=True)
+    assert people.find_by(name="Charlie").age == 30
+    assert people.distinct("gender").map("name") == ["Alice", "Bob", "Charlie"]
+
+
+@pytest.mark.parametrize("schema", [["name", "name"], ["1st"], ["to_dict"], ["_x"]])
+def test_invalid_schema(schema):
+    with pytest.raises(ValueError):
+        OrmCollection.from_dicts([], schema=schema)
@@ -0,0 +1,52 @@
+import json
+import pytest
+from src.lib import StreamingCollection, BaseNotFound
+
+
+@pytest.fixture
+def jsonl(tmp_path):
+    path = tmp_path / "users.jsonl"
+    rows = [
+        {"name": "Alice", "age": 25, "gender": "female"},
+        {"name": "Bob", "age": 40, "gender": "male"},
+        {"name": "Charlie", "age": 30, "gender": "male"},
+        {"name": "Dave", "age": 30, "gender": "male"},
+    ]
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n\n")
+    return path
+
+
+def test_jsonl_pipeline(jsonl):
+    users = StreamingCollection.from_jsonl(jsonl)
+    males = users.where(gender__in=["male"], age__gte=30)
+    assert list(males.map("name")) == ["Bob", "Charlie", "Dave"]
+    # File sources can be iterated again
+    assert males.count() == 3
+    assert list(users.distinct("age").map("name")) == ["Alice", "Bob", "Charlie"]
+    assert users.offset(1).first().name == "Bob"
+    assert users.find_by(age__lt=30).name == "Alice"
+    with pytest.raises(BaseNotFound):
+        users.find_by(age__gt=99)
+
+
+def test_csv_group_by(tmp_path):
+    path = tmp_path / "salaries.csv"
+    path.write_text("name,dept,salary\nAlice,it,10\nBob,hr,20\nCharlie,it,30\n")
+    rows = StreamingCollection.from_csv(path)
+    totals = rows.group_by(lambda r: r.dept, lambda acc, r: acc + int(r.salary), 0)
+    assert totals == {"it": 40, "hr": 20}
+    assert rows.group_by(lambda r: r.dept)["it"].map("name") == ["Alice", "Charlie"]
+
+
+def test_generator_is_consumed_lazily():
+    consumed = []
+
+    def numbers():
+        for number in range(10**9):
+            consumed.append(number)
+            yield number
+
+    stream = StreamingCollection(numbers())
+    assert list(stream.distinct().limit(3)) == [0, 1, 2]
+    assert consumed == [0, 1, 2]
+    assert list(StreamingCollection(range(5)).map(":__neg__")) == [0, -1, -2, -3, -4]
@@ -0,0 +1,78 @@
+import pytest
+from src.lib import OrmCollection, ObjDict, ImprovedList
+from src.lib.view import CollectionView
+
+
+@pytest.fixture
+def users():
+    return OrmCollection(
+        ObjDict({"id": number, "score": number % 4, "name": f"user{number}"})
+        for number in range(10)
+    )
+
+
+def test_views_do_not_copy(users):
+    everything = users.all()
+    assert isinstance(everything, CollectionView)
+    assert everything == users
+    assert everything[3] is users[3]
+    page = users.view(2, 8)[1:3]
+    assert page == [users[3], users[4]]
+    assert page.first() is users[3]
+    assert users.first(3) == [users[0], users[1], users[2]]
+    assert users.last(2) == [users[8], users[9]]
+    assert ImprovedList([1, 2, 3]).first(2) == ImprovedList([1, 2])
+    # In-place changes of the rows are seen through the view
+    users[3].name = "changed"
+    assert page[0].name == "changed"
+    with pytest.raises(TypeError):
+        page[0] = None
+
+
+def test_view_query_methods(users):
+    view = users.view(2, 8)
+    assert [row.id for row in view.where(score=0)] == [4]
+    assert [row.id for row in view.order_by("-score", limit=2)] == [3, 7]
+    assert view.find_by(id=5).name == "user5"
+    assert view.count_distinct("score") == 4
+    copy = view.limit(2).to_collection()
+    assert isinstance(copy, OrmCollection)
+    assert copy.map("id") == [2, 3]
+    assert isinstance(view.where(score=1).to_collection(), OrmCollection)
+
+
+def test_offset_and_limit_read_only_the_page(users):
+    class Rows(OrmCollection):
+        reads = 0
+
+        def __getitem__(self, position):
+            Rows.reads += 1
+            return super().__getitem__(position)
+
+    rows = Rows(users)
+    page = rows.offset(5).limit(2).offset(1)
+    assert [row.id for row in page] == [6]
+    assert Rows.reads == 1
+    assert [row.id for row in rows.limit(3)[1:]] == [1, 2]
+
+
+@pytest.mark.parametrize("ordered", [False, True])
+def test_paginate(users, ordered):
+    if ordered:
+        users.create_index("id", ordered=True)
+        users.create_index("score", ordered=True)
+    page = users.paginate(after=("id", None), limit=4)
+    assert isinstance(page, CollectionView)
+    assert [row.id for row in page] == [0, 1, 2, 3]
+    page = users.paginate(after=("id", page[-1].id), limit=4)
+    assert [row.id for row in page] == [4, 5, 6, 7]
+    page = users.paginate(after=("id", page[-1].id), limit=4)
+    assert [row.id for row in page] == [8, 9]
+    assert users.paginate(after=("id", 9), limit=4) == []
+    page = users.paginate(after=("-id", 5), limit=3)
+    assert [row.id for row in page] == [4, 3, 2]
+    # Ties keep the collection order, as with order_by()
+    page = users.paginate(after=("-score", None), limit=5)
+    assert page == list(users.order_by("-score", limit=5))
+    page = users.paginate(after=("score", 1), limit=3)
+    assert [row.id for row in page] == [2, 6, 3]
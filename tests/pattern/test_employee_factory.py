@@ -0,0 +1,127 @@
+import logging
+import sys
+
+import pytest
+from src.pattern.factory import employee_factory
+from src.pattern.factory.employee_factory import ObjectFactory, logger
+
+EVENTS = []
+
+
+class Node:
+    def __init__(self, name="node"):
+        EVENTS.append(("create", name))
+        object.__setattr__(self, "name", name)
+
+    def __setattr__(self, key, value):
+        EVENTS.append(("set", self.name, key, value.name))
+        object.__setattr__(self, key, value)
+
+
+CLASS_MAP = {"Node": Node}
+
+
+def node(name, **children):
+    return {"class": "Node", "params": {"name": name}, **children}
+
+
+@pytest.fixture(autouse=True)
+def events():
+    EVENTS.clear()
+    return EVENTS
+
+
+def test_wiring_order_of_the_recursive_factory(events):
+    conf = node(
+        "root",
+        a=[node("c1", x=node("g1")), node("c2")],
+        b=node("c3"),
+    )
+    root = ObjectFactory(conf, CLASS_MAP).get_object()
+    # Children are built depth first, each set on its parent once complete, and a
+    # list sets the attribute once per item
+    assert events == [
+        ("create", "root"),
+        ("create", "c1"),
+        ("create", "g1"),
+        ("set", "c1", "x", "g1"),
+        ("set", "root", "a", "c1"),
+        ("create", "c2"),
+        ("set", "root", "a", "c2"),
+        ("create", "c3"),
+        ("set", "root", "b", "c3"),
+    ]
+    assert (root.a.name, root.b.name, root.a.__dict__.get("x")) == ("c2", "c3", None)
+
+
+def test_deep_configs_do_not_recurse():
+    depth = sys.getrecursionlimit() * 2
+    conf = leaf = node(0)
+    for level in range(1, depth):
+        leaf["child"] = node(level)
+        leaf = leaf["child"]
+    obj = ObjectFactory(conf, CLASS_MAP).get_object()
+    levels = 1
+    while "child" in obj.__dict__:
+        obj = obj.child
+        levels += 1
+    assert (levels, obj.name) == (depth, depth - 1)
+
+
+def test_construction_is_logged_not_printed(capsys, caplog):
+    conf = node("root", a=node("child"))
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        ObjectFactory(conf, CLASS_MAP).get_object()
+    assert capsys.readouterr().out == ""
+    assert [record.getMessage() for record in caplog.records] == [
+        "Node()",
+        "Node()",
+        "Node.a = Node",
+    ]
+    assert all(record.levelno == logging.DEBUG for record in caplog.records)
+
+
+def test_unknown_class():
+    with pytest.raises(ValueError, match="Missing not found"):
+        ObjectFactory(node("root", a={"class": "Missing"}), CLASS_MAP).get_object()
+
+
+def test_create_many_shares_the_plan_of_a_shape():
+    factory = ObjectFactory(class_map=CLASS_MAP)
+    confs = [node(f"root{number}", a=node(f"child{number}")) for number in range(3)]
+    objects = list(factory.create_many(confs))
+    assert len(factory._plans) == 1
+    assert [(obj.name, obj.a.name) for obj in objects] == [
+        ("root0", "child0"),
+        ("root1", "child1"),
+        ("root2", "child2"),
+    ]
+    factory.create_object(node("other", b=node("child")))
+    assert len(factory._plans) == 2
+    with pytest.raises(ValueError):
+        factory.get_object()
+
+
+def test_create_many_is_lazy():
+    pulled = []
+
+    def confs():
+        for number in range(10):
+            pulled.append(number)
+            yield node(f"root{number}")
+
+    objects = ObjectFactory(class_map=CLASS_MAP).create_many(confs())
+    assert pulled == []
+    assert next(objects).name == "root0"
+    assert next(objects).name == "root1"
+    assert pulled == [0, 1]
+
+
+def test_oldest_plan_is_evicted(monkeypatch):
+    monkeypatch.setattr(employee_factory, "MAX_PLANS", 2)
+    factory = ObjectFactory(class_map=CLASS_MAP)
+    shapes = []
+    for key in ("a", "b", "c"):
+        factory.create_object(node("root", **{key: node("child")}))
+        shapes.append(next(reversed(factory._plans)))
+    assert list(factory._plans) == shapes[1:]
@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+
+
+def run(statement):
+    # As app.py runs them: from src, without the repository root on sys.path
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONPATH"}
+    return subprocess.run(
+        [sys.executable, "-c", statement],
+        cwd=SRC,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+
+
+def test_packages_do_not_depend_on_src():
+    assert run(
+        "import sys, pattern, mvc, employees;"
+        "from pattern.factory import ObjectFactory;"
+        "from mvc import Service;"
+        "from employees import FullTimeEmployee;"
+        "print(any(name.split('.')[0] in ('src', 'lib') for name in sys.modules))"
+    ) == ["False"]
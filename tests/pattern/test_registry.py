@@ -0,0 +1,111 @@
+import importlib.metadata
+import sys
+from types import SimpleNamespace
+
+import pytest
+from src.pattern.factory.employee_factory import ObjectFactory
+from src.pattern.factory.registry import ClassRegistry
+
+PLUGIN = """
+class Audit:
+    def __init__(self, year=2024):
+        self.year = year
+
+    class Report:
+        pass
+"""
+
+
+@pytest.fixture
+def plugin(tmp_path, monkeypatch):
+    """A module that nothing has imported yet"""
+    (tmp_path / "registry_plugin.py").write_text(PLUGIN, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "registry_plugin", raising=False)
+    yield "registry_plugin"
+    sys.modules.pop("registry_plugin", None)
+
+
+def test_class_imported_on_first_use(plugin):
+    registry = ClassRegistry({"Audit": f"{plugin}:Audit"})
+    assert plugin not in sys.modules
+    audit = registry["Audit"]
+    assert plugin in sys.modules
+    assert audit is sys.modules[plugin].Audit
+    # Cached, even once the module is gone
+    del sys.modules[plugin]
+    assert registry["Audit"] is audit
+    assert plugin not in sys.modules
+
+
+def test_nested_class(plugin):
+    registry = ClassRegistry({"Report": f"{plugin}:Audit.Report"})
+    assert registry["Report"] is sys.modules[plugin].Audit.Report
+
+
+def test_lookups_import_nothing(plugin):
+    registry = ClassRegistry({"Audit": f"{plugin}:Audit"})
+    assert "Audit" in registry
+    assert "Missing" not in registry
+    assert len(registry) == 1
+    assert list(registry) == ["Audit"]
+    assert registry.get("Missing") is None
+    assert plugin not in sys.modules
+
+
+def test_register():
+    registry = ClassRegistry()
+
+    @registry.register
+    class Bare:
+        pass
+
+    @registry.register("Named")
+    class Other:
+        pass
+
+    class Called:
+        pass
+
+    assert registry.register(Called) is Called
+    assert dict(registry) == {"Bare": Bare, "Named": Other, "Called": Called}
+
+
+def test_add_rejects_path_without_separator():
+    registry = ClassRegistry()
+    with pytest.raises(ValueError, match="module:Class"):
+        registry.add("Audit", "registry_plugin.Audit")
+    assert "Audit" not in registry
+
+
+def test_add_replaces_resolved_class(plugin):
+    registry = ClassRegistry({"Audit": dict})
+    registry.add("Audit", f"{plugin}:Audit")
+    assert registry["Audit"] is sys.modules[plugin].Audit
+
+
+def test_factory_with_missing_name(plugin):
+    registry = ClassRegistry({"Audit": f"{plugin}:Audit"})
+    factory = ObjectFactory({"class": "Missing"}, registry)
+    with pytest.raises(ValueError, match="Missing not found"):
+        factory.get_object()
+    assert plugin not in sys.modules
+    audit = factory.create_object({"class": "Audit", "params": {"year": 2025}})
+    assert audit.year == 2025
+
+
+def test_load_entry_points(plugin, monkeypatch):
+    groups = {
+        "auta.classes": [SimpleNamespace(name="Audit", value=f"{plugin}:Audit")],
+    }
+
+    def entry_points(group):
+        return groups.get(group, [])
+
+    monkeypatch.setattr(importlib.metadata, "entry_points", entry_points)
+    registry = ClassRegistry()
+    registry.load_entry_points("auta.classes")
+    registry.load_entry_points("other.group")
+    assert list(registry) == ["Audit"]
+    assert plugin not in sys.modules
+    assert registry["Audit"] is sys.modules[plugin].Audit
@@ -0,0 +1,141 @@
+import builtins
+import marshal
+import os
+
+import pytest
+import yaml
+from src import app
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "CONFIG_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(app, "_config_cache", {})
+    path = tmp_path / "config.yml"
+    path.write_text("employee:\n  class: FullTimeEmployee\n", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Record the files opened by app and the YAML documents parsed"""
+    calls = {"opened": [], "parsed": 0}
+
+    def spy_open(file, *args, **kwargs):
+        calls["opened"].append(str(file))
+        return builtins.open(file, *args, **kwargs)
+
+    def spy_load(*args, **kwargs):
+        calls["parsed"] += 1
+        return original_load(*args, **kwargs)
+
+    original_load = yaml.load
+    monkeypatch.setattr(app, "open", spy_open, raising=False)
+    monkeypatch.setattr(yaml, "load", spy_load)
+    return calls
+
+
+def snapshot_of(config):
+    (snapshot,) = (config.parent / "cache").glob("*.marshal")
+    return snapshot
+
+
+def stamp_of(config):
+    status = os.stat(config)
+    return (status.st_mtime_ns, status.st_size)
+
+
+def test_unchanged_file_is_not_read(config, reads):
+    first = app.config_to_json(str(config))
+    assert reads["parsed"] == 1
+    reads["opened"].clear()
+    assert app.config_to_json(str(config)) == first
+    # A cold start reads the snapshot only
+    app._config_cache.clear()
+    assert app.config_to_json(str(config)) == first
+    assert str(config) not in reads["opened"]
+    assert reads["parsed"] == 1
+    # Every call returns its own copy
+    app.config_to_json(str(config))["employee"]["class"] = "changed"
+    assert app.config_to_json(str(config)) == first
+
+
+def test_touched_file_reuses_the_snapshot(config, reads):
+    first = app.config_to_json(str(config))
+    status = os.stat(config)
+    os.utime(config, ns=(status.st_atime_ns, status.st_mtime_ns + 10**9))
+    app._config_cache.clear()
+    assert app.config_to_json(str(config)) == first
+    assert str(config) in reads["opened"]
+    assert reads["parsed"] == 1
+    assert app._read_snapshot(snapshot_of(config))[0] == stamp_of(config)
+
+
+def test_edited_file_is_parsed_again(config, reads):
+    app.config_to_json(str(config))
+    config.write_text("employee:\n  class: PartTimeEmployee\n", encoding="utf-8")
+    app._config_cache.clear()
+    assert app.config_to_json(str(config)) == {
+        "employee": {"class": "PartTimeEmployee"}
+    }
+    assert reads["parsed"] == 2
+
+
+@pytest.mark.parametrize("content", ["stale", "foreign", "corrupt", "corrupt config"])
+def test_invalid_snapshot_is_ignored(config, reads, monkeypatch, content):
+    first = app.config_to_json(str(config))
+    snapshot = snapshot_of(config)
+    if content == "stale":
+        # An older version, with a current stamp
+        data = marshal.dumps({"employee": "stale"})
+        version = (app.CONFIG_CACHE_VERSION - 1, marshal.version)
+        entry = (version, stamp_of(config), "digest", data)
+        snapshot.write_bytes(marshal.dumps(entry))
+    elif content == "foreign":
+        monkeypatch.setattr(app, "CONFIG_CACHE_VERSION", app.CONFIG_CACHE_VERSION + 1)
+    elif content == "corrupt config":
+        # A valid snapshot of the current version, whose config can't be loaded
+        stamp, digest, _ = app._read_snapshot(snapshot)
+        version = (app.CONFIG_CACHE_VERSION, marshal.version)
+        snapshot.write_bytes(marshal.dumps((version, stamp, digest, b"\xff\x00")))
+    else:
+        data = bytearray(snapshot.read_bytes())
+        for position in range(len(data) // 3, len(data), 7):
+            data[position] ^= 0xFF
+        snapshot.write_bytes(bytes(data))
+    app._config_cache.clear()
+    assert app.config_to_json(str(config)) == first
+    assert reads["parsed"] == 2
+    # The snapshot is written again, in the current version
+    assert app._read_snapshot(snapshot)[0] == stamp_of(config)
+
+
+def test_cold_start_loads_the_config_once(config, reads, monkeypatch):
+    first = app.config_to_json(str(config))
+    app._config_cache.clear()
+    loads = []
+    original_loads = marshal.loads
+    monkeypatch.setattr(
+        marshal, "loads", lambda data: loads.append(data) or original_loads(data)
+    )
+    assert app.config_to_json(str(config)) == first
+    assert len(loads) == 1
+
+
+def test_config_marshal_cannot_store_is_not_cached(config, reads):
+    config.write_text("day: 2024-01-31\n", encoding="utf-8")
+    first = app.config_to_json(str(config))
+    assert str(first["day"]) == "2024-01-31"
+    assert app.config_to_json(str(config)) == first
+    assert reads["parsed"] == 2
+    assert not list((config.parent / "cache").glob("*.marshal"))
+
+
+def test_default_cache_dir_is_a_user_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert app.user_cache_dir() == str(tmp_path / "auta-app-generator")
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    monkeypatch.setenv("HOME", str(tmp_path))
+    assert app.user_cache_dir() == os.path.join(
+        str(tmp_path), ".cache", "auta-app-generator"
+    )